@@ -0,0 +1 @@
+"""Benchmarki scrapera (uruchamiane z katalogu głównego: python -m benchmarks.<nazwa>)."""
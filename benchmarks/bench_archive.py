@@ -0,0 +1,101 @@
+"""
+Skalowanie parsowania archiwum (scraper.archive) z liczbą procesów.
+
+Tworzy tymczasowe archiwum ``--pages`` stron (kopie strony z benchmarks/fixtures,
+połowa skompresowana gzipem, w obu układach katalogu) i parsuje je kolejno w
+1, 2, 4... procesach, aż do liczby rdzeni. Wynik każdego przebiegu musi być
+identyczny (te same wiersze w tej samej kolejności). Dodatkowo archiwum z
+pustą stroną (bez tabeli progów) musi zgłosić błąd tej strony i nie zapisać
+pliku zbiorczego. Przy niezgodności kod wyjścia to 1.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_archive [--pages 64] [--workers 1 2 4 8]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from scraper.archive import parse_archive
+from scraper.output import read_csv_rows
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE = ROOT / "benchmarks" / "fixtures" / "krakow_2025_2026" / "index.html"
+GOLDEN_CSV = ROOT / "progi_licea_krakow_2025_2026.csv"
+
+
+def make_archive(directory, pages):
+    """Zapisuje ``pages`` kopii strony jako kolejne lata (tyle samo plików .html i .html.gz)."""
+    data = FIXTURE.read_bytes()
+    for i in range(pages):
+        year = f"{2000 + i}-{2001 + i}"
+        if i % 2:
+            path = Path(directory) / "298" / "Krakow" / f"{year}.html.gz"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(gzip.compress(data))
+        else:
+            (Path(directory) / f"298_Krakow_{year}.html").write_bytes(data)
+
+
+def empty_snapshot_check(directory):
+    """Archiwum z pustą stroną: zwraca listę opisów błędów (pusta, gdy strona została odrzucona)."""
+    archive = Path(directory) / "z_pusta_strona"
+    archive.mkdir()
+    make_archive(archive, 2)
+    (archive / "298_Krakow_2099-2100.html").write_text("<html><body>Błąd 503</body></html>", encoding="utf-8")
+    output = Path(directory) / "z_pusta_strona.csv"
+    report = parse_archive(archive, output, workers=1)
+    errors = []
+    if [r.target.year for r in report.failed] != ["2099-2100"]:
+        errors.append(f"pusta strona nie została zgłoszona jako błąd: {[str(r.target) for r in report.failed]}")
+    if output.exists():
+        errors.append("plik zbiorczy zapisany mimo pustej strony")
+    return errors
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = [n for n in (1, 2, 4, 8, 16) if n < cores] + [cores]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    args = parser.parse_args()
+
+    expected_rows = len(list(read_csv_rows(GOLDEN_CSV))) * args.pages
+    reference = None
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = Path(tmp) / "archiwum"
+        archive.mkdir()
+        make_archive(archive, args.pages)
+        print(f"Archiwum: {args.pages} stron, rdzenie: {cores}\n")
+        print(f"{'Procesy':>7} {'czas [s]':>9} {'stron/s':>8} {'przyspieszenie':>15}")
+        print("-" * 42)
+        base = None
+        for workers in args.workers:
+            output = Path(tmp) / f"wynik_{workers}.csv"
+            report = parse_archive(archive, output, workers=workers)
+            rows = list(read_csv_rows(output)) if output.exists() else []
+            if reference is None:
+                reference = rows
+            if report.failed or len(rows) != expected_rows or rows != reference:
+                print(f"NIEZGODNOŚĆ dla {workers} procesów: {len(rows)} wierszy, oczekiwano {expected_rows}")
+                ok = False
+            base = base or report.elapsed
+            print(f"{workers:7d} {report.elapsed:9.2f} {args.pages / report.elapsed:8.1f} "
+                  f"{base / report.elapsed:14.2f}x")
+
+        print("\nArchiwum z pustą stroną:")
+        for error in empty_snapshot_check(tmp):
+            print(f"  BŁĄD: {error}")
+            ok = False
+
+    print("\nWynik zgodny dla wszystkich liczb procesów" if ok else "\nWynik NIEZGODNY")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
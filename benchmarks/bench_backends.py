@@ -0,0 +1,50 @@
+"""
+Benchmark backendu HTTP na zapisanych stronach podawanych przez lokalny serwer.
+
+Sprawdza też, czy wynik zgadza się z zapisanym CSV - działa całkowicie offline.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_backends
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.server import serve_directory
+from benchmarks.synthetic import load_reference_rows, scaled_rows, write_site
+from scraper.backends import HttpBackend
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def run(label, directory, expected):
+    with serve_directory(directory) as server, HttpBackend() as backend:
+        start = time.perf_counter()
+        data = backend.fetch(server.base_url + "/index.html")
+        elapsed = time.perf_counter() - start
+        status = "OK" if data == expected else "RÓŻNICA"
+        print(f"  {label:<28} {elapsed * 1000:9.1f} ms  {server.request_count:>5} zapytań HTTP  "
+              f"{len(data):>6} klas  [{status}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    args = parser.parse_args()
+
+    print("Backend HTTP (lokalny serwer):")
+    run("fixture krakow_2025_2026", FIXTURES / "krakow_2025_2026", load_reference_rows())
+    for scale in args.scales:
+        rows = scaled_rows(scale)
+        with tempfile.TemporaryDirectory() as tmp:
+            write_site(tmp, rows)
+            run(f"ukryte wiersze x{scale}", tmp, rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            write_site(tmp, rows, xhr=True)
+            run(f"XHR 'rozwiń' x{scale}", tmp, rows)
+
+
+if __name__ == "__main__":
+    main()
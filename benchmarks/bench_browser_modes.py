@@ -0,0 +1,74 @@
+"""
+Porównanie trybów przeglądarki "full" i "lean": czas do gotowości strony i przesłane dane.
+
+Każdy tryb ładuje stronę ``--rounds`` razy w nowej przeglądarce bez okna
+(pierwsze ładowanie z pustą pamięcią podręczną, kolejne - z wypełnioną).
+Przesłane bajty pochodzą z logu wydajności Chrome (zob.
+scraper.browser.page_transfer_stats).
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_browser_modes [--url URL] [--rounds 3] [--json wyniki.json]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.record import DEFAULT_URL
+from scraper.browser import BROWSER_MODES, page_transfer_stats, setup_driver
+from scraper.waits import PageBudget
+
+
+def measure_mode(mode, url, rounds):
+    """Ładuje ``url`` ``rounds`` razy w trybie ``mode``; zwraca listę pomiarów."""
+    driver = setup_driver(headless=True, mode=mode)
+    samples = []
+    try:
+        for _ in range(rounds):
+            page_transfer_stats(driver)
+            start = time.perf_counter()
+            driver.get(url)
+            PageBudget().wait_for_page_ready(driver, eager=mode == "lean")
+            ready_s = time.perf_counter() - start
+            # Zasoby doładowywane po gotowości strony też są liczone
+            time.sleep(2)
+            transfer = page_transfer_stats(driver) or {"bytes": 0, "requests": 0, "blocked": 0}
+            samples.append(dict(transfer, ready_s=ready_s))
+    finally:
+        driver.quit()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", help="zapisz pomiary do pliku JSON")
+    args = parser.parse_args()
+
+    results = {mode: measure_mode(mode, args.url, args.rounds) for mode in BROWSER_MODES}
+
+    print(f"{'Tryb':<6} {'gotowość śr. [s]':>17} {'przesłano śr. [KB]':>19} {'zapytania':>10} {'zablokowane':>12}")
+    print("-" * 68)
+    for mode, samples in results.items():
+        print(
+            f"{mode:<6} {statistics.mean(s['ready_s'] for s in samples):17.2f} "
+            f"{statistics.mean(s['bytes'] for s in samples) / 1024:19.0f} "
+            f"{statistics.mean(s['requests'] for s in samples):10.1f} "
+            f"{statistics.mean(s['blocked'] for s in samples):12.1f}"
+        )
+
+    full, lean = results["full"], results["lean"]
+    saved = 1 - sum(s["bytes"] for s in lean) / max(1, sum(s["bytes"] for s in full))
+    faster = 1 - sum(s["ready_s"] for s in lean) / max(1e-9, sum(s["ready_s"] for s in full))
+    print(f"\nTryb lean: {saved:.0%} mniej danych, strona gotowa {faster:.0%} szybciej")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Zapisano pomiary do {args.json}")
+
+
+if __name__ == "__main__":
+    main()
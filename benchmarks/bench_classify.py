@@ -0,0 +1,129 @@
+"""
+Mikrobenchmark i kontrola zgodności klasyfikatora wierszy (scraper.classify).
+
+Porównuje skompilowane reguły z dawną implementacją is_class_row (skanowanie
+listy słów, wielokrotne lower()/replace()) na parach komórek ze stron
+syntetycznych, a następnie sprawdza wynik wzorcowy: strona z
+benchmarks/fixtures musi dać dokładnie wiersze z zatwierdzonego CSV, a każdy
+wiersz - poprawny rekord ClassRecord. Przy niezgodności kod wyjścia to 1.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_classify [--scales 1 10 100] [--rounds 5]
+"""
+
+import argparse
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks.harness import bench, print_table
+from benchmarks.synthetic import render_page, scaled_rows
+from bs4 import BeautifulSoup
+from scraper.classify import is_class_row, iter_records, parse_threshold
+from scraper.extract import HTML_PARSER, _cell_text, parse_table_html
+from scraper.output import read_csv_rows
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE = ROOT / "benchmarks" / "fixtures" / "krakow_2025_2026" / "index.html"
+GOLDEN_CSV = ROOT / "progi_licea_krakow_2025_2026.csv"
+
+
+def legacy_is_class_row(first_cell_text, second_cell_text):
+    """Dawna implementacja is_class_row (przed scraper.classify) - punkt odniesienia."""
+    if not second_cell_text:
+        return False
+    if second_cell_text.lower() in ['rozwiń', 'zwiń', 'więcej', 'advertisement']:
+        return False
+    if 'od' in second_cell_text.lower() or 'do' in second_cell_text.lower():
+        return False
+    clean_threshold = ''.join(c for c in second_cell_text if c.isdigit() or c in '.,-')
+    if not (clean_threshold and clean_threshold.replace('.', '').replace(',', '').replace('-', '').isdigit()):
+        return False
+    if not first_cell_text:
+        return False
+    return not any(word in first_cell_text.lower() for word in ['lo ', ' liceum', ' licea', 'sportowe', 'im.', 'im '])
+
+
+def legacy_parse_threshold(text):
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def cell_pairs(html):
+    """Teksty dwóch pierwszych komórek każdego wiersza tabeli (łącznie z wierszami szkół)."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    pairs = []
+    for row in soup.select("table tr"):
+        cells = row.find_all("td")
+        if len(cells) >= 2:
+            pairs.append((_cell_text(cells[0]), _cell_text(cells[1])))
+    return pairs
+
+
+def classify_benches(scales, rounds):
+    """Pomiar obu klasyfikatorów i parsowania progów; zwraca (wyniki, liczba rozbieżności)."""
+    results, mismatches = [], 0
+    for scale in scales:
+        pairs = cell_pairs(render_page(scaled_rows(scale), expanded=True))
+        thresholds = [second for _, second in pairs]
+        label = f"x{scale}, {len(pairs)} wierszy"
+
+        mismatches += sum(legacy_is_class_row(*pair) != is_class_row(*pair) for pair in pairs)
+        results += [
+            bench(f"legacy is_class_row [{label}]", lambda: [legacy_is_class_row(*p) for p in pairs], rounds),
+            bench(f"classify.is_class_row [{label}]", lambda: [is_class_row(*p) for p in pairs], rounds),
+            bench(f"legacy float(próg) [{label}]", lambda: [legacy_parse_threshold(t) for t in thresholds], rounds),
+            bench(f"classify.parse_threshold [{label}]", lambda: [parse_threshold(t) for t in thresholds], rounds),
+        ]
+    return results, mismatches
+
+
+def golden_check():
+    """Sprawdza stronę wzorcową względem zatwierdzonego CSV; zwraca listę opisów błędów."""
+    errors = []
+    rejected = {}
+    rows = parse_table_html(FIXTURE.read_text(encoding="utf-8"), include_hidden=True, rejected=rejected)
+    expected = [tuple(row) for row in read_csv_rows(GOLDEN_CSV)]
+
+    if rows != expected:
+        missing = set(expected) - set(rows)
+        extra = set(rows) - set(expected)
+        errors.append(f"wiersze różne od CSV: brakuje {len(missing)}, nadmiarowych {len(extra)}")
+
+    records = list(iter_records(rows))
+    if len(records) != len(rows):
+        errors.append(f"rekordów {len(records)}, wierszy {len(rows)}")
+    for record in records:
+        if record.as_row() not in expected:
+            errors.append(f"rekord nie odpowiada wierszowi CSV: {record}")
+        if record.threshold != Decimal(record.threshold_text):
+            errors.append(f"zły próg: {record}")
+        if not record.class_code or record.profile is None:
+            errors.append(f"brak kodu lub profilu: {record}")
+
+    print(f"Wzorzec: {len(rows)} wierszy, {len(expected)} w CSV, odrzucone: {rejected}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results, mismatches = classify_benches(args.scales, args.rounds)
+    print_table(results)
+    print(f"\nRozbieżności z dawną implementacją: {mismatches}")
+
+    errors = golden_check()
+    for error in errors:
+        print(f"  BŁĄD: {error}")
+    if errors or mismatches:
+        sys.exit(1)
+    print("Zgodność z CSV: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark ekstrakcji danych: scrape_data_improved (wiersz po wierszu) vs snapshot.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_extraction             # tylko parsowanie offline
+    python -m benchmarks.bench_extraction --browser   # porównanie w Chrome (liczba komend)
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import render_page, scaled_rows
+from scraper.extract import parse_table_html
+
+
+def bench_parse(scales, repeat):
+    """Mierzy czas parse_table_html dla stron powiększonych ``scales`` razy."""
+    print("Parsowanie offline (parse_table_html):")
+    for scale in scales:
+        rows = scaled_rows(scale)
+        page = render_page(rows)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parsed = parse_table_html(page)
+            best = min(best, time.perf_counter() - start)
+        status = "OK" if parsed == rows else "RÓŻNICA"
+        print(f"  x{scale:<4} {len(rows):>6} klas  {best * 1000:9.1f} ms  [{status}]")
+
+
+def bench_browser(scale):
+    """Porównuje obie metody na stronie otwartej w Chrome: liczba komend WebDriver i czas."""
+    from scraper.browser import setup_driver, count_commands
+    from scraper.extract import scrape_data_improved, scrape_data_snapshot
+
+    rows = scaled_rows(scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        page_path = Path(tmp) / "progi.html"
+        page_path.write_text(render_page(rows), encoding="utf-8")
+
+        driver = setup_driver()
+        try:
+            driver.get(page_path.as_uri())
+            results = {}
+            for name, extractor in (("driver", scrape_data_improved), ("snapshot", scrape_data_snapshot)):
+                with count_commands(driver) as counter:
+                    start = time.perf_counter()
+                    data = extractor(driver)
+                    elapsed = time.perf_counter() - start
+                results[name] = data
+                print(f"  {name:<9} {counter.count:>7} komend WebDriver  {elapsed:8.3f} s  {len(data)} klas")
+        finally:
+            driver.quit()
+
+    same = results["driver"] == results["snapshot"]
+    print(f"  Wyniki identyczne: {'tak' if same else 'NIE'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--browser", action="store_true", help="uruchom też porównanie w Chrome")
+    parser.add_argument("--browser-scale", type=int, default=1)
+    args = parser.parse_args()
+
+    bench_parse(args.scales, args.repeat)
+    if args.browser:
+        print(f"Porównanie w przeglądarce (x{args.browser_scale}):")
+        bench_browser(args.browser_scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Kontrola przebiegu crawl() z wstrzykniętymi błędami: ponowienia nie mogą dublować wierszy.
+
+Strona syntetyczna (wiersze z zatwierdzonego CSV) jest podawana przez lokalny
+serwer, a backend HTTP psuje pierwszą próbę celu:
+- awaria w połowie celu (zerwane połączenie po części wierszy), bez i z punktem kontrolnym
+- niekompletny cel (tylko kilka szkół) - odrzucony przez kontrolę kompletności
+
+Po udanym ponowieniu CSV i JSON Lines muszą zawierać każdy wiersz dokładnie
+raz - przy niezgodności kod wyjścia to 1.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_faults
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from benchmarks.server import serve_directory
+from benchmarks.synthetic import load_reference_rows, write_site
+from scraper.backends import HttpBackend
+from scraper.checkpoint import Checkpoint
+from scraper.crawl import Target, crawl
+from scraper.output import read_csv_rows
+from scraper.scheduler import RetryPolicy
+
+
+class FlakyBackend(HttpBackend):
+    """Backend HTTP, którego pierwsza próba zwraca tylko ``rows_before_failure`` wierszy."""
+
+    def __init__(self, rows_before_failure, fail=True):
+        super().__init__()
+        self.rows_before_failure = rows_before_failure
+        self.fail = fail
+        self.calls = 0
+
+    def iter_rows(self, url, skip_schools=frozenset()):
+        self.calls += 1
+        rows = [row for row in self.fetch(url) if row[0] not in skip_schools]
+        if self.calls > 1:
+            yield from rows
+            return
+        yield from rows[:self.rows_before_failure]
+        if self.fail:
+            raise requests.ConnectionError("wstrzyknięty błąd: zerwane połączenie w połowie celu")
+
+
+def scenarios():
+    """(nazwa, fabryka backendu, czy z punktem kontrolnym)."""
+    return [
+        ("awaria w połowie celu", lambda: FlakyBackend(97), False),
+        ("awaria w połowie celu + punkt kontrolny", lambda: FlakyBackend(97), True),
+        ("niekompletny cel (3 szkoły)", lambda: FlakyBackend(15, fail=False), False),
+    ]
+
+
+def run_scenario(page_url, backend_factory, with_checkpoint, tmp):
+    """Przebieg crawl(); zwraca (raport, wiersze CSV, rekordy JSON Lines)."""
+    tmp = Path(tmp)
+    jsonl_path = tmp / "wiersze.jsonl"
+    checkpoint = Checkpoint(tmp / "punkt.sqlite") if with_checkpoint else None
+    target = Target(0, "bench", "0", url_template=page_url)
+    try:
+        report = crawl([target], backend_factory, workers=1, min_interval=0, output_dir=tmp / "csv",
+                       jsonl_path=jsonl_path, checkpoint=checkpoint, retry=RetryPolicy(attempts=2, base=0))
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    csv_path = tmp / "csv" / target.output_name
+    csv_rows = [tuple(row) for row in read_csv_rows(csv_path)] if csv_path.exists() else []
+    with open(jsonl_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return report, csv_rows, records
+
+
+def main():
+    expected = load_reference_rows()
+    ok = True
+    with tempfile.TemporaryDirectory() as site:
+        write_site(site, expected)
+        with serve_directory(site) as server:
+            page_url = server.base_url + "/index.html"
+            print(f"{'Scenariusz':<42} {'próby':>5} {'czas [s]':>9} {'CSV':>5} {'JSONL':>6}  wynik")
+            print("-" * 80)
+            for name, factory, with_checkpoint in scenarios():
+                with tempfile.TemporaryDirectory() as tmp:
+                    start = time.perf_counter()
+                    report, csv_rows, records = run_scenario(page_url, factory, with_checkpoint, tmp)
+                    elapsed = time.perf_counter() - start
+                jsonl_rows = [(r["szkola"], r["klasa"], r["prog"]) for r in records]
+                errors = []
+                if report.failed:
+                    errors.append(f"cel nie pobrany: {report.failed[0].error}")
+                if sorted(csv_rows) != sorted(expected):
+                    errors.append(f"CSV: {len(csv_rows)} wierszy, oczekiwano {len(expected)}")
+                duplicates = len(jsonl_rows) - len(set(jsonl_rows))
+                if duplicates:
+                    errors.append(f"JSONL: {duplicates} powtórzonych wierszy")
+                if sorted(set(jsonl_rows)) != sorted(expected):
+                    errors.append(f"JSONL: {len(set(jsonl_rows))} różnych wierszy, oczekiwano {len(expected)}")
+                ok = ok and not errors
+                attempts = report.results[0].attempts if report.results else 0
+                print(f"{name:<42} {attempts:5d} {elapsed:9.2f} {len(csv_rows):5d} {len(records):6d}  "
+                      f"{'; '.join(errors) or 'OK'}")
+
+    print("\nPonowienia bez powtórzonych wierszy" if ok else "\nPonowienia POWTARZAJĄ lub gubią wiersze")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Koszt startu: czas uruchomienia poleceń licea-webscraper.py i importu modułów scrapera.
+
+Każdy scenariusz jest uruchamiany ``--rounds`` razy w nowym interpreterze
+(mediana czasu całego procesu), a raz dodatkowo z ``python -X importtime``,
+żeby zebrać listę importowanych modułów i ich łączny czas importu. Punkt
+odniesienia to pusty interpreter (``python -c pass``).
+
+Scenariusz ma listę modułów, których nie wolno importować (np. --help i diff
+nie potrzebują Selenium ani BeautifulSoup) - jeśli któryś zostanie
+zaimportowany, kod wyjścia to 1.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_import [--rounds 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "licea-webscraper.py"
+FIXTURE = ROOT / "benchmarks" / "fixtures" / "krakow_2025_2026" / "index.html"
+GOLDEN_CSV = ROOT / "progi_licea_krakow_2025_2026.csv"
+
+BROWSER = ("selenium", "webdriver_manager")
+HEAVY = BROWSER + ("bs4", "requests")
+
+
+def scenarios(tmp):
+    """(nazwa, argumenty interpretera, moduły zabronione)."""
+    output = str(Path(tmp) / "progi.csv")
+    return [
+        ("python -c pass", ["-c", "pass"], ()),
+        ("--help", [str(SCRIPT), "--help"], HEAVY),
+        ("fetch --help", [str(SCRIPT), "fetch", "--help"], HEAVY),
+        ("diff", [str(SCRIPT), "diff", str(GOLDEN_CSV), str(GOLDEN_CSV)], HEAVY),
+        ("parse (strona z fixtures)", [str(SCRIPT), "parse", str(FIXTURE), "-o", output], BROWSER + ("requests",)),
+        ("import scraper.extract", ["-c", "import scraper.extract"], HEAVY),
+        ("import scraper.diff", ["-c", "import scraper.diff"], HEAVY),
+        ("import scraper.archive", ["-c", "import scraper.archive"], BROWSER + ("requests", "bs4")),
+        ("import scraper.crawl", ["-c", "import scraper.crawl"], BROWSER),
+    ]
+
+
+def run(args):
+    """Czas (s) jednego uruchomienia interpretera z argumentami ``args``."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def imported_modules(args):
+    """(łączny czas importu w ms, zbiór nazw zaimportowanych modułów) z ``-X importtime``."""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        # Moduły najwyższego poziomu (bez wcięcia) sumują czas wszystkich importów
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'Scenariusz':<28} {'proces [ms]':>12} {'importy [ms]':>13} {'moduły':>7}  ciężkie moduły")
+        print("-" * 90)
+        for name, command, forbidden in scenarios(tmp):
+            wall = statistics.median(run(command) for _ in range(args.rounds)) * 1000
+            import_ms, modules = imported_modules(command)
+            heavy = sorted(h for h in HEAVY if h in modules)
+            loaded = [f for f in forbidden if f in modules]
+            if loaded:
+                ok = False
+            note = ", ".join(heavy) or "-"
+            if loaded:
+                note += f"  <- NIEPOTRZEBNE: {', '.join(loaded)}"
+            print(f"{name:<28} {wall:12.0f} {import_ms:13.0f} {len(modules):7d}  {note}")
+
+    print("\nStart bez zbędnych importów" if ok else "\nNiektóre polecenia importują niepotrzebne moduły")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
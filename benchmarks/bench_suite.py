@@ -0,0 +1,135 @@
+"""
+Zestaw benchmarków offline: strony syntetyczne (1x/10x/100x) na lokalnym serwerze.
+
+Bez przeglądarki mierzone są: parsowanie snapshotu, backend HTTP i pełny
+przebieg crawl() (pobranie -> walidacja -> CSV). Z --browser dochodzą
+expand_all_classes (przycisk po przycisku i jednym skryptem),
+scrape_data_improved vs scrape_data_snapshot oraz pełny przebieg z Selenium.
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --scales 1 10 --browser --json wyniki.json
+    python -m benchmarks.bench_suite --fixture benchmarks/fixtures/nagranie   # strona z benchmarks.record
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.harness import bench, print_table, save_results
+from benchmarks.server import serve_directory
+from benchmarks.synthetic import render_page, scaled_rows, write_site
+from scraper.backends import HttpBackend, SeleniumBackend
+from scraper.crawl import Target, crawl
+from scraper.extract import parse_table_html
+
+
+def offline_benches(label, site, base_url, rounds):
+    """Benchmarki bez przeglądarki dla strony w katalogu ``site`` podawanej pod ``base_url``."""
+    page_url = base_url + "/index.html"
+    expanded = (site / "expanded.html").read_text(encoding="utf-8")
+    results = [bench(f"parse_table_html [{label}]", lambda: parse_table_html(expanded), rounds)]
+
+    with HttpBackend() as backend:
+        results.append(bench(f"HttpBackend.fetch [{label}]", lambda: backend.fetch(page_url), rounds))
+
+    with tempfile.TemporaryDirectory() as out:
+        target = Target(0, "bench", "0", url_template=page_url)
+        results.append(bench(
+            f"crawl http -> CSV [{label}]",
+            lambda: crawl([target], HttpBackend, workers=1, min_interval=0, output_dir=out),
+            rounds,
+        ))
+    return results
+
+
+class SharedSeleniumBackend(SeleniumBackend):
+    """Backend Selenium na wspólnym driverze - crawl() go nie zamyka."""
+
+    def __init__(self, driver):
+        super().__init__()
+        self.driver = driver
+
+    def close(self):
+        pass
+
+
+def browser_benches(label, base_url, rounds, driver):
+    """Benchmarki w Chrome; ``driver`` jest wspólny dla wszystkich pomiarów."""
+    from scraper.browser import expand_all_classes, expand_all_classes_batch
+    from scraper.extract import scrape_data_improved, scrape_data_snapshot
+
+    collapsed_url = base_url + "/index.html"
+    expanded_url = base_url + "/expanded.html"
+
+    def load(url):
+        def setup():
+            driver.get(url)
+            return driver
+        return setup
+
+    results = [
+        bench(f"expand_all_classes [{label}]", expand_all_classes, rounds, setup=load(collapsed_url)),
+        bench(f"expand_all_classes_batch [{label}]", expand_all_classes_batch, rounds, setup=load(collapsed_url)),
+        bench(f"scrape_data_improved [{label}]", scrape_data_improved, rounds, setup=load(expanded_url)),
+        bench(f"scrape_data_snapshot [{label}]", scrape_data_snapshot, rounds, setup=load(expanded_url)),
+    ]
+
+    with tempfile.TemporaryDirectory() as out:
+        target = Target(0, "bench", "0", url_template=collapsed_url)
+        results.append(bench(
+            f"crawl selenium -> CSV [{label}]",
+            lambda: crawl([target], lambda: SharedSeleniumBackend(driver), workers=1, min_interval=0,
+                          output_dir=out),
+            rounds,
+        ))
+    return results
+
+
+def sites(scales, fixture):
+    """Generator (etykieta, katalog strony) - strony syntetyczne i opcjonalnie nagranie."""
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = scaled_rows(scale)
+            write_site(tmp, rows)
+            (Path(tmp) / "expanded.html").write_text(render_page(rows, expanded=True), encoding="utf-8")
+            yield f"x{scale}", Path(tmp)
+    if fixture:
+        yield Path(fixture).name, Path(fixture)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--browser", action="store_true", help="uruchom też benchmarki w Chrome")
+    parser.add_argument("--fixture", help="katalog nagrania z benchmarks.record (index.html + expanded.html)")
+    parser.add_argument("--json", help="zapisz statystyki do pliku JSON")
+    args = parser.parse_args()
+
+    driver = None
+    if args.browser:
+        from scraper.browser import setup_driver
+        driver = setup_driver()
+
+    results = []
+    try:
+        for label, site in sites(args.scales, args.fixture):
+            print(f"Strona {label}...")
+            with serve_directory(site) as server:
+                results += offline_benches(label, site, server.base_url, args.rounds)
+                if driver is not None:
+                    results += browser_benches(label, server.base_url, args.rounds, driver)
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    print()
+    print_table(results)
+    if args.json:
+        save_results(results, args.json)
+        print(f"\nZapisano wyniki do {args.json}")
+
+
+if __name__ == "__main__":
+    main()
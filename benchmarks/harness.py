@@ -0,0 +1,55 @@
+"""
+Minimalny odpowiednik pytest-benchmark: wielokrotne uruchomienie i statystyki czasu.
+
+Wyniki można zapisać do JSON (save_results) i porównywać między wydaniami.
+"""
+
+import json
+import statistics
+import time
+
+
+def bench(name, fn, rounds=5, setup=None, warmup=1):
+    """
+    Uruchamia ``fn`` ``rounds`` razy (po ``warmup`` rozgrzewkach) i zwraca statystyki.
+
+    ``setup`` (opcjonalne) jest wywoływane przed każdym uruchomieniem poza
+    pomiarem, a jego wynik trafia do ``fn`` jako argument.
+    """
+    times = []
+    result = None
+    for i in range(warmup + rounds):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            times.append(elapsed)
+    return {
+        "name": name,
+        "rounds": rounds,
+        "min": min(times),
+        "max": max(times),
+        "mean": statistics.mean(times),
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "median": statistics.median(times),
+        "result": result,
+    }
+
+
+def print_table(results):
+    """Wypisuje tabelę wyników w stylu pytest-benchmark (czasy w ms)."""
+    width = max((len(r["name"]) for r in results), default=10)
+    print(f"{'Nazwa':<{width}}  {'min':>10} {'max':>10} {'średnia':>10} {'odch.std':>10} {'mediana':>10} {'rundy':>6}")
+    print("-" * (width + 64))
+    for r in results:
+        print(
+            f"{r['name']:<{width}}  {r['min'] * 1000:10.2f} {r['max'] * 1000:10.2f} {r['mean'] * 1000:10.2f} "
+            f"{r['stddev'] * 1000:10.2f} {r['median'] * 1000:10.2f} {r['rounds']:>6}"
+        )
+
+
+def save_results(results, path):
+    """Zapisuje statystyki (bez wyników funkcji) do pliku JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{k: v for k, v in r.items() if k != "result"} for r in results], f, ensure_ascii=False, indent=2)
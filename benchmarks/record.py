@@ -0,0 +1,65 @@
+"""
+Nagrywanie strony z progami do późniejszego odtwarzania offline.
+
+Zapisuje do katalogu:
+    collapsed.html - strona po załadowaniu i akceptacji cookies (przed rozwinięciem)
+    expanded.html  - strona po rozwinięciu wszystkich klas
+    raw.html       - HTML zwrócony przez serwer bez przeglądarki
+    index.html     - strona do odtwarzania (zob. benchmarks.replay)
+
+Użycie (z katalogu głównego repozytorium):
+    python -m benchmarks.record benchmarks/fixtures/nagranie [--url URL]
+"""
+
+import argparse
+from pathlib import Path
+
+from benchmarks.replay import make_replay_page
+from scraper.backends import HttpBackend
+from scraper.crawl import URL_TEMPLATE
+from scraper.extract import parse_table_html
+
+DEFAULT_URL = URL_TEMPLATE.format(city_id=298, slug="Krakow", year="2025-2026")
+
+
+def record(url, directory):
+    """Nagrywa stronę ``url`` do katalogu ``directory`` i zwraca liczbę klas na stronie rozwiniętej."""
+    from scraper.browser import accept_cookies, expand_all_classes_batch, setup_driver
+    from scraper.waits import PageBudget
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with HttpBackend() as backend:
+        (directory / "raw.html").write_text(backend.get_html(url), encoding="utf-8")
+
+    driver = setup_driver()
+    try:
+        budget = PageBudget(120)
+        driver.get(url)
+        budget.wait_for_page_ready(driver)
+        accept_cookies(driver, budget)
+        (directory / "collapsed.html").write_text(driver.page_source, encoding="utf-8")
+
+        expand_all_classes_batch(driver, budget)
+        expanded = driver.page_source
+        (directory / "expanded.html").write_text(expanded, encoding="utf-8")
+    finally:
+        driver.quit()
+
+    (directory / "index.html").write_text(make_replay_page(expanded), encoding="utf-8")
+    return len(parse_table_html(expanded))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="katalog docelowy nagrania")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    args = parser.parse_args()
+
+    count = record(args.url, args.directory)
+    print(f"Nagrano {args.url} do {args.directory} ({count} klas)")
+
+
+if __name__ == "__main__":
+    main()
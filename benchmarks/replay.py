@@ -0,0 +1,51 @@
+"""
+Odtwarzanie nagranych stron otouczelnie.pl na lokalnym serwerze.
+
+Z nagranej, rozwiniętej strony (expanded.html) budowana jest strona do
+odtwarzania: skrypty i zasoby zewnętrzne są usuwane, wiersze klas ukrywane,
+a przyciski "rozwiń" dostają ten sam skrypt co strony syntetyczne - dzięki
+temu Selenium może rozwijać klasy bez dostępu do sieci.
+"""
+
+from bs4 import BeautifulSoup
+
+from benchmarks.synthetic import EXPANDER_SCRIPT
+from scraper.extract import HTML_PARSER, is_school_href
+
+
+def make_replay_page(expanded_html):
+    """Zamienia nagraną rozwiniętą stronę na stronę do odtwarzania z działającym "rozwiń"."""
+    soup = BeautifulSoup(expanded_html, HTML_PARSER)
+
+    # Bez skryptów, ramek i zewnętrznych zasobów strona działa offline i deterministycznie
+    for tag in soup.find_all(["script", "iframe", "noscript"]):
+        tag.decompose()
+    for tag in soup.find_all("link"):
+        tag.decompose()
+    for tag in soup.find_all("img"):
+        del tag["src"]
+
+    index = -1
+    for row in soup.select("table tr"):
+        cells = row.find_all("td")
+        link = cells[0].find("a") if cells else None
+        if link is not None and is_school_href(link.get("href")):
+            index += 1
+            for anchor in row.find_all("a"):
+                text = anchor.get_text().lower()
+                if "rozwiń" in text or "zwiń" in text:
+                    anchor.string = "rozwiń"
+                    anchor["href"] = "#"
+                    anchor["class"] = "rozwin"
+                    anchor["data-school"] = str(index)
+                    for attr in ("data-url", "data-href", "onclick"):
+                        if anchor.has_attr(attr):
+                            del anchor[attr]
+        elif index >= 0 and cells:
+            row["class"] = "klasa"
+            row["data-school"] = str(index)
+            row["style"] = "display:none"
+
+    body = soup.body or soup
+    body.append(BeautifulSoup(EXPANDER_SCRIPT, HTML_PARSER))
+    return str(soup)
@@ -0,0 +1,37 @@
+"""Lokalny serwer HTTP podający zapisane strony (fixtures) - do pomiarów i sprawdzeń bez sieci."""
+
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Handler plików statycznych bez logowania każdego zapytania; zlicza zapytania na serwerze."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.request_count += 1
+        super().do_GET()
+
+
+@contextmanager
+def serve_directory(directory, port=0):
+    """
+    Uruchamia serwer HTTP dla katalogu w osobnym wątku i zwraca go na czas bloku ``with``.
+
+    Adres bazowy jest w ``server.base_url`` (port wybierany automatycznie).
+    """
+    handler = partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.request_count = 0
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,122 @@
+"""
+Generator syntetycznych stron z progami, zbudowanych na podstawie zapisanego CSV.
+
+Struktura tabeli odpowiada stronie otouczelnie.pl: wiersz szkoły z linkiem do
+jej strony i zakresem progów, przycisk "rozwiń" oraz wiersze klas z progiem.
+"""
+
+import csv
+import html
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CSV_PATH = ROOT / "progi_licea_krakow_2025_2026.csv"
+
+
+# Obsługa przycisków "rozwiń": odsłania ukryte wiersze klas (tr.klasa[data-school])
+# albo, gdy przycisk ma data-url, pobiera fragment z wierszami i wstawia go pod szkołą.
+EXPANDER_SCRIPT = (
+    "<script>"
+    "document.querySelectorAll('a.rozwin').forEach(function (a) {"
+    "  a.addEventListener('click', function (e) {"
+    "    e.preventDefault();"
+    "    if (a.dataset.url) {"
+    "      if (a.dataset.loaded) { return; }"
+    "      a.dataset.loaded = '1';"
+    "      fetch(a.dataset.url).then(function (r) { return r.text(); }).then(function (text) {"
+    "        a.closest('tr').insertAdjacentHTML('afterend', text);"
+    "      });"
+    "      return;"
+    "    }"
+    "    document.querySelectorAll(\"tr.klasa[data-school='\" + a.dataset.school + \"']\")"
+    "      .forEach(function (tr) { tr.style.display = ''; });"
+    "  });"
+    "});"
+    "</script>"
+)
+
+
+def load_reference_rows(path=CSV_PATH):
+    """Wczytuje krotki (szkoła, klasa, próg) z zapisanego CSV."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        return [tuple(row) for row in reader]
+
+
+def group_by_school(rows):
+    """Grupuje krotki po szkole, zachowując kolejność z pliku."""
+    schools = {}
+    for school, class_name, threshold in rows:
+        schools.setdefault(school, []).append((class_name, threshold))
+    return list(schools.items())
+
+
+def scaled_rows(scale=1, path=CSV_PATH):
+    """Zwraca krotki referencyjne powielone ``scale`` razy (kolejne kopie mają unikalne nazwy szkół)."""
+    rows = load_reference_rows(path)
+    result = []
+    for copy in range(scale):
+        suffix = "" if copy == 0 else f" - filia {copy}"
+        result.extend((school + suffix, class_name, threshold) for school, class_name, threshold in rows)
+    return result
+
+
+def render_fragment(classes):
+    """Buduje fragment HTML z wierszami klas, jaki zwraca XHR przycisku "rozwiń"."""
+    return "\n".join(
+        f"<tr class='klasa'><td>{html.escape(class_name)}</td><td>{html.escape(threshold)}</td><td></td></tr>"
+        for class_name, threshold in classes
+    )
+
+
+def render_page(rows, expanded=True, xhr=False):
+    """
+    Buduje HTML strony z tabelą progów dla podanych krotek.
+
+    Przy ``expanded=False`` wiersze klas są ukryte (``display:none``), a przycisk
+    "rozwiń" odsłania je skryptem - tak jak na prawdziwej stronie. Przy
+    ``xhr=True`` wierszy klas nie ma w dokumencie: przycisk ma ``data-url``
+    wskazujący fragment ``klasy/<nr>.html`` (zob. write_site).
+    """
+    out = [
+        "<!DOCTYPE html><html lang='pl'><head><meta charset='utf-8'>",
+        "<title>Progi punktowe</title></head><body>",
+        "<table class='progi'><thead><tr><th>Szkoła</th><th>Próg</th><th></th></tr></thead><tbody>",
+    ]
+    hidden = "" if expanded else " style='display:none'"
+    for index, (school, classes) in enumerate(group_by_school(rows)):
+        values = sorted(float(threshold) for _, threshold in classes)
+        out.append(
+            f"<tr class='szkola'><td><a href='/progi-punktowe/liceum/{index}/szkola'>{html.escape(school)}</a></td>"
+            f"<td>od {values[0]:.2f} do {values[-1]:.2f}</td>"
+            f"<td><a href='#' class='rozwin' data-school='{index}'"
+            + (f" data-url='klasy/{index}.html'" if xhr else "")
+            + ">rozwiń</a></td></tr>"
+        )
+        for class_name, threshold in ([] if xhr else classes):
+            out.append(
+                f"<tr class='klasa' data-school='{index}'{hidden}>"
+                f"<td>{html.escape(class_name)}</td><td>{html.escape(threshold)}</td><td></td></tr>"
+            )
+        out.append("<tr class='reklama'><td>Advertisement</td><td>advertisement</td></tr>")
+    out.append("</tbody></table>")
+    out.append(EXPANDER_SCRIPT + "</body></html>")
+    return "\n".join(out)
+
+
+def write_site(directory, rows, xhr=False):
+    """
+    Zapisuje stronę (index.html) i - dla ``xhr=True`` - fragmenty klas do katalogu.
+
+    Zwraca ścieżkę strony głównej; katalog można podać serwerowi z benchmarks.server.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    page = directory / "index.html"
+    page.write_text(render_page(rows, expanded=False, xhr=xhr), encoding="utf-8")
+    if xhr:
+        (directory / "klasy").mkdir(exist_ok=True)
+        for index, (_, classes) in enumerate(group_by_school(rows)):
+            (directory / "klasy" / f"{index}.html").write_text(render_fragment(classes), encoding="utf-8")
+    return page
@@ -4,478 +4,357 @@ Scraper do pobierania progów punktowych liceów w Krakowie ze strony otouczelni
 Wymagania:
 - Python 3.7+
 - Selenium: pip install selenium
+- BeautifulSoup: pip install beautifulsoup4
 - ChromeDriver: https://chromedriver.chromium.org/downloads
   (lub użyj: pip install webdriver-manager)
 
 Użycie:
-    python licea-webscraper.py
+    python licea-webscraper.py            # pobiera tylko strony, które się zmieniły (= fetch)
+    python licea-webscraper.py fetch --force    # ignoruje cache i pobiera wszystko od nowa
+    python licea-webscraper.py fetch --url 298/Krakow/2024-2025 --backend http --workers 8
+    python licea-webscraper.py fetch --metrics-json metrics.json --profile cprofile
+    python licea-webscraper.py fetch --attach   # użyj przeglądarek demona: python -m scraper.pool
+    python licea-webscraper.py fetch --on-change "npm run build"   # przebuduj front-end tylko po zmianach
+    python licea-webscraper.py parse strona.html -o progi.csv      # zapisana strona, bez sieci
+    python licea-webscraper.py parse archiwum/ -o progi.csv --workers 4   # zob. scraper.archive
+    python licea-webscraper.py diff stary.csv nowy.csv [--json zmiany.json]
+    python licea-webscraper.py bench import      # benchmarki z katalogu benchmarks/
+
+Selenium, webdriver-manager i BeautifulSoup są importowane dopiero przez
+polecenia, które ich potrzebują - --help, diff czy parse nie uruchamiają
+importu Selenium (zob. python -m benchmarks.bench_import).
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import csv
-import time
+import argparse
+import os
+import sys
 
 BASE_URL = "https://www.otouczelnie.pl/progi-punktowe/licea/miasto/298/Krakow/2025-2026"
 
-def setup_driver():
-    """Konfiguruje i zwraca driver Selenium."""
-    options = webdriver.ChromeOptions()
-    # Usuń komentarz poniżej, aby uruchomić w trybie headless (bez okna przeglądarki)
-    # options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    
-    try:
-        # Spróbuj użyć webdriver-manager (jeśli jest zainstalowany)
-        try:
-            from selenium.webdriver.chrome.service import Service
-            from webdriver_manager.chrome import ChromeDriverManager
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-        except ImportError:
-            # Jeśli webdriver-manager nie jest zainstalowany, użyj standardowego ChromeDriver
-            driver = webdriver.Chrome(options=options)
-        
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        return driver
-    except Exception as e:
-        print(f"Błąd podczas uruchamiania ChromeDriver: {e}")
-        print("\nRozwiązania:")
-        print("1. Zainstaluj ChromeDriver: https://chromedriver.chromium.org/downloads")
-        print("2. Lub zainstaluj webdriver-manager: pip install webdriver-manager")
-        raise
-
-def accept_cookies(driver):
-    """Akceptuje dialog cookies jeśli się pojawi."""
+# Strony do pobrania: adresy stron z progami lub zapis "id/Miasto/rok" (np. "298/Krakow/2025-2026").
+# Każdy cel jest zapisywany do progi_licea_<miasto>_<rok>.csv; fetch --url zastępuje tę listę
+TARGETS = [BASE_URL]
+
+# Liczba wątków, limit równoczesnych zapytań do jednego hosta i minimalny odstęp między nimi (s)
+WORKERS = 4
+PER_HOST = 2
+MIN_INTERVAL = 1.0
+# Ile zapytań do hosta może pójść od razu (seria), zanim zacznie obowiązywać odstęp MIN_INTERVAL
+BURST = 2
+
+# Ponowienia przy przejściowych błędach (timeout, 429/5xx, niekompletna tabela) z rosnącym, losowym odstępem
+RETRIES = 3
+# Po tylu kolejnych błędach dla hosta przebieg przestaje do niego pisać (bezpiecznik),
+# a plik zbiorczy nie jest zapisywany
+BREAKER_THRESHOLD = 5
+# Cel z mniej niż tą częścią szkół z poprzedniego pobrania jest pobierany ponownie (poprzedni plik zostaje)
+MIN_SCHOOLS_RATIO = 0.9
+
+# Opcjonalny wspólny plik CSV dla wszystkich celów (z kolumnami Miasto i Rok), np. "progi_licea.csv"
+MERGED_OUTPUT = None
+
+# Opcjonalny plik JSON Lines zapisywany na bieżąco (każdy wiersz od razu na dysku), np. "progi_licea.jsonl"
+JSONL_OUTPUT = None
+
+# "auto"     - najpierw zwykłe HTTP, przeglądarka tylko gdy dane są niekompletne
+# "http"     - tylko HTTP (bez Chrome)
+# "selenium" - zawsze przeglądarka
+BACKEND = "auto"
+
+# "snapshot" - jeden odczyt page_source i parsowanie offline (szybkie)
+# "driver"   - odczyt wiersz po wierszu przez WebDriver (stara metoda)
+EXTRACTION_MODE = "snapshot"
+
+# "batch" - wszystkie przyciski "rozwiń" jednym skryptem w przeglądarce (jedno zapytanie)
+# "click" - przycisk po przycisku (stara metoda)
+EXPAND_MODE = "batch"
+
+# "lean" - przeglądarka bez okna, obrazków, fontów, reklam i analityki, strategia ładowania "eager"
+# "full" - pełna strona (jak w zwykłej przeglądarce)
+BROWSER_MODE = "lean"
+
+# Łączny limit czasu (s) na jedną stronę w przeglądarce (ładowanie, cookies, rozwijanie klas)
+PAGE_BUDGET = 60.0
+
+# Katalog cache (ETag/Last-Modified i skróty pobranych stron); None wyłącza cache
+CACHE_DIR = ".scraper-cache"
+
+# Baza punktów kontrolnych (ukończone szkoły/cele) do wznawiania przerwanego przebiegu; None wyłącza
+CHECKPOINT_PATH = ".scraper-checkpoint.sqlite"
+
+# Raport zmian względem poprzedniego pobrania (nowe, usunięte i zmienione klasy, zob. scraper.diff);
+# None wyłącza
+DIFF_OUTPUT = "progi_zmiany.json"
+
+# Katalog paczek JSON dla front-endu (progi_licea_<miasto>_<rok>.json + .gz/.br, zob. scraper.bundle);
+# None wyłącza
+BUNDLE_DIR = "."
+
+# Baza historii progów (wszystkie przebiegi, miasta i lata) - zob. python -m scraper.history; None wyłącza
+HISTORY_PATH = "progi_historia.sqlite"
+
+# Po tylu stronach przeglądarka z puli jest odświeżana (ogranicza przyrost pamięci Chrome)
+POOL_MAX_PAGES = 50
+
+
+# Polecenia wiersza poleceń; bez polecenia uruchamiane jest "fetch"
+COMMANDS = ("fetch", "parse", "diff", "bench")
+
+
+def parse_target(text):
+    """Cel z adresu strony z progami albo z zapisu "id/Miasto/rok" (typ argumentu --url)."""
+    from scraper.crawl import Target
+
     try:
-        # Poczekaj na pojawienie się dialogu cookies (maksymalnie 5 sekund)
-        print("Sprawdzanie dialogu cookies...")
-        
-        # Spróbuj znaleźć przycisk na różne sposoby
-        accept_button = None
-        
-        # Metoda 1: Przycisk z tekstem "Akceptuję"
-        try:
-            accept_button = WebDriverWait(driver, 3).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Akceptuję')]"))
-            )
-        except TimeoutException:
-            pass
-        
-        # Metoda 2: Przycisk w dialogu
-        if not accept_button:
-            try:
-                accept_button = driver.find_element(By.XPATH, "//dialog//button[contains(text(), 'Akceptuję')]")
-            except NoSuchElementException:
-                pass
-        
-        # Metoda 3: Przycisk z aria-label lub innym atrybutem
-        if not accept_button:
-            try:
-                accept_button = driver.find_element(By.XPATH, "//button[@aria-label='Akceptuję' or contains(@class, 'accept')]")
-            except NoSuchElementException:
-                pass
-        
-        if accept_button:
-            print("Znaleziono dialog cookies, akceptowanie...")
-            # Przewiń do przycisku jeśli potrzeba
-            driver.execute_script("arguments[0].scrollIntoView(true);", accept_button)
-            time.sleep(0.5)
-            accept_button.click()
-            time.sleep(1)  # Poczekaj na zamknięcie dialogu
-            print("Dialog cookies zaakceptowany")
-        else:
-            print("Dialog cookies nie znaleziony (może już został zaakceptowany lub nie pojawił się)")
-            
-    except TimeoutException:
-        # Dialog cookies nie pojawił się lub już został zaakceptowany
-        print("Dialog cookies nie znaleziony (może już został zaakceptowany)")
-    except Exception as e:
-        print(f"Błąd podczas akceptowania cookies: {e}")
-        # Kontynuuj mimo błędu
+        return Target.from_url(text) if "://" in text else Target.parse(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"niepoprawny cel {text!r} - oczekiwano adresu .../miasto/<id>/<Miasto>/<rok> albo <id>/<Miasto>/<rok>"
+        ) from None
+
+
+def fetch(args):
+    """Pobiera progi dla wszystkich celów (sieć, opcjonalnie przeglądarka); zwraca kod wyjścia."""
+    from scraper.backends import create_backend
+    from scraper.cache import FetchCache
+    from scraper.checkpoint import Checkpoint
+    from scraper.crawl import crawl
+    from scraper.history import HistoryStore
+    from scraper.metrics import registry
+    from scraper.pool import DEFAULT_STATE_PATH, DriverPool
+    from scraper.scheduler import RetryPolicy
+    import subprocess
 
-def expand_all_classes(driver):
-    """Kliknie wszystkie przyciski 'rozwiń' na stronie."""
+    targets = args.url or [parse_target(url) for url in TARGETS]
+
+    registry.reset()
+    if args.profile:
+        registry.enable_profiling(args.profile, args.profile_dir)
+
+    checkpoint = None
+    history = None
+    pool = None
     try:
-        # Poczekaj na załadowanie strony
-        print("Oczekiwanie na załadowanie tabeli...")
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "table"))
-        )
-        print("Tabela załadowana")
-        
-        # Poczekaj dodatkową chwilę na pełne załadowanie JavaScript
-        time.sleep(2)
-        
-        # Spróbuj różnych selektorów
-        expand_buttons = []
-        
-        # Metoda 1: Linki z tekstem "rozwiń"
-        try:
-            buttons1 = driver.find_elements(By.XPATH, "//a[contains(text(), 'rozwiń')]")
-            if buttons1:
-                expand_buttons = buttons1
-                print(f"Metoda 1: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez tekst")
-        except Exception as e:
-            print(f"Metoda 1 nie zadziałała: {e}")
-        
-        # Metoda 2: Linki z href="#" zawierające "rozwiń"
-        if not expand_buttons:
-            try:
-                buttons2 = driver.find_elements(By.XPATH, "//a[@href='#' and contains(text(), 'rozwiń')]")
-                if buttons2:
-                    expand_buttons = buttons2
-                    print(f"Metoda 2: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez href='#'")
-            except Exception as e:
-                print(f"Metoda 2 nie zadziałała: {e}")
-        
-        # Metoda 3: Wszystkie linki w tabeli i filtrowanie
-        if not expand_buttons:
-            try:
-                all_links = driver.find_elements(By.XPATH, "//table//a")
-                expand_buttons = [link for link in all_links if 'rozwiń' in link.text.lower()]
-                if expand_buttons:
-                    print(f"Metoda 3: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez filtrowanie linków")
-            except Exception as e:
-                print(f"Metoda 3 nie zadziałała: {e}")
-        
-        # Metoda 4: Znajdź przez częściowy tekst (case-insensitive)
-        if not expand_buttons:
-            try:
-                buttons4 = driver.find_elements(By.XPATH, "//a[contains(translate(text(), 'ROZWIŃ', 'rozwiń'), 'rozwiń')]")
-                if buttons4:
-                    expand_buttons = buttons4
-                    print(f"Metoda 4: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' (case-insensitive)")
-            except Exception as e:
-                print(f"Metoda 4 nie zadziałała: {e}")
-        
-        # Metoda 5: Użyj selektora CSS
-        if not expand_buttons:
-            try:
-                # Znajdź wszystkie linki w tabeli i sprawdź ich tekst
-                buttons5 = driver.find_elements(By.CSS_SELECTOR, "table a")
-                expand_buttons = [btn for btn in buttons5 if 'rozwiń' in btn.text.lower()]
-                if expand_buttons:
-                    print(f"Metoda 5: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez CSS selector")
-            except Exception as e:
-                print(f"Metoda 5 nie zadziałała: {e}")
-        
-        # Metoda 6: Użyj JavaScript do znalezienia wszystkich linków z tekstem "rozwiń" i kliknij je bezpośrednio
-        if not expand_buttons:
-            try:
-                script = """
-                var links = document.querySelectorAll('a');
-                var count = 0;
-                for (var i = 0; i < links.length; i++) {
-                    if (links[i].textContent.toLowerCase().includes('rozwiń')) {
-                        links[i].click();
-                        count++;
-                    }
-                }
-                return count;
-                """
-                clicked_count = driver.execute_script(script)
-                if clicked_count and clicked_count > 0:
-                    print(f"Metoda 6: Kliknięto {clicked_count} przycisków 'rozwiń' przez JavaScript")
-                    time.sleep(2)  # Poczekaj na rozwinięcie
-                    # Znajdź przyciski ponownie dla dalszego przetwarzania
-                    expand_buttons = driver.find_elements(By.XPATH, "//a[contains(text(), 'rozwiń')]")
-            except Exception as e:
-                print(f"Metoda 6 nie zadziałała: {e}")
-        
-        # Debug: Wyświetl wszystkie linki w tabeli
-        if not expand_buttons:
-            print("\nDEBUG: Szukanie wszystkich linków w tabeli...")
-            try:
-                all_table_links = driver.find_elements(By.XPATH, "//table//a")
-                print(f"Znaleziono {len(all_table_links)} linków w tabeli")
-                for i, link in enumerate(all_table_links[:10]):  # Pokaż pierwsze 10
-                    try:
-                        text = link.text.strip()
-                        href = link.get_attribute("href")
-                        print(f"  Link {i+1}: tekst='{text}', href='{href}'")
-                    except:
-                        pass
-            except Exception as e:
-                print(f"Błąd podczas debugowania: {e}")
-        
-        print(f"Łącznie znaleziono {len(expand_buttons)} przycisków 'rozwiń'")
-        
-        # Kliknij każdy przycisk
-        if expand_buttons:
-            print(f"Rozpoczynanie rozwijania {len(expand_buttons)} szkół...")
-            for i, button in enumerate(expand_buttons):
-                try:
-                    # Jeśli button jest z JavaScript, może być dict/list, więc znajdź go ponownie
-                    if isinstance(button, dict) or not hasattr(button, 'click'):
-                        # Znajdź przycisk ponownie przez indeks
-                        all_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'rozwiń')]")
-                        if i < len(all_links):
-                            button = all_links[i]
-                        else:
-                            continue
-                    
-                    # Przewiń do przycisku
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                    time.sleep(0.3)  # Krótka pauza przed kliknięciem
-                    
-                    # Spróbuj kliknąć przez JavaScript (bardziej niezawodne)
-                    try:
-                        driver.execute_script("arguments[0].click();", button)
-                    except:
-                        # Jeśli JavaScript nie zadziała, spróbuj normalnego kliknięcia
-                        try:
-                            button.click()
-                        except:
-                            # Ostatnia próba - użyj akcji
-                            from selenium.webdriver.common.action_chains import ActionChains
-                            ActionChains(driver).move_to_element(button).click().perform()
-                    
-                    time.sleep(0.4)  # Poczekaj na rozwinięcie klas
-                    
-                    if (i + 1) % 10 == 0:
-                        print(f"Rozwinięto {i + 1}/{len(expand_buttons)} szkół...")
-                except Exception as e:
-                    print(f"Błąd przy klikaniu przycisku {i + 1}: {e}")
-                    continue
+        # Przeglądarki są uruchamiane dopiero, gdy backend Selenium będzie potrzebny
+        if args.attach:
+            pool = DriverPool.attach(DEFAULT_STATE_PATH if args.attach is True else args.attach, POOL_MAX_PAGES)
         else:
-            print("UWAGA: Nie znaleziono żadnych przycisków 'rozwiń'!")
-            print("Sprawdzanie struktury strony...")
-            # Spróbuj znaleźć tabelę i wyświetlić jej strukturę
-            try:
-                table = driver.find_element(By.TAG_NAME, "table")
-                rows = table.find_elements(By.TAG_NAME, "tr")
-                print(f"Znaleziono tabelę z {len(rows)} wierszami")
-                # Wyświetl pierwsze kilka wierszy
-                for i, row in enumerate(rows[:5]):
-                    try:
-                        cells = row.find_elements(By.TAG_NAME, "td")
-                        if cells:
-                            print(f"  Wiersz {i+1}: {len(cells)} komórek, pierwsza komórka: '{cells[0].text[:50]}'")
-                    except:
-                        pass
-            except Exception as e:
-                print(f"Błąd podczas sprawdzania struktury: {e}")
-        
-        # Poczekaj chwilę na pełne załadowanie wszystkich klas
-        time.sleep(2)
-        print("Wszystkie klasy zostały rozwinięte")
-        
-    except TimeoutException:
-        print("Timeout podczas oczekiwania na załadowanie strony")
-    except Exception as e:
-        print(f"Błąd podczas rozwijania klas: {e}")
+            pool = DriverPool(args.workers, POOL_MAX_PAGES, headless=not args.show_browser, mode=args.browser_mode)
+        cache = FetchCache(CACHE_DIR) if CACHE_DIR else None
+        if CHECKPOINT_PATH:
+            checkpoint = Checkpoint(CHECKPOINT_PATH)
+            if args.force:
+                checkpoint.clear()
+        if HISTORY_PATH:
+            history = HistoryStore(HISTORY_PATH)
+        report = crawl(
+            targets,
+            lambda: create_backend(args.backend, EXTRACTION_MODE, PAGE_BUDGET, EXPAND_MODE, cache, args.force, pool,
+                                   args.browser_mode),
+            workers=args.workers,
+            per_host=args.per_host,
+            min_interval=MIN_INTERVAL,
+            burst=BURST,
+            retry=RetryPolicy(RETRIES),
+            breaker_threshold=BREAKER_THRESHOLD,
+            min_schools_ratio=MIN_SCHOOLS_RATIO,
+            output_dir=args.output_dir,
+            merged_path=args.merged,
+            jsonl_path=args.jsonl,
+            checkpoint=checkpoint,
+            history=history,
+            bundle_dir=BUNDLE_DIR,
+            diff_path=DIFF_OUTPUT,
+        )
 
-def scrape_data(driver):
-    """Pobiera dane o szkołach i klasach z rozwiniętej strony."""
-    data = []
-    
-    try:
-        # Znajdź wszystkie wiersze w tabeli
-        rows = driver.find_elements(By.XPATH, "//table//tr")
-        
-        current_school = None
-        
-        for row in rows:
-            try:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                
-                if len(cells) >= 2:
-                    # Sprawdź, czy to wiersz ze szkołą czy z klasą
-                    school_cell = cells[0]
-                    threshold_cell = cells[1]
-                    
-                    school_text = school_cell.text.strip()
-                    threshold_text = threshold_cell.text.strip()
-                    
-                    # Jeśli w komórce szkoły jest link, to jest to wiersz ze szkołą
-                    try:
-                        school_link = school_cell.find_element(By.TAG_NAME, "a")
-                        # To jest wiersz ze szkołą
-                        current_school = school_text
-                    except NoSuchElementException:
-                        # To może być wiersz z klasą (jeśli nie ma linku w pierwszej komórce)
-                        # Sprawdź, czy threshold_text wygląda jak próg punktowy (liczba)
-                        if current_school and threshold_text and (
-                            threshold_text.replace('.', '').replace(',', '').isdigit() or
-                            'od' in threshold_text.lower() or
-                            threshold_text.replace('.', '').replace(',', '').replace('-', '').isdigit()
-                        ):
-                            # To jest wiersz z klasą
-                            class_name = school_text
-                            # Sprawdź, czy to nie jest przypadkiem nazwa szkoły
-                            if not any(word in class_name.lower() for word in ['lo', 'liceum', 'licea']):
-                                data.append((current_school, class_name, threshold_text))
-                        elif not current_school:
-                            # Jeśli nie mamy jeszcze szkoły, może to być pierwsza szkoła
-                            # Sprawdź, czy threshold_text zawiera "od" lub "do" (zakres progów)
-                            if 'od' in threshold_text.lower() or 'do' in threshold_text.lower():
-                                current_school = school_text
-                                
-            except Exception as e:
-                continue
-        
-        # Alternatywna metoda: znajdź wszystkie wiersze z klasami bezpośrednio
-        # Klasy mają strukturę: pierwsza komórka to nazwa klasy, druga to próg
-        class_rows = driver.find_elements(By.XPATH, "//table//tr[td[2][not(contains(text(), 'od')) and not(contains(text(), 'więcej')) and not(contains(text(), 'rozwiń')) and not(contains(text(), 'zwiń'))]]")
-        
-        # Przejdź przez wszystkie wiersze i znajdź klasy
-        all_rows = driver.find_elements(By.XPATH, "//table//tbody//tr")
-        current_school_name = None
-        
-        for row in all_rows:
-            cells = row.find_elements(By.TAG_NAME, "td")
-            if len(cells) >= 2:
-                first_cell = cells[0].text.strip()
-                second_cell = cells[1].text.strip()
-                
-                # Sprawdź, czy pierwsza komórka zawiera link do szkoły
-                try:
-                    link = cells[0].find_element(By.TAG_NAME, "a")
-                    # To jest szkoła
-                    current_school_name = first_cell
-                except NoSuchElementException:
-                    # To może być klasa
-                    # Sprawdź, czy druga komórka wygląda jak próg punktowy
-                    if current_school_name and second_cell:
-                        # Sprawdź, czy to nie jest przycisk rozwiń/zwiń
-                        if second_cell not in ['rozwiń', 'zwiń', 'więcej'] and 'od' not in second_cell.lower():
-                            # Sprawdź, czy druga komórka to liczba (próg punktowy)
-                            if second_cell.replace('.', '').replace(',', '').isdigit():
-                                data.append((current_school_name, first_cell, second_cell))
-        
-    except Exception as e:
-        print(f"Błąd podczas pobierania danych: {e}")
-    
-    return data
-
-def scrape_data_improved(driver):
-    """Ulepszona metoda pobierania danych."""
-    data = []
-    
-    try:
-        # Znajdź wszystkie wiersze w tabeli
-        rows = driver.find_elements(By.XPATH, "//table//tbody//tr")
-        
-        current_school = None
-        
-        for row in rows:
-            try:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                
-                if len(cells) < 2:
-                    continue
-                
-                first_cell_text = cells[0].text.strip()
-                second_cell_text = cells[1].text.strip()
-                
-                # Sprawdź, czy pierwsza komórka ma link (to szkoła)
-                has_link = False
-                try:
-                    link = cells[0].find_element(By.TAG_NAME, "a")
-                    # Sprawdź, czy link nie prowadzi tylko do "#" (to byłby przycisk rozwiń)
-                    href = link.get_attribute("href")
-                    if href and href != "#" and "/progi-punktowe" in href:
-                        has_link = True
-                except NoSuchElementException:
-                    pass
-                
-                if has_link:
-                    # To jest wiersz ze szkołą
-                    current_school = first_cell_text
-                elif current_school:
-                    # To może być wiersz z klasą
-                    # Sprawdź, czy druga komórka to próg punktowy (liczba)
-                    if second_cell_text:
-                        # Pomiń przyciski rozwiń/zwiń/więcej i reklamy
-                        if second_cell_text.lower() not in ['rozwiń', 'zwiń', 'więcej', 'advertisement']:
-                            # Sprawdź, czy druga komórka zawiera "od" lub "do" (zakres) - to nie jest klasa
-                            if 'od' not in second_cell_text.lower() and 'do' not in second_cell_text.lower():
-                                # Sprawdź, czy to liczba (może być z kropką jako separator dziesiętny)
-                                # Usuń wszystkie znaki oprócz cyfr i kropki/przecinka
-                                clean_threshold = ''.join(c for c in second_cell_text if c.isdigit() or c in '.,-')
-                                # Sprawdź, czy po oczyszczeniu mamy liczbę (co najmniej jedną cyfrę)
-                                if clean_threshold and clean_threshold.replace('.', '').replace(',', '').replace('-', '').isdigit():
-                                    # Sprawdź, czy pierwsza komórka nie jest pusta
-                                    # i zaczyna się od słowa "Klasa" lub zawiera typowe oznaczenia klas (np. "IA", "1A", "A")
-                                    if first_cell_text:
-                                        # Sprawdź, czy to nie jest nazwa szkoły (nie zawiera "LO", "Liceum" itp.)
-                                        if not any(word in first_cell_text.lower() for word in ['lo ', ' liceum', ' licea', 'sportowe', 'im.', 'im ']):
-                                            # To jest klasa z progiem
-                                            data.append((current_school, first_cell_text, second_cell_text))
-                                
-            except Exception as e:
-                continue
-                
-    except Exception as e:
-        print(f"Błąd podczas pobierania danych: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return data
+        for result in report.succeeded:
+            if result.changed:
+                print(f"\n{result.target}: znaleziono {result.row_count} klas, zapisano do pliku {result.output_path}")
+            else:
+                print(f"\n{result.target}: znaleziono {result.row_count} klas, bez zmian - plik {result.output_path} nie był zapisywany")
+
+            # Wyświetl przykładowe dane
+            if result.sample:
+                print("Przykładowe dane:")
+                for school, class_name, threshold in result.sample:
+                    print(f"  {school} - {class_name}: {threshold}")
+                if result.row_count > len(result.sample):
+                    print(f"  ... i {result.row_count - len(result.sample)} więcej")
+
+        if args.merged and report.merged_changed:
+            print(f"\nZapisano wszystkie dane do pliku {args.merged}")
+        if args.jsonl:
+            print(f"Zapisano wiersze JSON Lines do pliku {args.jsonl}")
+        if history is not None:
+            print(f"Zapisano historię progów do bazy {HISTORY_PATH}")
+        if DIFF_OUTPUT:
+            print(f"Zapisano raport zmian do pliku {DIFF_OUTPUT}")
+        print(f"\n{report.summary()}")
+        for result in report.failed:
+            print(f"Nie pobrano {result.target} ({result.attempts} prób): {result.error}")
+        if report.failed and checkpoint is not None:
+            print(f"Nieudane cele: {len(report.failed)} - uruchom ponownie, aby wznowić od punktu kontrolnego")
+
+        if args.on_change:
+            if report.has_changes:
+                print(f"\nDane się zmieniły - uruchamianie: {args.on_change}")
+                subprocess.run(args.on_change, shell=True, env=dict(os.environ, SCRAPER_DIFF=DIFF_OUTPUT or ""))
+            else:
+                print("\nBrak zmian w danych - pomijanie polecenia --on-change")
+
+        print(f"\n{registry.summary()}")
+        if args.metrics_json:
+            registry.write_json(args.metrics_json)
+            print(f"Zapisano pomiary do pliku {args.metrics_json}")
+        if args.metrics_prom:
+            registry.write_prometheus(args.metrics_prom)
+            print(f"Zapisano pomiary Prometheusa do pliku {args.metrics_prom}")
+        return 1 if report.failed else 0
 
-def main():
-    """Główna funkcja scrapera."""
-    driver = None
-    try:
-        print("Uruchamianie przeglądarki...")
-        driver = setup_driver()
-        
-        print(f"Ładowanie strony: {BASE_URL}")
-        driver.get(BASE_URL)
-        
-        # Poczekaj na załadowanie strony
-        time.sleep(3)
-        
-        # Najpierw zaakceptuj cookies
-        accept_cookies(driver)
-        
-        # Poczekaj chwilę po akceptacji cookies
-        time.sleep(2)
-        
-        # Rozwiń wszystkie klasy
-        print("Rozwijanie klas...")
-        expand_all_classes(driver)
-        
-        # Pobierz dane
-        print("Pobieranie danych...")
-        data = scrape_data_improved(driver)
-        
-        print(f"Znaleziono {len(data)} klas")
-        
-        # Zapis do CSV
-        output_file = "progi_licea_krakow_2025_2026.csv"
-        with open(output_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Szkoła", "Klasa", "Próg punktowy"])
-            writer.writerows(data)
-        
-        print(f"Zapisano dane do pliku {output_file}")
-        
-        # Wyświetl przykładowe dane
-        if data:
-            print("\nPrzykładowe dane:")
-            for i, (school, class_name, threshold) in enumerate(data[:5]):
-                print(f"  {school} - {class_name}: {threshold}")
-            if len(data) > 5:
-                print(f"  ... i {len(data) - 5} więcej")
-        
     except Exception as e:
         print(f"Błąd: {e}")
         import traceback
         traceback.print_exc()
+        return 1
     finally:
-        if driver:
-            driver.quit()
-            print("Zamknięto przeglądarkę")
+        if pool is not None:
+            pool.close()
+            if pool.created:
+                print(pool.summary())
+        if checkpoint is not None:
+            checkpoint.close()
+        if history is not None:
+            history.close()
+
+
+def parse(args):
+    """Parsuje zapisaną stronę (plik HTML) albo katalog stron (scraper.archive) bez sieci; zwraca kod wyjścia."""
+    from pathlib import Path
+
+    if Path(args.input).is_dir():
+        from scraper.archive import parse_archive
+
+        report = parse_archive(args.input, args.output, args.workers, args.max_memory_mb)
+        print(report.summary())
+        return 1 if report.failed else 0
+
+    from scraper.archive import parse_snapshot
+    from scraper.output import CsvSink
+
+    try:
+        rows, rejected, schools = parse_snapshot(args.input)
+    except ValueError as e:
+        print(f"{args.input}: {e} - plik {args.output} nie był zapisywany")
+        return 1
+    with CsvSink(args.output) as sink:
+        for row in rows:
+            sink.write(row)
+    print(f"{args.input}: {len(rows)} klas, {schools} szkół - "
+          f"{'zapisano do pliku' if sink.changed else 'bez zmian, plik nie był zapisywany:'} {args.output}")
+    if rejected:
+        print(f"Odrzucono {rejected} niepoprawnych wierszy")
+    return 0
+
+
+def diff(args):
+    """Porównuje dwa pliki CSV; kod wyjścia 1, gdy są zmiany (jak diff)."""
+    from scraper.diff import report_diff
+
+    return 1 if report_diff(args.previous, args.current, args.json) else 0
+
+
+def bench_names():
+    """Nazwy benchmarków z katalogu benchmarks/ (bench_<nazwa>.py)."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+    return sorted(name[len("bench_"):-len(".py")] for name in os.listdir(directory)
+                  if name.startswith("bench_") and name.endswith(".py"))
+
+
+def bench(args):
+    """Uruchamia benchmark benchmarks.bench_<nazwa> z podanymi argumentami."""
+    import runpy
+
+    sys.argv = [f"benchmarks.bench_{args.name}"] + args.args
+    try:
+        runpy.run_module(f"benchmarks.bench_{args.name}", run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Scraper progów punktowych liceów (otouczelnie.pl)",
+        epilog="Bez polecenia uruchamiane jest fetch (np. python licea-webscraper.py --force).",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="{" + ",".join(COMMANDS) + "}")
+
+    fetch_parser = commands.add_parser("fetch", help="pobierz progi ze strony (HTTP/przeglądarka)")
+    fetch_parser.set_defaults(handler=fetch)
+    fetch_parser.add_argument("--url", action="append", type=parse_target, metavar="ADRES",
+                              help="adres strony z progami albo id/Miasto/rok; można podać wielokrotnie "
+                                   f"(domyślnie: {', '.join(TARGETS)})")
+    fetch_parser.add_argument("--output-dir", default=".", metavar="KATALOG",
+                              help="katalog plików CSV celów (domyślnie: bieżący)")
+    fetch_parser.add_argument("--merged", default=MERGED_OUTPUT, metavar="PLIK",
+                              help="wspólny plik CSV dla wszystkich celów (z kolumnami Miasto i Rok)")
+    fetch_parser.add_argument("--jsonl", default=JSONL_OUTPUT, metavar="PLIK",
+                              help="plik JSON Lines zapisywany na bieżąco")
+    fetch_parser.add_argument("--backend", choices=["auto", "http", "selenium"], default=BACKEND,
+                              help=f"sposób pobierania (domyślnie: {BACKEND})")
+    fetch_parser.add_argument("--browser-mode", choices=["lean", "full"], default=BROWSER_MODE,
+                              help=f"tryb przeglądarki (domyślnie: {BROWSER_MODE})")
+    fetch_parser.add_argument("--show-browser", action="store_true",
+                              help="uruchom przeglądarkę z oknem (domyślnie: bez okna)")
+    fetch_parser.add_argument("--workers", type=int, default=WORKERS,
+                              help=f"liczba wątków i przeglądarek (domyślnie: {WORKERS})")
+    fetch_parser.add_argument("--per-host", type=int, default=PER_HOST,
+                              help=f"limit równoczesnych zapytań do jednego hosta (domyślnie: {PER_HOST})")
+    fetch_parser.add_argument("--force", action="store_true",
+                              help="ignoruj cache i punkty kontrolne, pobierz wszystkie strony od nowa")
+    fetch_parser.add_argument("--metrics-json", metavar="PLIK", help="zapisz pomiary etapów jako JSON")
+    fetch_parser.add_argument("--metrics-prom", metavar="PLIK",
+                              help="zapisz pomiary w formacie Prometheusa (textfile collector)")
+    fetch_parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], help="profiluj każdy etap")
+    fetch_parser.add_argument("--profile-dir", default="profiles", help="katalog na profile (domyślnie: profiles)")
+    fetch_parser.add_argument("--attach", nargs="?", const=True, metavar="PLIK",
+                              help="podłącz się do przeglądarek demona scraper.pool "
+                                   "(adresy z pliku, domyślnie: plik stanu zapisany przez demona)")
+    fetch_parser.add_argument("--on-change", metavar="POLECENIE",
+                              help="polecenie powłoki uruchamiane tylko, gdy dane się zmieniły "
+                                   "(ścieżka raportu zmian w zmiennej SCRAPER_DIFF)")
+
+    parse_parser = commands.add_parser("parse", help="sparsuj zapisaną stronę albo katalog stron (bez sieci)")
+    parse_parser.set_defaults(handler=parse)
+    parse_parser.add_argument("input", help="plik HTML (.html/.html.gz) albo katalog stron <id>/<Miasto>/<rok>.html")
+    parse_parser.add_argument("-o", "--output", required=True, metavar="PLIK", help="wynikowy plik CSV")
+    parse_parser.add_argument("--workers", type=int,
+                              help="liczba procesów dla katalogu stron (domyślnie: liczba rdzeni)")
+    parse_parser.add_argument("--max-memory-mb", type=int, default=1024,
+                              help="limit pamięci jednego procesu dla katalogu stron (domyślnie: 1024, 0 wyłącza)")
+
+    diff_parser = commands.add_parser("diff", help="porównaj dwa pliki CSV (kod wyjścia 1, gdy są zmiany)")
+    diff_parser.set_defaults(handler=diff)
+    diff_parser.add_argument("previous", help="poprzedni plik CSV")
+    diff_parser.add_argument("current", help="nowy plik CSV")
+    diff_parser.add_argument("--json", metavar="PLIK", help="zapisz raport JSON do pliku")
+
+    bench_parser = commands.add_parser("bench", help="uruchom benchmark z katalogu benchmarks/")
+    bench_parser.set_defaults(handler=bench)
+    bench_parser.add_argument("name", choices=bench_names(), metavar="NAZWA",
+                              help="benchmark: " + ", ".join(bench_names()))
+    bench_parser.add_argument("args", nargs=argparse.REMAINDER, help="argumenty benchmarku")
+    return parser
+
+
+def main(argv=None):
+    """Główna funkcja scrapera; zwraca kod wyjścia."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        # Zgodność wstecz: "python licea-webscraper.py [--force ...]" to pobieranie
+        argv = ["fetch"] + argv
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
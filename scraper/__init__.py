@@ -0,0 +1,6 @@
+"""
+Pakiet scrapera progów punktowych liceów (otouczelnie.pl).
+
+Punkt wejścia dla użytkownika to skrypt ``licea-webscraper.py``; tutaj
+znajduje się logika, którą można importować (np. z benchmarków).
+"""
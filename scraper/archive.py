@@ -0,0 +1,305 @@
+"""
+Parsowanie archiwum zapisanych stron z progami w wielu procesach (uzupełnianie historii).
+
+Strony pobiera się raz na dysk (np. benchmarks.record albo zapis z przeglądarki),
+a parsowanie - najwolniejsza część przy setkach stron - jest rozkładane na
+procesy ProcessPoolExecutor, po jednej stronie na zadanie. Wyniki są scalane w
+kolejności plików do jednego CSV (z kolumnami Miasto i Rok), opcjonalnie do
+osobnych CSV celów i do bazy historii (zob. scraper.history).
+
+Układ katalogu - cel jest odczytywany ze ścieżki pliku względem katalogu:
+    298/Krakow/2025-2026.html       (jak w adresie strony)
+    298_Krakow_2025-2026.html       (płasko)
+Pliki mogą być skompresowane gzipem (.html.gz).
+
+Każdy proces ma limit pamięci (RLIMIT_AS, tylko systemy uniksowe), więc
+uszkodzona lub ogromna strona kończy się błędem tej strony, a nie zajęciem
+całej pamięci maszyny.
+
+Użycie z wiersza poleceń (z katalogu głównego repozytorium):
+    python -m scraper.archive archiwum/ progi_licea_archiwum.csv [--workers 4] [--max-memory-mb 512]
+        [--output-dir katalog] [--history progi_historia.sqlite]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+import argparse
+import gzip
+import os
+import sys
+import time
+
+from scraper.extract import parse_table_html, validate_rows
+from scraper.output import MERGED_CSV_HEADER, CsvSink
+
+if TYPE_CHECKING:
+    # Tylko dla adnotacji - procesy parsujące nie importują scraper.crawl (ani requests)
+    from scraper.crawl import Target
+
+try:
+    import resource
+except ImportError:
+    # Windows - bez limitu pamięci procesów
+    resource = None
+
+# Domyślny limit pamięci wirtualnej jednego procesu (MB)
+DEFAULT_MAX_MEMORY_MB = 1024
+
+SNAPSHOT_SUFFIXES = (".html", ".htm", ".html.gz", ".htm.gz")
+
+
+def _snapshot_name(path):
+    """Nazwa pliku bez rozszerzenia strony (.html, .html.gz)."""
+    name = path.name
+    for suffix in SNAPSHOT_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return None
+
+
+def find_snapshots(directory):
+    """Posortowana lista (ścieżka, Target) zapisanych stron w katalogu (rekurencyjnie)."""
+    # scraper.crawl (a z nim requests) jest potrzebny dopiero tutaj - parse_snapshot w procesach go nie importuje
+    from scraper.crawl import Target
+
+    directory = Path(directory)
+    snapshots = []
+    for path in sorted(directory.rglob("*")):
+        name = _snapshot_name(path)
+        if name is None or not path.is_file():
+            continue
+        relative = path.relative_to(directory).parent / name
+        try:
+            target = Target.parse(relative.as_posix().replace("_", "/"))
+        except ValueError:
+            print(f"Pominięto {path}: nazwa nie pasuje do <id>/<Miasto>/<rok>.html ani <id>_<Miasto>_<rok>.html")
+            continue
+        snapshots.append((path, target))
+    return snapshots
+
+
+def limit_memory(max_bytes):
+    """Inicjalizator procesu: limit pamięci wirtualnej (przekroczenie -> MemoryError w zadaniu)."""
+    if resource is None or not max_bytes:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        max_bytes = min(max_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, hard))
+
+
+def _parse_file(path):
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        html = f.read()
+    stats = {}
+    rows = list(validate_rows(parse_table_html(html, include_hidden=True), stats))
+    schools = len({school for school, _, _ in rows})
+    if not schools:
+        # Strona błędu, captcha albo ucięty zapis - cel nie może zniknąć z wyniku po cichu
+        raise ValueError("brak tabeli progów (strona błędu, captcha albo ucięty zapis?)")
+    return rows, stats.get("rejected", 0), schools
+
+
+def parse_snapshot(path):
+    """
+    Zadanie procesu: parsuje jedną zapisaną stronę.
+
+    Zwraca (wiersze, liczba odrzuconych, liczba szkół); wiersze to poprawne
+    krotki (szkoła, klasa, próg) - przez granicę procesu przechodzi tylko wynik.
+    Strona bez żadnej szkoły z progami kończy się błędem ValueError.
+    """
+    try:
+        return _parse_file(path)
+    except MemoryError:
+        pass
+    # Poza blokiem except traceback (z całym drzewem HTML) jest już zwolniony - proces
+    # może odesłać błąd i przyjąć kolejną stronę
+    raise MemoryError(f"przekroczono limit pamięci procesu przy {path}")
+
+
+def _iter_outcomes(snapshots, workers, max_bytes):
+    """
+    Zwraca (ścieżka, cel, wynik parse_snapshot albo wyjątek) w kolejności plików.
+
+    Gdy proces zostanie zabity albo zabraknie mu pamięci, strony czekające w
+    kolejce są anulowane, a wyniki stron już sparsowanych - zachowane. Strona, na
+    którą czekano, jest najpierw parsowana osobno w nowym procesie (tak wiadomo,
+    która strona zawiniła), a do nowej puli trafiają tylko strony bez wyniku.
+    """
+    pending = list(snapshots)
+    finished = {}
+    isolate = False
+    while pending:
+        batch = pending[:1] if isolate else [(path, target) for path, target in pending if path not in finished]
+        isolate = False
+        futures = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=limit_memory, initargs=(max_bytes,)) as pool:
+            for path, _ in batch:
+                futures[path] = pool.submit(parse_snapshot, str(path))
+            while pending:
+                path, target = pending[0]
+                if path in finished:
+                    outcome = finished.pop(path)
+                elif path not in futures:
+                    break
+                else:
+                    try:
+                        outcome = futures[path].result()
+                    except (BrokenProcessPool, MemoryError) as e:
+                        # Pamięć procesu mogła zająć wcześniejsza strona - winna jest dopiero
+                        # strona, która nie mieści się w limicie w nowym procesie
+                        if len(futures) > 1:
+                            isolate = True
+                            for future in futures.values():
+                                future.cancel()
+                            break
+                        outcome = e
+                    except Exception as e:
+                        outcome = e
+                pending.pop(0)
+                yield path, target, outcome
+        if isolate:
+            # Pula jest już zamknięta - strony dokończone przed błędem nie są parsowane ponownie
+            for path, _ in pending[1:]:
+                future = futures.get(path)
+                if future is None or future.cancelled():
+                    continue
+                error = future.exception()
+                if error is None:
+                    finished[path] = future.result()
+                elif not isinstance(error, (BrokenProcessPool, MemoryError)):
+                    finished[path] = error
+
+
+@dataclass
+class SnapshotResult:
+    path: Path
+    target: "Target"
+    row_count: int = 0
+    schools: int = 0
+    rejected: int = 0
+    error: str = None
+
+
+@dataclass
+class ArchiveReport:
+    results: list = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+    merged_changed: bool = False
+
+    @property
+    def failed(self):
+        return [r for r in self.results if r.error is not None]
+
+    def summary(self):
+        parsed = len(self.results) - len(self.failed)
+        rows = sum(r.row_count for r in self.results)
+        rate = len(self.results) / self.elapsed if self.elapsed else 0.0
+        return (f"Strony: {parsed}/{len(self.results)} sparsowane, {rows} klas w {self.elapsed:.1f} s "
+                f"({rate:.1f} stron/s, procesy: {self.workers})")
+
+
+def parse_archive(directory, merged_path, workers=None, max_memory_mb=DEFAULT_MAX_MEMORY_MB,
+                  output_dir=None, history=None):
+    """
+    Parsuje wszystkie strony z ``directory`` w ``workers`` procesach i zwraca ArchiveReport.
+
+    merged_path   - wspólny CSV (Miasto, Rok, Szkoła, Klasa, Próg), w kolejności plików
+    output_dir    - jeśli podany, każdy cel jest też zapisywany do osobnego CSV
+    history       - opcjonalny scraper.history.HistoryStore; każdy cel jest dopisywany
+                    jako przebieg
+    max_memory_mb - limit pamięci jednego procesu (0 lub None wyłącza limit)
+
+    Wyniki są odbierane i zapisywane w kolejności plików, więc wynik nie zależy
+    od liczby procesów. Strona z błędem jest pomijana (z komunikatem), a plik
+    zbiorczy nie jest wtedy zapisywany, żeby nie wyglądał na kompletny.
+    """
+    snapshots = find_snapshots(directory)
+    workers = workers or os.cpu_count() or 1
+    report = ArchiveReport(workers=workers)
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    max_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+
+    start = time.perf_counter()
+    merged = CsvSink(merged_path, header=MERGED_CSV_HEADER)
+    try:
+        for path, target, outcome in _iter_outcomes(snapshots, workers, max_bytes):
+            result = SnapshotResult(path, target)
+            report.results.append(result)
+            if isinstance(outcome, MemoryError):
+                result.error = f"przekroczono limit pamięci procesu ({max_memory_mb} MB)"
+            elif isinstance(outcome, BrokenProcessPool):
+                result.error = "proces parsujący został zakończony przez system (np. po przekroczeniu limitu pamięci)"
+            elif isinstance(outcome, Exception):
+                result.error = str(outcome) or type(outcome).__name__
+            if result.error is not None:
+                print(f"Błąd dla {path}: {result.error}")
+                continue
+
+            rows, result.rejected, result.schools = outcome
+            result.row_count = len(rows)
+            prefix = (target.slug, target.year)
+            for row in rows:
+                merged.write(prefix + row)
+            if output_dir is not None:
+                with CsvSink(Path(output_dir) / target.output_name) as sink:
+                    for row in rows:
+                        sink.write(row)
+            if history is not None:
+                try:
+                    history.append_run(target.slug, target.year, rows)
+                except Exception as e:
+                    print(f"[{target}] nie udało się zapisać historii: {e}")
+    except BaseException:
+        merged.abort()
+        raise
+    report.elapsed = time.perf_counter() - start
+
+    if report.failed:
+        merged.abort()
+        print(f"Nie zapisano pliku zbiorczego {merged_path}: "
+              f"{len(report.failed)} z {len(report.results)} stron nie zostało sparsowanych")
+    else:
+        report.merged_changed = merged.commit()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parsowanie archiwum zapisanych stron z progami (wiele procesów)")
+    parser.add_argument("directory", help="katalog ze stronami (<id>/<Miasto>/<rok>.html lub <id>_<Miasto>_<rok>.html)")
+    parser.add_argument("output", help="wspólny plik CSV z kolumnami Miasto i Rok")
+    parser.add_argument("--workers", type=int, help="liczba procesów (domyślnie: liczba rdzeni)")
+    parser.add_argument("--max-memory-mb", type=int, default=DEFAULT_MAX_MEMORY_MB,
+                        help=f"limit pamięci jednego procesu (domyślnie: {DEFAULT_MAX_MEMORY_MB}, 0 wyłącza)")
+    parser.add_argument("--output-dir", help="zapisz też osobny CSV dla każdego celu")
+    parser.add_argument("--history", metavar="BAZA", help="dopisz cele do bazy historii progów")
+    args = parser.parse_args()
+
+    history = None
+    if args.history:
+        from scraper.history import HistoryStore
+        history = HistoryStore(args.history)
+    try:
+        report = parse_archive(args.directory, args.output, args.workers, args.max_memory_mb,
+                               args.output_dir, history)
+    finally:
+        if history is not None:
+            history.close()
+    for result in report.results:
+        if result.error is None:
+            print(f"[{result.target}] {result.row_count} klas, {result.schools} szkół")
+            if result.rejected:
+                print(f"[{result.target}] odrzucono {result.rejected} niepoprawnych wierszy")
+    print(report.summary())
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
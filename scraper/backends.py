@@ -0,0 +1,432 @@
+"""
+Wymienne backendy pobierania danych.
+
+- HttpBackend     - zwykłe zapytania HTTP (requests.Session z pulą połączeń) i parsowanie offline
+- SeleniumBackend - pełna przeglądarka (Chrome), rozwijanie klas przyciskami "rozwiń"
+- FallbackBackend - próbuje kolejnych backendów, dopóki któryś nie zwróci kompletnych danych
+
+Każdy backend ma metodę fetch(url) zwracającą listę krotek (szkoła, klasa, próg),
+iter_rows(url, skip_schools) zwracającą te same krotki jako generator (szkoły z
+skip_schools nie muszą być pobierane - zob. scraper.checkpoint), oraz close().
+Backendy można używać jako context manager.
+"""
+
+from urllib.parse import urljoin
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper.cache import CacheEntry, content_hash
+from scraper.extract import parse_class_rows, parse_page
+from scraper.metrics import registry, stage
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.5",
+}
+
+
+class IncompleteDataError(Exception):
+    """Backend nie zdołał pobrać kompletnych danych (np. klasy ładowane są tylko przez JavaScript)."""
+
+    def __init__(self, message, missing_schools=()):
+        super().__init__(message)
+        self.missing_schools = list(missing_schools)
+
+
+class Backend:
+    """Wspólny interfejs backendów."""
+
+    name = "base"
+    # Liczba wierszy szkół na ostatnio pobranej stronie (z rozwiniętymi klasami lub nie);
+    # None, gdy backend jej nie zna - punkt odniesienia kontroli kompletności w scraper.crawl
+    last_school_count = None
+
+    def fetch(self, url):
+        raise NotImplementedError
+
+    def iter_rows(self, url, skip_schools=frozenset()):
+        """Krotki strony jako generator (domyślnie z listy zwróconej przez fetch, bez pomijania szkół)."""
+        yield from self.fetch(url)
+
+    def set_throttle(self, throttle):
+        """
+        Ustawia ``throttle(url)`` wywoływane przed każdym dodatkowym zapytaniem strony
+        (np. fragmenty "rozwiń"), żeby podlegało limitowi tempa hosta (zob. scraper.crawl).
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def create_session(pool_size=10):
+    """Tworzy requests.Session z pulą połączeń keep-alive i nagłówkami przeglądarki."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+class HttpBackend(Backend):
+    """
+    Pobiera stronę zwykłym zapytaniem HTTP, bez przeglądarki.
+
+    Klasy są brane z ukrytych wierszy obecnych w HTML, a dla szkół, których
+    przycisk "rozwiń" ładuje klasy przez XHR, pobierany jest fragment z adresu
+    rozwinięcia. Jeśli dla którejś szkoły nie da się ustalić klas, zgłaszany jest
+    IncompleteDataError - wtedy należy użyć przeglądarki.
+
+    Z podanym cache (FetchCache) wysyłane są zapytania warunkowe: odpowiedź 304
+    albo niezmieniony HTML zwracają zapisane wiersze bez parsowania, o ile
+    fragmenty "rozwiń" (pobierane ponownie) też się nie zmieniły. force=True
+    pomija cache przy odczycie (wynik i tak jest zapisywany).
+    """
+
+    name = "http"
+
+    def __init__(self, session=None, timeout=15, cache=None, force=False):
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.cache = cache
+        self.force = force
+        self.throttle = None
+
+    def set_throttle(self, throttle):
+        self.throttle = throttle
+
+    def get_html(self, url):
+        return self._decode(self._get(url))
+
+    def _get_extra(self, url):
+        """Dodatkowe zapytanie strony (fragment "rozwiń", ponowne pobranie) - z limitem tempa, jeśli ustawiono."""
+        if self.throttle is not None:
+            self.throttle(url)
+        return self._get(url)
+
+    def _get(self, url, headers=None):
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _decode(response):
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            # Serwer nie podał kodowania - strona jest w UTF-8
+            response.encoding = "utf-8"
+        return response.text
+
+    def fetch(self, url):
+        self.last_school_count = None
+        entry = None
+        if self.cache is not None and not self.force:
+            entry = self.cache.get(url)
+        fragments = {}
+
+        with stage("http_fetch"):
+            response = self._get(url, entry.conditional_headers() if entry else None)
+            html = self._decode(response)
+        if response.status_code == 304 and entry is not None:
+            if self._fragments_unchanged(url, entry, fragments):
+                print(f"Strona bez zmian (304): {url}")
+                self.cache.touch(url)
+                self.last_school_count = len({row[0] for row in entry.rows})
+                return entry.rows
+            print(f"Strona bez zmian (304), ale zmieniły się klasy ładowane przez 'rozwiń': {url}")
+            with stage("http_fetch"):
+                response = self._get_extra(url)
+                html = self._decode(response)
+
+        body_hash = content_hash(html)
+        if entry is not None and entry.body_hash == body_hash and self._fragments_unchanged(url, entry, fragments):
+            print(f"HTML bez zmian (ten sam skrót): {url}")
+            self.cache.touch(url)
+            self.last_school_count = len({row[0] for row in entry.rows})
+            return entry.rows
+
+        with stage("http_parse"):
+            data = self._parse(url, html, fragments)
+        if self.cache is not None:
+            self.cache.put(CacheEntry(
+                url=url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                body_hash=body_hash,
+                rows=data,
+                fragments={fragment_url: content_hash(text) for fragment_url, text in fragments.items()},
+            ))
+        return data
+
+    def _fragments_unchanged(self, url, entry, fragments):
+        """
+        Pobiera ponownie fragmenty "rozwiń" z wpisu cache i porównuje ich skróty.
+
+        Pobrane fragmenty trafiają do ``fragments``, więc przy zmianie _parse ich
+        nie pobiera drugi raz. Wpis bez fragmentów (klasy w samym HTML) jest zawsze aktualny.
+        """
+        unchanged = True
+        for fragment_url, fragment_hash in entry.fragments.items():
+            if fragment_url not in fragments:
+                fragments[fragment_url] = self._decode(self._get_extra(fragment_url))
+            if content_hash(fragments[fragment_url]) != fragment_hash:
+                unchanged = False
+        return unchanged
+
+    def _parse(self, url, html, fragments=None):
+        """Wiersze strony; ``fragments`` (adres -> HTML) to pobrane już fragmenty "rozwiń", uzupełniane o nowe."""
+        fragments = {} if fragments is None else fragments
+        schools, rows = parse_page(html, include_hidden=True)
+        if not schools:
+            raise IncompleteDataError(f"Nie znaleziono tabeli szkół w HTML strony {url}")
+        self.last_school_count = len(schools)
+
+        classes_by_school = {school: [] for school, _ in schools}
+        for school, class_name, threshold in rows:
+            classes_by_school.setdefault(school, []).append((class_name, threshold))
+
+        missing = []
+        for school, expand_url in schools:
+            if classes_by_school[school]:
+                continue
+            if expand_url:
+                fragment_url = urljoin(url, expand_url)
+                if fragment_url not in fragments:
+                    fragments[fragment_url] = self._decode(self._get_extra(fragment_url))
+                classes_by_school[school] = parse_class_rows(fragments[fragment_url])
+            if not classes_by_school[school]:
+                missing.append(school)
+
+        if missing:
+            raise IncompleteDataError(
+                f"Brak klas dla {len(missing)} z {len(schools)} szkół w HTML strony {url}",
+                missing_schools=missing,
+            )
+
+        return [
+            (school, class_name, threshold)
+            for school, classes in classes_by_school.items()
+            for class_name, threshold in classes
+        ]
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumBackend(Backend):
+    """Pobiera dane przez Chrome: akceptuje cookies, rozwija klasy i czyta tabelę."""
+
+    name = "selenium"
+
+    def __init__(self, extraction_mode="snapshot", page_budget=60.0, expand_mode="batch", pool=None,
+                 browser_mode="full"):
+        self.extraction_mode = extraction_mode
+        self.page_budget = page_budget
+        self.expand_mode = expand_mode
+        self.pool = pool
+        self.browser_mode = pool.mode if pool is not None else browser_mode
+        self.last_budget = None
+        self.driver = None
+
+    def fetch(self, url):
+        return list(self.iter_rows(url))
+
+    def iter_rows(self, url, skip_schools=frozenset()):
+        """
+        Przygotowuje stronę w przeglądarce i zwraca krotki na bieżąco w miarę odczytu tabeli.
+
+        Szkoły z skip_schools nie są rozwijane, więc ich klasy nie trafiają do wyniku.
+        Z pulą (scraper.pool.DriverPool) przeglądarka jest wypożyczana na czas
+        jednej strony, a cookies są akceptowane tylko raz na przeglądarkę.
+        """
+        if self.pool is not None:
+            with self.pool.borrow() as pooled:
+                yield from self._iter_page(pooled.driver, url, skip_schools, not pooled.cookies_accepted)
+                pooled.cookies_accepted = True
+            return
+
+        from scraper.browser import setup_driver
+
+        if self.driver is None:
+            print("Uruchamianie przeglądarki...")
+            with stage("setup_driver"):
+                self.driver = registry.instrument_driver(setup_driver(mode=self.browser_mode))
+        yield from self._iter_page(self.driver, url, skip_schools)
+
+    def _iter_page(self, driver, url, skip_schools, with_cookies=True):
+        from scraper.browser import accept_cookies, expand_all_classes, expand_all_classes_batch, page_transfer_stats
+        from scraper.extract import iter_data_improved, parse_page, parse_school_rows
+        from scraper.waits import PageBudget
+
+        self.last_school_count = None
+        print(f"Ładowanie strony: {url}")
+        budget = self.last_budget = PageBudget(self.page_budget)
+        # Opróżnij log sieci, żeby liczyć tylko zapytania tej strony
+        page_transfer_stats(driver)
+        eager = self.browser_mode == "lean"
+        with stage("page_load"):
+            start = time.perf_counter()
+            driver.get(url)
+
+            # Poczekaj na załadowanie strony
+            budget.wait_for_page_ready(driver, eager=eager)
+            ready_s = time.perf_counter() - start
+
+        # Najpierw zaakceptuj cookies
+        if with_cookies:
+            with stage("accept_cookies"):
+                accept_cookies(driver, budget)
+
+        # Rozwiń wszystkie klasy; co jakiś czas zachowaj stan strony na wypadek awarii przeglądarki
+        print("Rozwijanie klas...")
+        progress = {}
+
+        def save_progress():
+            progress["html"] = driver.page_source
+
+        try:
+            with stage("expand_all_classes"):
+                if self.expand_mode == "batch":
+                    expand_all_classes_batch(driver, budget, skip_schools=skip_schools, on_progress=save_progress,
+                                             eager=eager)
+                else:
+                    expand_all_classes(driver, budget, skip_schools=skip_schools, on_progress=save_progress,
+                                       eager=eager)
+        except Exception:
+            # Klasy szkół rozwiniętych przed błędem trafiają do strumienia (i punktu kontrolnego),
+            # więc ponowienie nie rozwija ich od nowa
+            yield from self._expanded_rows(driver, progress.get("html"))
+            raise
+
+        # Pobierz dane - etap mierzy tylko odczyt strony i parsowanie, nie czas, w którym
+        # generator czeka na konsumenta (zapis CSV, punkt kontrolny)
+        print("Pobieranie danych...")
+        with stage("extract"):
+            if self.extraction_mode == "snapshot":
+                school_rows, rows = parse_page(driver.page_source, include_hidden=False)
+            else:
+                rows = list(iter_data_improved(driver))
+                school_rows = parse_school_rows(driver.page_source)
+            self.last_school_count = len(school_rows)
+        yield from rows
+        print(budget.summary())
+
+        transfer = page_transfer_stats(driver)
+        registry.record_page(self.browser_mode, ready_s, transfer)
+        message = f"Strona [{self.browser_mode}] gotowa po {ready_s:.2f} s"
+        if transfer is not None:
+            message += (f", przesłano {transfer['bytes'] / 1024:.0f} KB w {transfer['requests']} zapytaniach"
+                        f" (zablokowane: {transfer['blocked']})")
+        print(message)
+
+    @staticmethod
+    def _expanded_rows(driver, saved_html=None):
+        """Widoczne wiersze klas po błędzie rozwijania: z bieżącej strony albo z ostatniego zapisanego stanu."""
+        from scraper.extract import iter_table_html
+
+        try:
+            html = driver.page_source
+        except Exception as e:
+            if saved_html is None:
+                print(f"Nie udało się odczytać rozwiniętych klas po błędzie: {e}")
+                return []
+            print("Przeglądarka nie odpowiada - wiersze z ostatniego zapisanego stanu strony")
+            html = saved_html
+        rows = list(iter_table_html(html))
+        print(f"Błąd rozwijania - zachowano {len({school for school, _, _ in rows})} rozwiniętych szkół")
+        return rows
+
+    def close(self):
+        # Przeglądarki z puli zamyka właściciel puli
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            print("Zamknięto przeglądarkę")
+
+
+class FallbackBackend(Backend):
+    """Próbuje kolejnych backendów; następny jest używany, gdy poprzedni nie da kompletnych danych."""
+
+    name = "auto"
+
+    def __init__(self, *backends):
+        self.backends = backends
+        self.last_backend = None
+
+    @property
+    def last_school_count(self):
+        return self.last_backend.last_school_count if self.last_backend is not None else None
+
+    def set_throttle(self, throttle):
+        for backend in self.backends:
+            backend.set_throttle(throttle)
+
+    def _fetch_complete(self, url):
+        """
+        Zwraca komplet danych z pierwszego backendu, który go dostarczy (poza ostatnim), albo None.
+
+        Kolejny backend jest używany tylko przy niekompletnych danych. Błędy sieci i
+        odpowiedzi 429/5xx są przekazywane dalej - ponowienia, limit tempa i bezpiecznik
+        (scraper.crawl) mają je zobaczyć, zamiast obciążać serwer przeglądarką.
+        """
+        for backend in self.backends[:-1]:
+            try:
+                data = backend.fetch(url)
+                self.last_backend = backend
+                return data
+            except IncompleteDataError as e:
+                print(f"Backend '{backend.name}' nie pobrał kompletnych danych ({e}), próba kolejnego...")
+        self.last_backend = self.backends[-1]
+        return None
+
+    def fetch(self, url):
+        data = self._fetch_complete(url)
+        if data is None:
+            data = self.last_backend.fetch(url)
+        return data
+
+    def iter_rows(self, url, skip_schools=frozenset()):
+        # Wcześniejsze backendy muszą zwrócić komplet danych, zanim cokolwiek zostanie
+        # przekazane dalej - inaczej po przełączeniu na kolejny wiersze by się powtórzyły.
+        data = self._fetch_complete(url)
+        if data is None:
+            data = self.last_backend.iter_rows(url, skip_schools)
+        yield from data
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+
+def create_backend(name="auto", extraction_mode="snapshot", page_budget=60.0, expand_mode="batch",
+                   cache=None, force=False, pool=None, browser_mode="full"):
+    """
+    Tworzy backend o podanej nazwie: "http", "selenium" lub "auto" (HTTP z Selenium jako zapasem).
+
+    page_budget to łączny limit czasu (s) na jedną stronę w przeglądarce,
+    expand_mode to sposób rozwijania klas: "batch" (jeden skrypt) lub "click" (przycisk po przycisku),
+    cache (FetchCache) i force dotyczą backendu HTTP, a pool (scraper.pool.DriverPool)
+    i browser_mode ("full" lub "lean", zob. scraper.browser.setup_driver) - Selenium.
+    """
+    if name == "http":
+        return HttpBackend(cache=cache, force=force)
+    if name == "selenium":
+        return SeleniumBackend(extraction_mode, page_budget, expand_mode, pool, browser_mode)
+    if name == "auto":
+        return FallbackBackend(
+            HttpBackend(cache=cache, force=force),
+            SeleniumBackend(extraction_mode, page_budget, expand_mode, pool, browser_mode),
+        )
+    raise ValueError(f"Nieznany backend: {name}")
@@ -0,0 +1,562 @@
+"""Obsługa przeglądarki: uruchamianie ChromeDriver, cookies i rozwijanie klas."""
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from contextlib import contextmanager
+from functools import lru_cache
+import json
+import os
+import time
+
+from scraper.waits import PageBudget, visible_row_count
+
+# "full" - cała strona jak w zwykłej przeglądarce, "lean" - bez obrazków, fontów, reklam i analityki
+BROWSER_MODES = ("full", "lean")
+
+# Wzorce adresów blokowanych w trybie "lean" (CDP Network.setBlockedURLs, * = dowolny ciąg znaków)
+BLOCKED_URLS = [
+    # Reklamy
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+    "*amazon-adsystem.com*", "*adnxs.com*", "*criteo.*", "*pubmatic.com*", "*rubiconproject.com*",
+    "*smartadserver.com*", "*taboola.com*", "*outbrain.com*",
+    # Analityka i śledzenie
+    "*google-analytics.com*", "*googletagmanager.com*", "*googletagservices.com*", "*gemius.pl*",
+    "*hotjar.com*", "*clarity.ms*", "*scorecardresearch.com*", "*facebook.net*", "*connect.facebook.*",
+    # Fonty
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*.woff", "*.woff2", "*.ttf", "*.otf",
+]
+
+# Ustawienia profilu trybu "lean": 2 = blokuj
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+}
+
+@lru_cache(maxsize=None)
+def chromedriver_path():
+    """
+    Ścieżka do ChromeDriver: zmienna CHROMEDRIVER, webdriver-manager (raz na proces) albo None.
+
+    ChromeDriverManager().install() sprawdza wersje i może pobierać pliki, więc
+    jest wywoływane tylko raz - kolejne przeglądarki (np. w puli) używają wyniku.
+    """
+    if os.environ.get("CHROMEDRIVER"):
+        return os.environ["CHROMEDRIVER"]
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        # Jeśli webdriver-manager nie jest zainstalowany, użyj standardowego ChromeDriver
+        return None
+    return ChromeDriverManager().install()
+
+def setup_driver(headless=None, debugger_address=None, mode="full"):
+    """
+    Konfiguruje i zwraca driver Selenium.
+
+    mode="lean" to tryb oszczędny: bez okna (chyba że headless=False), bez
+    obrazków i fontów, z blokadą domen reklam i analityki (BLOCKED_URLS) oraz
+    strategią ładowania "eager". mode="full" ładuje stronę w całości.
+
+    debugger_address ("host:port") podłącza driver do działającego już Chrome
+    z --remote-debugging-port (np. z puli scraper.pool) zamiast uruchamiać nowy.
+    """
+    if mode not in BROWSER_MODES:
+        raise ValueError(f"Nieznany tryb przeglądarki: {mode}")
+    lean = mode == "lean"
+    if headless is None:
+        headless = lean
+
+    options = webdriver.ChromeOptions()
+    # Log wydajności (zdarzenia sieciowe DevTools) - z niego liczone są przesłane bajty
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if lean:
+        options.page_load_strategy = "eager"
+    if debugger_address:
+        # Do działającej przeglądarki nie można przekazać argumentów uruchomienia
+        options.debugger_address = debugger_address
+    else:
+        if headless:
+            options.add_argument('--headless=new')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        if lean:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option("prefs", LEAN_PREFS)
+    
+    try:
+        path = chromedriver_path()
+        if path:
+            from selenium.webdriver.chrome.service import Service
+            driver = webdriver.Chrome(service=Service(path), options=options)
+        else:
+            driver = webdriver.Chrome(options=options)
+        
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if lean:
+            block_urls(driver)
+        return driver
+    except Exception as e:
+        print(f"Błąd podczas uruchamiania ChromeDriver: {e}")
+        print("\nRozwiązania:")
+        print("1. Zainstaluj ChromeDriver: https://chromedriver.chromium.org/downloads")
+        print("2. Lub zainstaluj webdriver-manager: pip install webdriver-manager")
+        raise
+
+def block_urls(driver, patterns=None):
+    """Blokuje zapytania pasujące do wzorców (CDP Network.setBlockedURLs) w bieżącej karcie."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns or BLOCKED_URLS)})
+
+def page_transfer_stats(driver):
+    """
+    Przesłane bajty, liczba zapytań i zablokowanych zapytań od poprzedniego odczytu.
+
+    Dane pochodzą z logu wydajności Chrome (odczyt go opróżnia); None, jeśli
+    log jest niedostępny.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+    stats = {"bytes": 0, "requests": 0, "blocked": 0}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            stats["bytes"] += int(message["params"].get("encodedDataLength", 0))
+            stats["requests"] += 1
+        elif message["method"] == "Network.loadingFailed" and message["params"].get("blockedReason"):
+            stats["blocked"] += 1
+    return stats
+
+def accept_cookies(driver, budget=None):
+    """Akceptuje dialog cookies jeśli się pojawi."""
+    budget = budget or PageBudget()
+    try:
+        # Poczekaj na pojawienie się dialogu cookies (maksymalnie 3 sekundy)
+        print("Sprawdzanie dialogu cookies...")
+        
+        # Spróbuj znaleźć przycisk na różne sposoby
+        accept_button = None
+        
+        # Metoda 1: Przycisk z tekstem "Akceptuję"
+        accept_button = budget.wait_until(
+            driver, EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Akceptuję')]")), limit=3
+        )
+        
+        # Metoda 2: Przycisk w dialogu
+        if not accept_button:
+            try:
+                accept_button = driver.find_element(By.XPATH, "//dialog//button[contains(text(), 'Akceptuję')]")
+            except NoSuchElementException:
+                pass
+        
+        # Metoda 3: Przycisk z aria-label lub innym atrybutem
+        if not accept_button:
+            try:
+                accept_button = driver.find_element(By.XPATH, "//button[@aria-label='Akceptuję' or contains(@class, 'accept')]")
+            except NoSuchElementException:
+                pass
+        
+        if accept_button:
+            print("Znaleziono dialog cookies, akceptowanie...")
+            # Przewiń do przycisku jeśli potrzeba
+            driver.execute_script("arguments[0].scrollIntoView(true);", accept_button)
+            accept_button.click()
+            # Poczekaj na zamknięcie dialogu
+            budget.wait_until(driver, EC.invisibility_of_element(accept_button), limit=2)
+            print("Dialog cookies zaakceptowany")
+        else:
+            print("Dialog cookies nie znaleziony (może już został zaakceptowany lub nie pojawił się)")
+            
+    except TimeoutException:
+        # Dialog cookies nie pojawił się lub już został zaakceptowany
+        print("Dialog cookies nie znaleziony (może już został zaakceptowany)")
+    except Exception as e:
+        print(f"Błąd podczas akceptowania cookies: {e}")
+        # Kontynuuj mimo błędu
+
+EXPANDER_SCHOOL_SCRIPT = """
+var row = arguments[0].closest('tr');
+return row && row.cells.length ? row.cells[0].innerText : '';
+"""
+
+def expander_school(driver, button):
+    """Nazwa szkoły z wiersza, w którym jest przycisk 'rozwiń' (tekst pierwszej komórki)."""
+    return ' '.join((driver.execute_script(EXPANDER_SCHOOL_SCRIPT, button) or '').split())
+
+def click_expand_button(driver, button, budget):
+    """Klika jeden przycisk 'rozwiń' i czeka na pojawienie się nowych wierszy."""
+    # Przewiń do przycisku
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
+    rows_before = visible_row_count(driver)
+
+    # Spróbuj kliknąć przez JavaScript (bardziej niezawodne)
+    try:
+        driver.execute_script("arguments[0].click();", button)
+    except:
+        # Jeśli JavaScript nie zadziała, spróbuj normalnego kliknięcia
+        try:
+            button.click()
+        except:
+            # Ostatnia próba - użyj akcji
+            from selenium.webdriver.common.action_chains import ActionChains
+            ActionChains(driver).move_to_element(button).click().perform()
+
+    # Poczekaj na rozwinięcie klas (pojawienie się nowych wierszy)
+    return budget.wait_for_row_growth(driver, rows_before)
+
+def expand_all_classes(driver, budget=None, skip_schools=frozenset(), on_progress=None, eager=False):
+    """
+    Kliknie wszystkie przyciski 'rozwiń' na stronie.
+
+    Zamiast stałych pauz czeka na zdarzenia: załadowanie dokumentu i wzrost
+    liczby widocznych wierszy po każdym kliknięciu. Wszystkie oczekiwania
+    mieszczą się w budżecie czasu strony (PageBudget). Szkoły z skip_schools
+    (już pobrane - zob. scraper.checkpoint) nie są rozwijane. on_progress()
+    jest wywoływane co 10 szkół, np. żeby zachować stan strony na wypadek awarii.
+    eager=True (tryb "lean" przeglądarki) czeka tylko na "interactive", jak ładowanie strony.
+    """
+    budget = budget or PageBudget()
+    try:
+        # Poczekaj na załadowanie strony
+        print("Oczekiwanie na załadowanie tabeli...")
+        if not budget.wait_until(driver, EC.presence_of_element_located((By.TAG_NAME, "table")), limit=15):
+            raise TimeoutException("Nie znaleziono tabeli")
+        print("Tabela załadowana")
+        
+        # Poczekaj na załadowanie dokumentu (skrypty obsługujące "rozwiń")
+        budget.wait_for_page_ready(driver, eager=eager)
+        
+        # Spróbuj różnych selektorów
+        expand_buttons = []
+        
+        # Metoda 1: Linki z tekstem "rozwiń"
+        try:
+            buttons1 = driver.find_elements(By.XPATH, "//a[contains(text(), 'rozwiń')]")
+            if buttons1:
+                expand_buttons = buttons1
+                print(f"Metoda 1: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez tekst")
+        except Exception as e:
+            print(f"Metoda 1 nie zadziałała: {e}")
+        
+        # Metoda 2: Linki z href="#" zawierające "rozwiń"
+        if not expand_buttons:
+            try:
+                buttons2 = driver.find_elements(By.XPATH, "//a[@href='#' and contains(text(), 'rozwiń')]")
+                if buttons2:
+                    expand_buttons = buttons2
+                    print(f"Metoda 2: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez href='#'")
+            except Exception as e:
+                print(f"Metoda 2 nie zadziałała: {e}")
+        
+        # Metoda 3: Wszystkie linki w tabeli i filtrowanie
+        if not expand_buttons:
+            try:
+                all_links = driver.find_elements(By.XPATH, "//table//a")
+                expand_buttons = [link for link in all_links if 'rozwiń' in link.text.lower()]
+                if expand_buttons:
+                    print(f"Metoda 3: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez filtrowanie linków")
+            except Exception as e:
+                print(f"Metoda 3 nie zadziałała: {e}")
+        
+        # Metoda 4: Znajdź przez częściowy tekst (case-insensitive)
+        if not expand_buttons:
+            try:
+                buttons4 = driver.find_elements(By.XPATH, "//a[contains(translate(text(), 'ROZWIŃ', 'rozwiń'), 'rozwiń')]")
+                if buttons4:
+                    expand_buttons = buttons4
+                    print(f"Metoda 4: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' (case-insensitive)")
+            except Exception as e:
+                print(f"Metoda 4 nie zadziałała: {e}")
+        
+        # Metoda 5: Użyj selektora CSS
+        if not expand_buttons:
+            try:
+                # Znajdź wszystkie linki w tabeli i sprawdź ich tekst
+                buttons5 = driver.find_elements(By.CSS_SELECTOR, "table a")
+                expand_buttons = [btn for btn in buttons5 if 'rozwiń' in btn.text.lower()]
+                if expand_buttons:
+                    print(f"Metoda 5: Znaleziono {len(expand_buttons)} przycisków 'rozwiń' przez CSS selector")
+            except Exception as e:
+                print(f"Metoda 5 nie zadziałała: {e}")
+        
+        # Metoda 6: Użyj JavaScript do znalezienia wszystkich linków z tekstem "rozwiń" i kliknij je bezpośrednio
+        if not expand_buttons:
+            try:
+                script = """
+                var links = document.querySelectorAll('a');
+                var count = 0;
+                for (var i = 0; i < links.length; i++) {
+                    if (links[i].textContent.toLowerCase().includes('rozwiń')) {
+                        links[i].click();
+                        count++;
+                    }
+                }
+                return count;
+                """
+                rows_before = visible_row_count(driver)
+                clicked_count = driver.execute_script(script)
+                if clicked_count and clicked_count > 0:
+                    print(f"Metoda 6: Kliknięto {clicked_count} przycisków 'rozwiń' przez JavaScript")
+                    # Poczekaj na rozwinięcie
+                    budget.wait_for_row_growth(driver, rows_before)
+                    budget.wait_for_stable_rows(driver)
+                    # Znajdź przyciski ponownie dla dalszego przetwarzania
+                    expand_buttons = driver.find_elements(By.XPATH, "//a[contains(text(), 'rozwiń')]")
+            except Exception as e:
+                print(f"Metoda 6 nie zadziałała: {e}")
+        
+        # Debug: Wyświetl wszystkie linki w tabeli
+        if not expand_buttons:
+            print("\nDEBUG: Szukanie wszystkich linków w tabeli...")
+            try:
+                all_table_links = driver.find_elements(By.XPATH, "//table//a")
+                print(f"Znaleziono {len(all_table_links)} linków w tabeli")
+                for i, link in enumerate(all_table_links[:10]):  # Pokaż pierwsze 10
+                    try:
+                        text = link.text.strip()
+                        href = link.get_attribute("href")
+                        print(f"  Link {i+1}: tekst='{text}', href='{href}'")
+                    except:
+                        pass
+            except Exception as e:
+                print(f"Błąd podczas debugowania: {e}")
+        
+        print(f"Łącznie znaleziono {len(expand_buttons)} przycisków 'rozwiń'")
+        
+        # Kliknij każdy przycisk
+        if expand_buttons:
+            print(f"Rozpoczynanie rozwijania {len(expand_buttons)} szkół...")
+            for i, button in enumerate(expand_buttons):
+                if budget.exceeded:
+                    print(f"UWAGA: Przekroczono budżet czasu strony - rozwinięto {i}/{len(expand_buttons)} szkół")
+                    break
+                try:
+                    # Jeśli button jest z JavaScript, może być dict/list, więc znajdź go ponownie
+                    if isinstance(button, dict) or not hasattr(button, 'click'):
+                        # Znajdź przycisk ponownie przez indeks
+                        all_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'rozwiń')]")
+                        if i < len(all_links):
+                            button = all_links[i]
+                        else:
+                            continue
+                    
+                    if skip_schools and expander_school(driver, button) in skip_schools:
+                        continue
+                    click_expand_button(driver, button, budget)
+                    
+                    if (i + 1) % 10 == 0:
+                        print(f"Rozwinięto {i + 1}/{len(expand_buttons)} szkół...")
+                        if on_progress is not None:
+                            on_progress()
+                except Exception as e:
+                    print(f"Błąd przy klikaniu przycisku {i + 1}: {e}")
+                    continue
+        else:
+            print("UWAGA: Nie znaleziono żadnych przycisków 'rozwiń'!")
+            print("Sprawdzanie struktury strony...")
+            # Spróbuj znaleźć tabelę i wyświetlić jej strukturę
+            try:
+                table = driver.find_element(By.TAG_NAME, "table")
+                rows = table.find_elements(By.TAG_NAME, "tr")
+                print(f"Znaleziono tabelę z {len(rows)} wierszami")
+                # Wyświetl pierwsze kilka wierszy
+                for i, row in enumerate(rows[:5]):
+                    try:
+                        cells = row.find_elements(By.TAG_NAME, "td")
+                        if cells:
+                            print(f"  Wiersz {i+1}: {len(cells)} komórek, pierwsza komórka: '{cells[0].text[:50]}'")
+                    except:
+                        pass
+            except Exception as e:
+                print(f"Błąd podczas sprawdzania struktury: {e}")
+        
+        # Poczekaj, aż wszystkie klasy się wyrenderują (liczba wierszy przestanie rosnąć)
+        budget.wait_for_stable_rows(driver)
+        print("Wszystkie klasy zostały rozwinięte")
+        
+    except TimeoutException:
+        # Bez tabeli nie ma czego pobierać - błąd trafia do ponowień w scraper.crawl
+        print("Timeout podczas oczekiwania na załadowanie strony")
+        raise
+    except Exception as e:
+        print(f"Błąd podczas rozwijania klas: {e}")
+        raise
+
+
+# Klika wszystkie przyciski "rozwiń" naraz i czeka w przeglądarce (MutationObserver),
+# aż pod każdą szkołą pojawią się widoczne wiersze klas albo minie limit czasu.
+# Nierozwinięte przyciski dostają atrybut data-scraper-pending.
+EXPAND_ALL_SCRIPT = """
+var timeoutMs = arguments[0];
+var skip = new Set(arguments[1]);
+var done = arguments[arguments.length - 1];
+
+function schoolName(a) {
+    var row = a.closest('tr');
+    return row && row.cells.length ? row.cells[0].innerText.replace(/\\s+/g, ' ').trim() : '';
+}
+
+var allLinks = Array.prototype.filter.call(document.querySelectorAll('a'), function (a) {
+    return a.textContent.toLowerCase().indexOf('rozwiń') !== -1;
+});
+var expanderRows = new Set(allLinks.map(function (a) { return a.closest('tr'); }));
+var links = allLinks.filter(function (a) { return !skip.has(schoolName(a)); });
+var rows = links.map(function (a) { return a.closest('tr'); });
+
+function visible(el) { return el.getClientRects().length > 0; }
+
+// Wiersz klasy: druga komórka to sam próg (liczba) - nie reklama, nagłówek ani zakres "od ... do ..."
+function isClassRow(row) {
+    return row.cells.length >= 2 && /^\\s*\\d+(?:[.,]\\d+)?\\s*$/.test(row.cells[1].textContent);
+}
+
+// Szkoła jest rozwinięta, gdy między nią a następną szkołą jest widoczny wiersz klasy
+// (same widoczne wiersze, np. reklamy pod szkołą, nie wystarczą)
+function opened(i) {
+    if (!rows[i]) { return true; }
+    for (var next = rows[i].nextElementSibling; next && !expanderRows.has(next); next = next.nextElementSibling) {
+        if (visible(next) && isClassRow(next)) { return true; }
+    }
+    return false;
+}
+
+function visibleRows() {
+    return Array.prototype.filter.call(document.querySelectorAll('table tr'), visible).length;
+}
+
+var pending = [];
+var clicked = 0;
+links.forEach(function (a, i) {
+    a.removeAttribute('data-scraper-pending');
+    if (!opened(i)) {
+        a.click();
+        clicked++;
+        pending.push(i);
+    }
+});
+
+var observer = null;
+var timer = null;
+var finished = false;
+
+function finish() {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    if (timer) { clearTimeout(timer); }
+    pending.forEach(function (i) { links[i].setAttribute('data-scraper-pending', '1'); });
+    done({found: links.length, clicked: clicked, pending: pending.length, rows: visibleRows()});
+}
+
+function check() {
+    pending = pending.filter(function (i) { return !opened(i); });
+    if (!pending.length) { finish(); }
+}
+
+observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true, attributes: true,
+                                 attributeFilter: ['style', 'class', 'hidden']});
+timer = setTimeout(finish, timeoutMs);
+check();
+"""
+
+def expand_all_classes_batch(driver, budget=None, limit=15.0, skip_schools=frozenset(), on_progress=None,
+                             eager=False):
+    """
+    Rozwija wszystkie klasy jednym skryptem w przeglądarce (jedno zapytanie zamiast O(liczba szkół)).
+
+    Skrypt klika wszystkie przyciski 'rozwiń' i czeka wewnątrz strony, aż
+    klasy się wyrenderują. Tylko przyciski, które się nie rozwinęły, są potem
+    klikane pojedynczo (click_expand_button). Jeśli skrypt nie znajdzie żadnego
+    przycisku, używana jest pełna procedura expand_all_classes. Szkoły z
+    skip_schools nie są rozwijane. on_progress() jest wywoływane po skrypcie,
+    przed klikaniem pojedynczych przycisków. eager - jak w expand_all_classes.
+    """
+    budget = budget or PageBudget()
+    try:
+        print("Oczekiwanie na załadowanie tabeli...")
+        if not budget.wait_until(driver, EC.presence_of_element_located((By.TAG_NAME, "table")), limit=15):
+            raise TimeoutException("Nie znaleziono tabeli")
+        budget.wait_for_page_ready(driver, eager=eager)
+
+        timeout = budget.timeout(limit)
+        driver.set_script_timeout(timeout + 5)
+        start = time.monotonic()
+        result = driver.execute_async_script(EXPAND_ALL_SCRIPT, int(timeout * 1000), sorted(skip_schools))
+        budget.waited += time.monotonic() - start
+
+        if not result["found"] and not skip_schools:
+            print("Skrypt nie znalazł przycisków 'rozwiń' - próba innych metod...")
+            expand_all_classes(driver, budget, on_progress=on_progress, eager=eager)
+            return
+
+        print(f"Kliknięto {result['clicked']} z {result['found']} przycisków 'rozwiń' jednym skryptem, "
+              f"widocznych wierszy: {result['rows']}")
+
+        if result["pending"]:
+            if on_progress is not None:
+                on_progress()
+            pending = driver.find_elements(By.CSS_SELECTOR, "a[data-scraper-pending]")
+            print(f"Nie rozwinęło się {len(pending)} szkół - klikanie pojedynczo...")
+            for i, button in enumerate(pending):
+                if budget.exceeded:
+                    print(f"UWAGA: Przekroczono budżet czasu strony - pominięto {len(pending) - i} szkół")
+                    break
+                try:
+                    click_expand_button(driver, button, budget)
+                except Exception as e:
+                    print(f"Błąd przy klikaniu przycisku {i + 1}: {e}")
+
+        print("Wszystkie klasy zostały rozwinięte")
+
+    except TimeoutException:
+        # Bez tabeli nie ma czego pobierać - błąd trafia do ponowień w scraper.crawl
+        print("Timeout podczas oczekiwania na załadowanie strony")
+        raise
+    except Exception as e:
+        print(f"Błąd podczas rozwijania klas: {e}")
+        raise
+
+
+class CommandCounter:
+    """Licznik komend WebDriver (każda komenda to jedno zapytanie HTTP do ChromeDriver)."""
+
+    def __init__(self):
+        self.count = 0
+        self.by_command = {}
+
+    def record(self, command):
+        self.count += 1
+        self.by_command[command] = self.by_command.get(command, 0) + 1
+
+
+@contextmanager
+def count_commands(driver):
+    """
+    Zlicza komendy wysyłane przez driver wewnątrz bloku ``with``.
+
+    Wszystkie wywołania WebDriver i WebElement przechodzą przez ``driver.execute``,
+    więc podmieniamy tę metodę na czas pomiaru.
+    """
+    counter = CommandCounter()
+    original_execute = driver.execute
+    # driver.execute może być już podmieniony (np. przez scraper.metrics) - przywróć dokładnie ten sam
+    was_patched = "execute" in vars(driver)
+
+    def counting_execute(driver_command, params=None):
+        counter.record(driver_command)
+        return original_execute(driver_command, params)
+
+    driver.execute = counting_execute
+    try:
+        yield counter
+    finally:
+        if was_patched:
+            driver.execute = original_execute
+        else:
+            del driver.execute
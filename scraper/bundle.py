@@ -0,0 +1,151 @@
+"""
+Gotowa paczka danych dla front-endu (JSON) zapisywana obok pliku CSV.
+
+Front-end zamiast parsować CSV i wyciągać profile wyrażeniem regularnym przy
+każdym wczytaniu strony dostaje dane już przetworzone. Profile są wyciągane i
+normalizowane tak samo jak extractProfile/normalizeProfile w utils/csvParser.ts.
+Format (kolumnowy, bez zbędnych spacji):
+
+    {
+      "version": 1,
+      "schools": ["I LO Sportowe", ...],                  nazwy szkół
+      "profiles": [{"name": "fiz-inf-mat", "original": "mat-fiz-inf"}, ...],   w kolejności wystąpienia
+      "rows": {                                           kolumny wierszy (klas)
+        "school": [0, 0, 1, ...],                         indeks w "schools"
+        "className": ["Klasa IA (...)", ...],
+        "threshold": [53.0, 76.0, ...],
+        "profile": [3, -1, ...]                           indeks w "profiles" albo -1
+      },
+      "byThreshold": [4, 0, ...],                         indeksy wierszy wg rosnącego progu
+      "thresholds": [53.0, 76.0, ...],                    progi w tej samej kolejności
+      "profileIndex": {"fiz-inf-mat": [7, 2, ...], ...}   wiersze profilu wg rosnącego progu
+    }
+
+Klasy "w zasięgu" N punktów to byThreshold[:k], gdzie k to wynik wyszukiwania
+binarnego N w "thresholds" (zob. classes_within_reach). Obok pliku .json
+zapisywane są wersje skompresowane: .json.gz i .json.br (jeśli dostępny jest
+pakiet brotli).
+"""
+
+from bisect import bisect_right
+from pathlib import Path
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from scraper.classify import iter_records, normalize_profile
+from scraper.output import replace_file
+
+try:
+    import brotli
+except ImportError:
+    # Bez pakietu brotli zapisywana jest tylko wersja gzip
+    brotli = None
+
+BUNDLE_VERSION = 1
+
+
+def build_bundle(rows):
+    """Buduje paczkę (słownik) z krotek (szkoła, klasa, próg); wiersze bez liczbowego progu są pomijane."""
+    schools, school_ids = [], {}
+    profiles, profile_ids = [], {}
+    columns = {"school": [], "className": [], "threshold": [], "profile": []}
+    members = {}
+
+    for record in iter_records(rows):
+        school, class_name, original = record.school, record.class_name, record.profile
+        if not school or not class_name:
+            continue
+        if school not in school_ids:
+            school_ids[school] = len(schools)
+            schools.append(school)
+
+        profile_id = -1
+        if original:
+            name = normalize_profile(original)
+            if name not in profile_ids:
+                # Jak w csvParser.ts: oryginalna nazwa to pierwsza spotkana dla danego profilu
+                profile_ids[name] = len(profiles)
+                profiles.append({"name": name, "original": original})
+            profile_id = profile_ids[name]
+            members.setdefault(name, []).append(len(columns["threshold"]))
+
+        columns["school"].append(school_ids[school])
+        columns["className"].append(class_name)
+        columns["threshold"].append(float(record.threshold))
+        columns["profile"].append(profile_id)
+
+    thresholds = columns["threshold"]
+    by_threshold = sorted(range(len(thresholds)), key=thresholds.__getitem__)
+    return {
+        "version": BUNDLE_VERSION,
+        "schools": schools,
+        "profiles": profiles,
+        "rows": columns,
+        "byThreshold": by_threshold,
+        "thresholds": [thresholds[i] for i in by_threshold],
+        "profileIndex": {
+            name: sorted(indices, key=thresholds.__getitem__) for name, indices in sorted(members.items())
+        },
+    }
+
+
+def classes_within_reach(bundle, points, profile=None):
+    """Indeksy wierszy klas z progiem <= ``points`` (opcjonalnie tylko danego profilu), od najniższego progu."""
+    if profile is None:
+        return bundle["byThreshold"][:bisect_right(bundle["thresholds"], points)]
+    indices = bundle["profileIndex"].get(normalize_profile(profile), [])
+    thresholds = bundle["rows"]["threshold"]
+    # Lista profilu jest posortowana po progu - wystarczy znaleźć pierwszy za wysoki
+    low, high = 0, len(indices)
+    while low < high:
+        middle = (low + high) // 2
+        if thresholds[indices[middle]] <= points:
+            low = middle + 1
+        else:
+            high = middle
+    return indices[:low]
+
+
+def _write_if_changed(path, data):
+    """Zapisuje bajty atomowo (plik tymczasowy + replace_file), tylko gdy zawartość się zmieniła."""
+    path = Path(path)
+    if path.exists() and path.read_bytes() == data:
+        return False
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        replace_file(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def _gzip(data):
+    """Kompresja gzip z zerowym znacznikiem czasu (te same dane -> te same bajty)."""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def write_bundle(rows, path):
+    """
+    Zapisuje paczkę do ``path`` (.json) oraz jej wersje .gz i .br; zwraca True, jeśli coś się zmieniło.
+
+    Kompresja jest deterministyczna (gzip bez znacznika czasu), więc niezmienione
+    dane nie powodują ponownego zapisu plików.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(build_bundle(rows), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    changed = _write_if_changed(path, data)
+    changed |= _write_if_changed(path.with_name(path.name + ".gz"), _gzip(data))
+    if brotli is not None:
+        changed |= _write_if_changed(path.with_name(path.name + ".br"), brotli.compress(data))
+    return changed
@@ -0,0 +1,135 @@
+"""
+Podręczna pamięć (cache) pobranych stron na dysku, do pobierania przyrostowego.
+
+Dla każdego adresu zapisywane są nagłówki ETag/Last-Modified (do zapytań
+warunkowych), skrót pobranego HTML oraz wyciągnięte wiersze. Gdy serwer odpowie 304 albo HTML się nie zmienił (a fragmenty z
+klasami ładowane przyciskiem "rozwiń" mają te same skróty), dane są brane z
+cache bez ponownego parsowania.
+"""
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def content_hash(content):
+    """Skrót SHA-256 tekstu lub bajtów."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: str = None
+    last_modified: str = None
+    body_hash: str = None
+    rows: list = field(default_factory=list)
+    # Fragmenty "rozwiń" pobrane osobno (adres -> skrót HTML); wiersze są aktualne tylko razem z nimi
+    fragments: dict = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+
+    def conditional_headers(self):
+        """Nagłówki zapytania warunkowego (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """
+    Cache wpisów CacheEntry w katalogu na dysku (jeden plik JSON na adres).
+
+    max_age     - wpisy niepotwierdzone (ani pobrane, ani potwierdzone odpowiedzią 304)
+                  od tylu sekund są ignorowane i usuwane
+    max_entries - maksymalna liczba wpisów
+    max_bytes   - maksymalny łączny rozmiar plików
+    Przy przekroczeniu limitów usuwane są najdawniej używane wpisy.
+    """
+
+    def __init__(self, directory=".scraper-cache", max_age=7 * 24 * 3600, max_entries=500,
+                 max_bytes=50 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, url):
+        return self.directory / f"{content_hash(url)[:32]}.json"
+
+    def get(self, url):
+        """Zwraca wpis dla adresu albo None (brak, uszkodzony lub przeterminowany)."""
+        path = self._path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                _unlink(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        entry.rows = [tuple(row) for row in entry.rows]
+        return entry
+
+    def touch(self, url):
+        """Oznacza wpis jako użyty (chroni przed usunięciem jako najdawniej używany)."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def put(self, entry):
+        """Zapisuje wpis atomowo (plik tymczasowy + rename) i przycina cache do limitów."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(entry.url))
+        except BaseException:
+            _unlink(tmp_path)
+            raise
+        self.prune()
+
+    def prune(self):
+        """Usuwa przeterminowane wpisy, a potem najdawniej używane ponad limit liczby/rozmiaru."""
+        with self._lock:
+            now = time.time()
+            files = []
+            for path in self.directory.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age:
+                    _unlink(path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+            files.sort()
+            total = sum(size for _, size, _ in files)
+            while files and (len(files) > self.max_entries or total > self.max_bytes):
+                _, size, path = files.pop(0)
+                _unlink(path)
+                total -= size
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            _unlink(path)
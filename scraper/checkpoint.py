@@ -0,0 +1,159 @@
+"""
+Punkty kontrolne przebiegu (SQLite), pozwalające wznowić przerwane pobieranie.
+
+Po przetworzeniu każdej szkoły jej klasy są zapisywane w lokalnej bazie. Przy
+ponownym uruchomieniu w tej samej epoce (domyślnie: ten sam dzień) szkoły już
+ukończone nie są rozwijane ponownie, a ich wiersze są brane z bazy. Cele
+ukończone w całości nie są w ogóle pobierane.
+"""
+
+from datetime import date
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schools (
+    epoch TEXT NOT NULL,
+    target TEXT NOT NULL,
+    school TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (epoch, target, school)
+);
+CREATE TABLE IF NOT EXISTS rows (
+    epoch TEXT NOT NULL,
+    target TEXT NOT NULL,
+    school TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    threshold TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_by_school ON rows (epoch, target, school, position);
+CREATE TABLE IF NOT EXISTS targets (
+    epoch TEXT NOT NULL,
+    target TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (epoch, target)
+);
+"""
+
+
+def default_epoch():
+    """Domyślna epoka przebiegu: dzisiejsza data (wznowienie działa w obrębie jednego dnia)."""
+    return date.today().isoformat()
+
+
+class Checkpoint:
+    """Magazyn ukończonych szkół i celów w SQLite; bezpieczny dla wielu wątków."""
+
+    def __init__(self, path=".scraper-checkpoint.sqlite", epoch=None):
+        self.path = path
+        self.epoch = epoch or default_epoch()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(SCHEMA)
+            # Starsze epoki nie będą już wznawiane
+            for table in ("schools", "rows", "targets"):
+                self._db.execute(f"DELETE FROM {table} WHERE epoch != ?", (self.epoch,))
+
+    def completed_schools(self, target):
+        """Zbiór szkół celu ukończonych w bieżącej epoce."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT school FROM schools WHERE epoch = ? AND target = ?", (self.epoch, target)
+            )
+            return {school for (school,) in cursor}
+
+    def is_target_complete(self, target):
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT 1 FROM targets WHERE epoch = ? AND target = ?", (self.epoch, target)
+            )
+            return cursor.fetchone() is not None
+
+    def record_school(self, target, school, rows):
+        """Zapisuje (w jednej transakcji) ukończoną szkołę i jej wiersze (klasa, próg)."""
+        with self._lock, self._db:
+            position = self._db.execute(
+                "SELECT COUNT(*) FROM schools WHERE epoch = ? AND target = ?", (self.epoch, target)
+            ).fetchone()[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO schools VALUES (?, ?, ?, ?, ?)",
+                (self.epoch, target, school, position, time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM rows WHERE epoch = ? AND target = ? AND school = ?", (self.epoch, target, school)
+            )
+            self._db.executemany(
+                "INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.epoch, target, school, i, class_name, threshold)
+                 for i, (class_name, threshold) in enumerate(rows)],
+            )
+
+    def record_target(self, target):
+        """Oznacza cel jako ukończony w całości."""
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO targets VALUES (?, ?, ?)", (self.epoch, target, time.time()))
+
+    def reopen_target(self, target):
+        """Cofa oznaczenie celu jako ukończonego (np. gdy brakuje szkół); ukończone szkoły zostają."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM targets WHERE epoch = ? AND target = ?", (self.epoch, target))
+
+    def stored_rows(self, target):
+        """Zapisane krotki (szkoła, klasa, próg) celu, w kolejności ukończenia szkół."""
+        with self._lock:
+            return [
+                (school, class_name, threshold)
+                for school, class_name, threshold in self._db.execute(
+                    "SELECT r.school, r.class_name, r.threshold FROM rows r "
+                    "JOIN schools s ON s.epoch = r.epoch AND s.target = r.target AND s.school = r.school "
+                    "WHERE r.epoch = ? AND r.target = ? ORDER BY s.position, r.position",
+                    (self.epoch, target),
+                )
+            ]
+
+    def wrap(self, target, iter_rows):
+        """
+        Przepuszcza krotki przez punkt kontrolny.
+
+        ``iter_rows(skip_schools)`` to funkcja zwracająca generator krotek celu;
+        dostaje zbiór szkół już ukończonych, których nie trzeba pobierać. Najpierw
+        zwracane są wiersze zapisane wcześniej, potem nowe - każda szkoła jest
+        zapisywana, gdy strumień przejdzie do następnej. Cel ukończony w całości
+        jest zwracany tylko z bazy, bez wywoływania iter_rows.
+        """
+        if self.is_target_complete(target):
+            print(f"[{target}] cel ukończony w epoce {self.epoch} - wiersze z punktu kontrolnego")
+            yield from self.stored_rows(target)
+            return
+
+        done = self.completed_schools(target)
+        if done:
+            print(f"[{target}] wznowienie: {len(done)} szkół z punktu kontrolnego")
+            yield from self.stored_rows(target)
+
+        current, buffer = None, []
+        for school, class_name, threshold in iter_rows(frozenset(done)):
+            if school in done:
+                continue
+            if school != current:
+                if current is not None:
+                    self.record_school(target, current, buffer)
+                current, buffer = school, []
+            buffer.append((class_name, threshold))
+            yield (school, class_name, threshold)
+        if current is not None:
+            self.record_school(target, current, buffer)
+        self.record_target(target)
+
+    def clear(self):
+        """Usuwa wszystkie punkty kontrolne bieżącej epoki (np. po udanym przebiegu)."""
+        with self._lock, self._db:
+            for table in ("schools", "rows", "targets"):
+                self._db.execute(f"DELETE FROM {table} WHERE epoch = ?", (self.epoch,))
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,129 @@
+"""
+Klasyfikacja wierszy tabeli progów: szkoła, klasa z progiem albo wiersz pomijany.
+
+Reguły są skompilowane raz przy imporcie: znaczniki nazwy szkoły to jedno
+wyrażenie regularne (zamiast skanowania listy słów przez any()), przyciski to
+zbiór, a tekst komórki jest zamieniany na małe litery tylko raz. Próg jest
+parsowany od razu do Decimal. ``classify_row`` zwraca powód odrzucenia, dzięki
+czemu wiersze odrzucone przez reguły można policzyć zamiast gubić je po cichu.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+import re
+
+# Znaczniki nazwy szkoły w pierwszej komórce (tekst już małymi literami)
+SCHOOL_MARKERS = re.compile(r"lo | liceum| licea|sportowe|im\.|im ")
+# Przyciski rozwiń/zwiń/więcej i reklamy w drugiej komórce
+BUTTON_TEXTS = frozenset(["rozwiń", "zwiń", "więcej", "advertisement"])
+# Zakres progów ("od ... do ...") w wierszu szkoły (tekst już małymi literami)
+RANGE_MARKERS = re.compile(r"od|do")
+DIGIT = re.compile(r"\d")
+# "Klasa 1F grupa 1 (geo-ang-niem)" -> kod "1F grupa 1"
+CLASS_CODE = re.compile(r"^\S+\s+([^(]*?)\s*(?:\(|$)")
+# Profil to tekst w pierwszych nawiasach (jak extractProfile w utils/csvParser.ts)
+PROFILE = re.compile(r"\(([^)]+)\)")
+WHITESPACE = re.compile(r"\s+")
+
+# Powody odrzucenia wiersza bez linku do szkoły
+EMPTY_THRESHOLD = "pusty próg"
+BUTTON = "przycisk"
+RANGE = "zakres"
+NOT_A_NUMBER = "brak liczby"
+EMPTY_NAME = "pusta nazwa"
+SCHOOL_NAME = "nazwa szkoły"
+
+
+@dataclass(frozen=True)
+class ClassRecord:
+    """Klasa z progiem punktowym; ``threshold_text`` to próg w postaci ze strony (trafia do CSV)."""
+
+    __slots__ = ("school", "class_name", "class_code", "profile", "threshold", "threshold_text")
+
+    school: str
+    class_name: str
+    class_code: str
+    profile: Optional[str]
+    threshold: Decimal
+    threshold_text: str
+
+    def as_row(self):
+        """Krotka (szkoła, klasa, próg) w postaci zapisywanej do CSV."""
+        return (self.school, self.class_name, self.threshold_text)
+
+
+def classify_row(first_cell_text, second_cell_text):
+    """
+    Sprawdza wiersz bez linku do szkoły; zwraca None dla wiersza klasy z progiem
+    albo powód odrzucenia (stałe EMPTY_THRESHOLD, BUTTON, RANGE, ...).
+    """
+    if not second_cell_text:
+        return EMPTY_THRESHOLD
+    second = second_cell_text.lower()
+    if second in BUTTON_TEXTS:
+        return BUTTON
+    if RANGE_MARKERS.search(second):
+        return RANGE
+    if DIGIT.search(second) is None:
+        return NOT_A_NUMBER
+    if not first_cell_text:
+        return EMPTY_NAME
+    if SCHOOL_MARKERS.search(first_cell_text.lower()):
+        return SCHOOL_NAME
+    return None
+
+
+def is_class_row(first_cell_text, second_cell_text):
+    """Sprawdza, czy wiersz bez linku do szkoły jest wierszem klasy z progiem."""
+    return classify_row(first_cell_text, second_cell_text) is None
+
+
+def parse_threshold(text):
+    """Próg jako Decimal (separator dziesiętny: kropka lub przecinek) albo None, jeśli to nie liczba."""
+    try:
+        value = Decimal(text.replace(",", "."))
+    except InvalidOperation:
+        return None
+    return value if value.is_finite() else None
+
+
+def extract_profile(class_name):
+    """Profil klasy z nawiasów: "Klasa 1A (mat-fiz-inf)" -> "mat-fiz-inf" (None bez nawiasów)."""
+    match = PROFILE.search(class_name)
+    return match.group(1).strip() if match else None
+
+
+def normalize_profile(profile):
+    """Znormalizowany profil jak normalizeProfile w utils/csvParser.ts: małe litery, posortowane części."""
+    return "-".join(sorted(WHITESPACE.sub("-", profile.lower()).split("-")))
+
+
+def class_code(class_name):
+    """Kod oddziału: "Klasa 1F grupa 1 (geo-ang-niem)" -> "1F grupa 1"."""
+    match = CLASS_CODE.match(class_name)
+    code = match.group(1) if match else ""
+    return code or class_name.split("(", 1)[0].strip()
+
+
+def make_record(school, class_name, threshold_text):
+    """Buduje ClassRecord z krotki (szkoła, klasa, próg); None, jeśli próg nie jest liczbą."""
+    threshold = parse_threshold(threshold_text)
+    if threshold is None:
+        return None
+    return ClassRecord(
+        school=school,
+        class_name=class_name,
+        class_code=class_code(class_name),
+        profile=extract_profile(class_name),
+        threshold=threshold,
+        threshold_text=threshold_text,
+    )
+
+
+def iter_records(rows):
+    """Zamienia krotki (szkoła, klasa, próg) na ClassRecord, pomijając wiersze bez liczbowego progu."""
+    for row in rows:
+        record = make_record(*row)
+        if record is not None:
+            yield record
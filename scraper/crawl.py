@@ -0,0 +1,418 @@
+"""
+Równoległe pobieranie progów dla wielu miast i lat.
+
+Cele (miasto, rok) są przetwarzane przez pulę wątków. Każdy wątek ma własny
+backend (sesję HTTP / przeglądarkę), używany ponownie dla kolejnych celów, a
+zapytania do jednego hosta są ograniczone limitem równoległości i tempem
+(kubełek żetonów). Przejściowe błędy są ponawiane z rosnącym odstępem, a po
+serii błędów bezpiecznik wstrzymuje zapytania do hosta (zob. scraper.scheduler).
+Cel, w którym brakuje szkół, jest traktowany jak błąd - poprzedni plik zostaje.
+
+Wiersze płyną strumieniowo: backend -> walidacja -> zapis (CSV przez plik
+tymczasowy, JSON Lines na bieżąco). W pamięci nie są trzymane wiersze celów,
+tylko ich liczba i kilka przykładów.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from urllib.parse import urlsplit
+import tempfile
+import threading
+import time
+
+from scraper.backends import IncompleteDataError, create_backend
+from scraper.bundle import write_bundle
+from scraper.diff import ScrapeDiff, diff_rows, index_rows, write_diff_report
+from scraper.extract import validate_rows
+from scraper.metrics import registry
+from scraper.output import MERGED_CSV_HEADER, CsvSink, JsonLinesSink, read_csv_rows
+from scraper.scheduler import CircuitBreaker, CircuitOpenError, RetryPolicy, TokenBucket, is_retryable, is_throttled
+
+URL_TEMPLATE = "https://www.otouczelnie.pl/progi-punktowe/licea/miasto/{city_id}/{slug}/{year}"
+
+
+@dataclass(frozen=True)
+class Target:
+    """
+    Jedna strona z progami: miasto (id i nazwa z adresu) oraz rok szkolny, np. 298/Krakow/2025-2026.
+
+    url_template pozwala wskazać inny serwer (np. lokalny serwer z zapisanymi stronami).
+    """
+
+    city_id: int
+    slug: str
+    year: str
+    url_template: str = field(default=URL_TEMPLATE, compare=False, repr=False)
+    # Oczekiwana liczba szkół na stronie (kontrola kompletności); None - liczba z poprzedniego
+    # pliku celu albo, przy pierwszym przebiegu, liczba wierszy szkół na pobranej stronie
+    expected_schools: int = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def parse(cls, text):
+        """Tworzy cel z zapisu "id/Miasto/rok" (np. "298/Krakow/2025-2026")."""
+        city_id, slug, year = text.strip().strip("/").split("/")
+        return cls(int(city_id), slug, year)
+
+    @classmethod
+    def from_url(cls, url):
+        """Tworzy cel z adresu strony z progami (.../miasto/<id>/<Miasto>/<rok>); serwer z adresu jest zachowany."""
+        parts = urlsplit(url)
+        prefix, path = parts.path.split("/miasto/", 1)
+        target = cls.parse(path)
+        return replace(target, url_template=f"{parts.scheme}://{parts.netloc}{prefix}/miasto/{{city_id}}/{{slug}}/{{year}}")
+
+    @property
+    def url(self):
+        return self.url_template.format(city_id=self.city_id, slug=self.slug, year=self.year)
+
+    @property
+    def output_name(self):
+        """Nazwa pliku CSV, np. progi_licea_krakow_2025_2026.csv."""
+        return f"progi_licea_{self.slug.lower()}_{self.year.replace('-', '_')}.csv"
+
+    def __str__(self):
+        return f"{self.city_id}/{self.slug}/{self.year}"
+
+
+class HostLimiter:
+    """
+    Ogranicza liczbę równoczesnych zapytań do jednego hosta i ich tempo.
+
+    Tempo to średnio jedno zapytanie na ``min_interval`` sekund, z serią do
+    ``burst`` zapytań od razu (kubełek żetonów, zob. scraper.scheduler.TokenBucket).
+    Gdy host odpowiada 429/503, tempo jest zmniejszane i stopniowo przywracane.
+    """
+
+    def __init__(self, max_concurrent=2, min_interval=1.0, burst=1):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._buckets = {}
+
+    def _bucket(self, host):
+        if not self.min_interval:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(1.0 / self.min_interval, self.burst)
+            return self._buckets[host]
+
+    @contextmanager
+    def slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_concurrent))
+        with semaphore:
+            bucket = self._bucket(host)
+            if bucket is not None:
+                bucket.acquire()
+            yield
+
+    def throttle(self, url):
+        """
+        Czeka na żeton hosta przed dodatkowym zapytaniem w ramach już zajętego miejsca (slot).
+
+        Bez semafora - zapytanie należy do celu, który już je trzyma.
+        """
+        bucket = self._bucket(urlsplit(url).netloc)
+        if bucket is not None:
+            bucket.acquire()
+
+    def feedback(self, url, throttled):
+        """Informacja zwrotna po zapytaniu: ``throttled`` = serwer odpowiedział 429/503."""
+        bucket = self._bucket(urlsplit(url).netloc)
+        if bucket is None:
+            return
+        if throttled:
+            bucket.slow_down()
+            print(f"{urlsplit(url).netloc}: serwer prosi o wolniejsze tempo - "
+                  f"{bucket.rate * 60:.1f} zapytań/min")
+        else:
+            bucket.recover()
+
+
+SAMPLE_SIZE = 5
+
+
+@dataclass
+class TargetResult:
+    target: Target
+    row_count: int = 0
+    rejected: int = 0
+    sample: list = field(default_factory=list)
+    elapsed: float = 0.0
+    error: str = None
+    attempts: int = 0
+    schools: int = 0
+    output_path: Path = None
+    changed: bool = False
+    diff: ScrapeDiff = None
+
+
+@dataclass
+class CrawlReport:
+    results: list
+    elapsed: float
+    merged_changed: bool = False
+    circuit_open: bool = False
+
+    @property
+    def changed(self):
+        """Czy którykolwiek plik wynikowy został zapisany (dane się zmieniły)."""
+        return self.merged_changed or any(r.changed for r in self.results)
+
+    @property
+    def has_changes(self):
+        """Czy dane się zmieniły: niepusty diff celu (jeśli był liczony) albo zmieniony plik celu."""
+        return any(r.diff if r.diff is not None else r.changed for r in self.succeeded)
+
+    @property
+    def succeeded(self):
+        return [r for r in self.results if r.error is None]
+
+    @property
+    def failed(self):
+        return [r for r in self.results if r.error is not None]
+
+    @property
+    def targets_per_minute(self):
+        return len(self.succeeded) / self.elapsed * 60 if self.elapsed else 0.0
+
+    def summary(self):
+        text = (
+            f"Cele: {len(self.succeeded)}/{len(self.results)} pobrane, "
+            f"{sum(r.row_count for r in self.succeeded)} klas w {self.elapsed:.1f} s "
+            f"({self.targets_per_minute:.1f} celów/min)"
+        )
+        retries = sum(max(0, r.attempts - 1) for r in self.results)
+        if retries:
+            text += f", ponowień: {retries}"
+        if self.circuit_open:
+            text += " - przerwano po otwarciu bezpiecznika"
+        return text
+
+
+def count_schools(path):
+    """Liczba różnych szkół w pliku CSV celu (0, gdy pliku nie ma)."""
+    path = Path(path)
+    return len({school for school, _, _ in read_csv_rows(path)}) if path.exists() else 0
+
+
+def crawl(targets, backend_factory=create_backend, workers=4, per_host=2, min_interval=1.0,
+          output_dir=None, merged_path=None, jsonl_path=None, checkpoint=None, history=None, bundle_dir=None,
+          diff_path=None, retry=None, burst=1, breaker_threshold=5, min_schools_ratio=0.9):
+    """
+    Pobiera wszystkie cele w puli ``workers`` wątków i zwraca CrawlReport.
+
+    backend_factory - funkcja bez argumentów tworząca backend; każdy wątek tworzy
+                      jeden backend i używa go dla wszystkich swoich celów
+    output_dir      - jeśli podany, każdy cel jest zapisywany do osobnego CSV
+                      (atomowo, po pobraniu całego celu)
+    merged_path     - jeśli podany, wszystkie wiersze trafiają do jednego CSV
+                      z dodatkowymi kolumnami Miasto i Rok
+    jsonl_path      - jeśli podany, każdy wiersz jest od razu dopisywany do pliku
+                      JSON Lines (przetrwa awarię w połowie przebiegu); przy
+                      ponowieniach celu wiersze nie są powtarzane
+    checkpoint      - opcjonalny scraper.checkpoint.Checkpoint; ukończone szkoły i
+                      cele są pomijane przy wznowieniu, a po przebiegu bez błędów
+                      punkty kontrolne są czyszczone
+    history         - opcjonalny scraper.history.HistoryStore; wiersze każdego
+                      pobranego celu są do niego dopisywane
+    bundle_dir      - jeśli podany, dla każdego celu zapisywana jest tam paczka
+                      JSON dla front-endu (zob. scraper.bundle)
+    diff_path       - jeśli podany (razem z output_dir), każdy cel jest porównywany
+                      z poprzednią wersją swojego CSV, a raport zmian trafia do
+                      tego pliku JSON (zob. scraper.diff)
+    retry           - scraper.scheduler.RetryPolicy dla przejściowych błędów
+                      (domyślnie 3 ponowienia z rosnącym, losowym odstępem)
+    burst           - ile zapytań do hosta może pójść od razu, zanim zacznie
+                      obowiązywać odstęp min_interval
+    breaker_threshold - po tylu kolejnych błędach dla hosta bezpiecznik przerywa
+                      zapytania do niego; plik zbiorczy nie jest wtedy zapisywany
+    min_schools_ratio - cel z mniejszą częścią oczekiwanych szkół (Target.expected_schools,
+                      liczba szkół w poprzednim pliku celu, a bez niego liczba
+                      wierszy szkół na pobranej stronie) jest traktowany jak błąd
+                      i pobierany ponownie, a poprzedni plik zostaje
+    """
+    limiter = HostLimiter(per_host, min_interval, burst)
+    retry = retry if retry is not None else RetryPolicy()
+    breaker = CircuitBreaker(breaker_threshold)
+    local = threading.local()
+    backends = []
+    backends_lock = threading.Lock()
+    # Bez output_dir pliki celów są potrzebne tylko do złożenia pliku zbiorczego i historii
+    needs_files = merged_path is not None or history is not None or bundle_dir is not None
+    scratch_dir = tempfile.TemporaryDirectory() if output_dir is None and needs_files else None
+    target_dir = Path(scratch_dir.name) if scratch_dir else (Path(output_dir) if output_dir is not None else None)
+    jsonl = JsonLinesSink(jsonl_path) if jsonl_path is not None else None
+
+    def get_backend():
+        backend = getattr(local, "backend", None)
+        if backend is None:
+            backend = local.backend = backend_factory()
+            # Fragmenty "rozwiń" to osobne zapytania do hosta - też podlegają limitowi tempa
+            backend.set_throttle(limiter.throttle)
+            with backends_lock:
+                backends.append(backend)
+        return backend
+
+    def fetch_target(target, result, written):
+        """
+        Jedna próba pobrania celu; przy błędzie plik celu nie jest podmieniany.
+
+        ``written`` to zbiór (szkoła, klasa) zapisanych już do JSON Lines we
+        wcześniejszych próbach celu - ponowienie nie dopisuje ich drugi raz.
+        """
+        result.row_count = 0
+        result.sample = []
+        sink = None
+        try:
+            if target_dir is not None:
+                result.output_path = target_dir / target.output_name
+                sink = CsvSink(result.output_path)
+            expected = target.expected_schools
+            if expected is None and output_dir is not None:
+                expected = count_schools(result.output_path)
+            stats = {}
+            schools = set()
+            key = str(target)
+            backend = get_backend()
+            from_checkpoint = checkpoint is not None and checkpoint.is_target_complete(key)
+            if checkpoint is not None:
+                rows = checkpoint.wrap(key, lambda skip: backend.iter_rows(target.url, skip))
+                slot = nullcontext() if from_checkpoint else limiter.slot(target.url)
+            else:
+                rows = backend.iter_rows(target.url)
+                slot = limiter.slot(target.url)
+            with slot:
+                for row in validate_rows(rows, stats):
+                    if sink is not None:
+                        sink.write(row)
+                    if jsonl is not None and row[:2] not in written:
+                        written.add(row[:2])
+                        jsonl.write({"miasto": target.slug, "rok": target.year, "szkola": row[0],
+                                     "klasa": row[1], "prog": row[2]})
+                    if len(result.sample) < SAMPLE_SIZE:
+                        result.sample.append(row)
+                    schools.add(row[0])
+                    result.row_count += 1
+            result.rejected = stats.get("rejected", 0)
+            result.schools = len(schools)
+            if not expected and not from_checkpoint:
+                # Pierwszy przebieg (bez poprzedniego pliku): liczba wierszy szkół na pobranej stronie
+                expected = backend.last_school_count
+            if expected and len(schools) < expected * min_schools_ratio:
+                if checkpoint is not None:
+                    # Ponowienie ma pobrać brakujące szkoły, a nie odtworzyć niepełny cel z bazy
+                    checkpoint.reopen_target(key)
+                raise IncompleteDataError(
+                    f"pobrano {len(schools)} z oczekiwanych {expected} szkół - poprzedni plik nie jest nadpisywany"
+                )
+            if sink is not None:
+                # Poprzednia wersja pliku jest potrzebna do porównania, zanim commit() ją podmieni
+                previous = None
+                if diff_path is not None and output_dir is not None:
+                    path = result.output_path
+                    previous = index_rows(read_csv_rows(path)) if path.exists() else {}
+                result.changed = sink.commit()
+                if previous is not None:
+                    if result.changed:
+                        result.diff = diff_rows(previous, read_csv_rows(result.output_path))
+                    else:
+                        result.diff = ScrapeDiff(unchanged=result.row_count)
+        except BaseException:
+            if sink is not None:
+                sink.abort()
+            raise
+
+    def run_target(target):
+        result = TargetResult(target)
+        written = set()
+        start = time.perf_counter()
+        for attempt in range(retry.attempts + 1):
+            result.attempts = attempt + 1
+            try:
+                breaker.check(target.url)
+                fetch_target(target, result, written)
+            except CircuitOpenError as e:
+                result.error = str(e)
+                print(f"Pominięto {target}: {result.error}")
+                break
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+                breaker.failure(target.url)
+                limiter.feedback(target.url, is_throttled(e))
+                if not is_retryable(e) or attempt == retry.attempts or breaker.is_open(target.url):
+                    print(f"Błąd dla {target}: {result.error}")
+                    break
+                delay = retry.delay(attempt, e)
+                print(f"Błąd dla {target} (próba {attempt + 1}/{retry.attempts + 1}): {result.error} - "
+                      f"ponowienie za {delay:.1f} s")
+                time.sleep(delay)
+            else:
+                result.error = None
+                breaker.success(target.url)
+                limiter.feedback(target.url, False)
+                break
+        if history is not None and result.error is None:
+            try:
+                # Historia jest dopisywana strumieniowo z zapisanego pliku celu
+                history.append_run(target.slug, target.year, read_csv_rows(result.output_path))
+            except Exception as e:
+                print(f"[{target}] nie udało się zapisać historii: {e}")
+        if bundle_dir is not None and result.error is None:
+            try:
+                bundle_path = Path(bundle_dir) / Path(target.output_name).with_suffix(".json").name
+                if write_bundle(read_csv_rows(result.output_path), bundle_path):
+                    print(f"[{target}] zapisano paczkę dla front-endu: {bundle_path}")
+            except Exception as e:
+                print(f"[{target}] nie udało się zapisać paczki dla front-endu: {e}")
+        result.elapsed = time.perf_counter() - start
+        registry.add_rows(result.row_count)
+        print(f"[{target}] {result.row_count} klas w {result.elapsed:.1f} s")
+        if result.rejected:
+            print(f"[{target}] odrzucono {result.rejected} niepoprawnych wierszy")
+        if result.diff is not None:
+            print(f"[{target}] {result.diff.summary()}")
+        return result
+
+    if target_dir is not None:
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_target, targets))
+    finally:
+        for backend in backends:
+            backend.close()
+        if jsonl is not None:
+            jsonl.close()
+    report = CrawlReport(results, time.perf_counter() - start, circuit_open=breaker.tripped)
+    if checkpoint is not None and not report.failed:
+        checkpoint.clear()
+    if diff_path is not None and output_dir is not None:
+        write_diff_report(diff_path, {r.target: r.diff for r in report.succeeded})
+
+    try:
+        if merged_path is not None and report.failed:
+            # Plik zbiorczy bez części celów wyglądałby na kompletny - zostaje poprzednia wersja
+            print(f"Nie zapisano pliku zbiorczego {merged_path}: "
+                  f"{len(report.failed)} z {len(report.results)} celów nie zostało pobranych")
+        elif merged_path is not None:
+            # Plik zbiorczy jest składany strumieniowo z plików celów, w kolejności celów
+            with CsvSink(merged_path, header=MERGED_CSV_HEADER) as merged:
+                for result in report.succeeded:
+                    prefix = (result.target.slug, result.target.year)
+                    for row in read_csv_rows(result.output_path):
+                        merged.write(prefix + row)
+            report.merged_changed = merged.changed
+    finally:
+        if scratch_dir is not None:
+            scratch_dir.cleanup()
+
+    return report
@@ -0,0 +1,154 @@
+"""
+Porównanie dwóch kolejnych pobrań: nowe, usunięte i zmienione klasy.
+
+Wiersze są indeksowane słownikiem po kluczu (szkoła, klasa), więc porównanie
+jest liniowe względem liczby wierszy. W raporcie JSON każda klasa ma stały
+identyfikator - skrót klucza - po którym można łączyć raporty z różnych dni.
+Próg jest porównywany jako liczba ("53.0" i "53.00" to ten sam próg).
+
+Użycie z wiersza poleceń (kod wyjścia 1, gdy są zmiany - jak diff):
+    python -m scraper.diff stary.csv nowy.csv [--json zmiany.json]
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import sys
+
+from scraper.classify import parse_threshold
+
+
+def row_key(school, class_name):
+    """Stały identyfikator klasy: skrót pary (szkoła, klasa)."""
+    return hashlib.sha1(f"{school}\x1f{class_name}".encode("utf-8")).hexdigest()[:16]
+
+
+def index_rows(rows):
+    """Słownik (szkoła, klasa) -> próg (tekst); powtórzona para dostaje kolejny numer w nazwie klasy."""
+    index = {}
+    for school, class_name, threshold in rows:
+        key = (school, class_name)
+        copy = 1
+        while key in index:
+            copy += 1
+            key = (school, f"{class_name} #{copy}")
+        index[key] = threshold
+    return index
+
+
+def _compare(old, new):
+    """(czy próg ten sam, różnica nowy - stary albo None, gdy któryś próg nie jest liczbą)."""
+    old_value, new_value = parse_threshold(old), parse_threshold(new)
+    if old_value is None or new_value is None:
+        return old == new, None
+    return old_value == new_value, float(new_value - old_value)
+
+
+@dataclass
+class ScrapeDiff:
+    """Różnice między poprzednim a nowym pobraniem jednego celu."""
+
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        if not self:
+            return f"Bez zmian ({self.unchanged} klas)"
+        text = (f"Zmiany: {len(self.added)} nowych, {len(self.removed)} usuniętych, "
+                f"{len(self.changed)} zmienionych progów, {self.unchanged} bez zmian")
+        deltas = [c["delta"] for c in self.changed if c["delta"] is not None]
+        if deltas:
+            text += f" (średnia zmiana progu {sum(deltas) / len(deltas):+.2f})"
+        return text
+
+    def to_dict(self):
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "summary": self.summary(),
+        }
+
+
+def diff_rows(previous, current):
+    """
+    Porównuje pobrania; ``previous`` i ``current`` to krotki (szkoła, klasa, próg)
+    albo słowniki z index_rows. Zwraca ScrapeDiff (listy w kolejności nowego pobrania).
+    """
+    old = previous if isinstance(previous, dict) else index_rows(previous)
+    new = current if isinstance(current, dict) else index_rows(current)
+    diff = ScrapeDiff()
+
+    for (school, class_name), threshold in new.items():
+        old_threshold = old.get((school, class_name))
+        if old_threshold is None:
+            diff.added.append({"key": row_key(school, class_name), "school": school, "class": class_name,
+                               "threshold": threshold})
+            continue
+        if old_threshold == threshold:
+            diff.unchanged += 1
+            continue
+        same, delta = _compare(old_threshold, threshold)
+        if same:
+            diff.unchanged += 1
+        else:
+            diff.changed.append({"key": row_key(school, class_name), "school": school, "class": class_name,
+                                 "old": old_threshold, "new": threshold, "delta": delta})
+
+    for (school, class_name), threshold in old.items():
+        if (school, class_name) not in new:
+            diff.removed.append({"key": row_key(school, class_name), "school": school, "class": class_name,
+                                 "threshold": threshold})
+    return diff
+
+
+def write_diff_report(path, diffs):
+    """Zapisuje raport JSON (atomowo) dla słownika cel -> ScrapeDiff; zwraca True, jeśli są jakieś zmiany."""
+    changed = any(diffs.values())
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "changed": changed,
+        "targets": {str(target): diff.to_dict() for target, diff in diffs.items()},
+    }
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+    return changed
+
+
+def report_diff(previous_path, current_path, json_path=None):
+    """Porównuje dwa pliki CSV, wypisuje podsumowanie i zmienione progi; zwraca ScrapeDiff."""
+    from scraper.output import read_csv_rows
+
+    diff = diff_rows(read_csv_rows(previous_path), read_csv_rows(current_path))
+    print(diff.summary())
+    for c in diff.changed:
+        print(f"  {c['school']} - {c['class']}: {c['old']} -> {c['new']}")
+    if json_path:
+        write_diff_report(json_path, {current_path: diff})
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Porównanie dwóch plików CSV scrapera")
+    parser.add_argument("previous", help="poprzedni plik CSV")
+    parser.add_argument("current", help="nowy plik CSV")
+    parser.add_argument("--json", help="zapisz raport JSON do pliku")
+    args = parser.parse_args()
+
+    diff = report_diff(args.previous, args.current, args.json)
+    sys.exit(1 if diff else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Wyciąganie krotek (szkoła, klasa, próg) z rozwiniętej tabeli progów.
+
+Selenium i BeautifulSoup są importowane dopiero w funkcjach, które ich używają,
+więc sam import modułu (np. dla validate_rows) nie ładuje żadnego z nich.
+"""
+
+import importlib.util
+
+from scraper.classify import RANGE_MARKERS, classify_row, is_class_row, parse_threshold
+
+# lxml jest szybszy, ale opcjonalny - wbudowany html.parser wystarczy
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+def _soup(html):
+    """Drzewo BeautifulSoup dokumentu (bs4 jest importowany przy pierwszym parsowaniu)."""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, HTML_PARSER)
+
+def is_school_href(href):
+    """Sprawdza, czy link prowadzi do strony szkoły (a nie jest przyciskiem 'rozwiń')."""
+    return bool(href) and href != "#" and "/progi-punktowe" in href
+
+def scrape_data(driver):
+    """Pobiera dane o szkołach i klasach z rozwiniętej strony."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
+    data = []
+    
+    try:
+        # Znajdź wszystkie wiersze w tabeli
+        rows = driver.find_elements(By.XPATH, "//table//tr")
+        
+        current_school = None
+        
+        for row in rows:
+            try:
+                cells = row.find_elements(By.TAG_NAME, "td")
+                
+                if len(cells) >= 2:
+                    # Sprawdź, czy to wiersz ze szkołą czy z klasą
+                    school_cell = cells[0]
+                    threshold_cell = cells[1]
+                    
+                    school_text = school_cell.text.strip()
+                    threshold_text = threshold_cell.text.strip()
+                    
+                    # Jeśli w komórce szkoły jest link, to jest to wiersz ze szkołą
+                    try:
+                        school_link = school_cell.find_element(By.TAG_NAME, "a")
+                        # To jest wiersz ze szkołą
+                        current_school = school_text
+                    except NoSuchElementException:
+                        # To może być wiersz z klasą (jeśli nie ma linku w pierwszej komórce)
+                        # Sprawdź, czy threshold_text wygląda jak próg punktowy (liczba)
+                        if current_school and is_class_row(school_text, threshold_text):
+                            # To jest wiersz z klasą
+                            data.append((current_school, school_text, threshold_text))
+                        elif not current_school:
+                            # Jeśli nie mamy jeszcze szkoły, może to być pierwsza szkoła
+                            # Sprawdź, czy threshold_text zawiera "od" lub "do" (zakres progów)
+                            if RANGE_MARKERS.search(threshold_text.lower()):
+                                current_school = school_text
+                                
+            except Exception as e:
+                continue
+        
+        # Alternatywna metoda: znajdź wszystkie wiersze z klasami bezpośrednio
+        # Klasy mają strukturę: pierwsza komórka to nazwa klasy, druga to próg
+        class_rows = driver.find_elements(By.XPATH, "//table//tr[td[2][not(contains(text(), 'od')) and not(contains(text(), 'więcej')) and not(contains(text(), 'rozwiń')) and not(contains(text(), 'zwiń'))]]")
+        
+        # Przejdź przez wszystkie wiersze i znajdź klasy
+        all_rows = driver.find_elements(By.XPATH, "//table//tbody//tr")
+        current_school_name = None
+        
+        for row in all_rows:
+            cells = row.find_elements(By.TAG_NAME, "td")
+            if len(cells) >= 2:
+                first_cell = cells[0].text.strip()
+                second_cell = cells[1].text.strip()
+                
+                # Sprawdź, czy pierwsza komórka zawiera link do szkoły
+                try:
+                    link = cells[0].find_element(By.TAG_NAME, "a")
+                    # To jest szkoła
+                    current_school_name = first_cell
+                except NoSuchElementException:
+                    # To może być klasa
+                    # Sprawdź, czy druga komórka wygląda jak próg punktowy
+                    if current_school_name and is_class_row(first_cell, second_cell):
+                        data.append((current_school_name, first_cell, second_cell))
+        
+    except Exception as e:
+        print(f"Błąd podczas pobierania danych: {e}")
+    
+    return data
+
+def iter_data_improved(driver):
+    """
+    Generator krotek (szkoła, klasa, próg) odczytywanych wiersz po wierszu przez WebDriver.
+
+    Krotki są zwracane na bieżąco, więc mogą trafiać do zapisu zanim cała tabela
+    zostanie przetworzona.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+    # Znajdź wszystkie wiersze w tabeli
+    rows = driver.find_elements(By.XPATH, "//table//tbody//tr")
+
+    current_school = None
+
+    for row in rows:
+        try:
+            cells = row.find_elements(By.TAG_NAME, "td")
+
+            if len(cells) < 2:
+                continue
+
+            first_cell_text = cells[0].text.strip()
+            second_cell_text = cells[1].text.strip()
+
+            # Sprawdź, czy pierwsza komórka ma link (to szkoła)
+            has_link = False
+            try:
+                link = cells[0].find_element(By.TAG_NAME, "a")
+                # Sprawdź, czy link nie prowadzi tylko do "#" (to byłby przycisk rozwiń)
+                has_link = is_school_href(link.get_attribute("href"))
+            except NoSuchElementException:
+                pass
+
+        except StaleElementReferenceException:
+            # Wiersz zniknął z DOM w trakcie odczytu; inne błędy (np. zerwana sesja) przerywają pobieranie
+            continue
+
+        if has_link:
+            # To jest wiersz ze szkołą
+            current_school = first_cell_text
+        elif current_school and is_class_row(first_cell_text, second_cell_text):
+            # To jest klasa z progiem
+            yield (current_school, first_cell_text, second_cell_text)
+
+def scrape_data_improved(driver):
+    """Ulepszona metoda pobierania danych."""
+    data = []
+    
+    try:
+        for row in iter_data_improved(driver):
+            data.append(row)
+                
+    except Exception as e:
+        print(f"Błąd podczas pobierania danych: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return data
+
+def _is_hidden(tag):
+    """Sprawdza, czy element lub jego przodek jest ukryty stylem inline (jak niewidoczny tekst w Selenium)."""
+    while tag is not None and tag.name not in ('table', '[document]'):
+        style = (tag.get('style') or '').replace(' ', '').lower()
+        if 'display:none' in style or tag.has_attr('hidden'):
+            return True
+        tag = tag.parent
+    return False
+
+def _cell_text(cell):
+    """Tekst komórki ze znormalizowanymi białymi znakami (odpowiednik WebElement.text)."""
+    return ' '.join(cell.get_text(' ').split())
+
+def _table_rows(soup):
+    """Zwraca wiersze tabeli (przeglądarka zawsze dodaje <tbody>, surowy HTML z serwera może go nie mieć)."""
+    return soup.select("table tbody tr") or soup.select("table tr")
+
+def _row_texts(row, cells, include_hidden):
+    """Teksty dwóch pierwszych komórek wiersza; ukryte wiersze mają pusty tekst, chyba że include_hidden."""
+    if not include_hidden and _is_hidden(row):
+        return '', ''
+    return _cell_text(cells[0]), _cell_text(cells[1])
+
+def iter_table_html(html, include_hidden=False, rejected=None):
+    """
+    Generator krotek (szkoła, klasa, próg) z HTML strony - zob. parse_table_html.
+
+    Jeśli podano słownik ``rejected``, wiersze pod szkołą odrzucone przez
+    klasyfikator są w nim liczone według powodu (zob. scraper.classify).
+    """
+    return _iter_table_soup(_soup(html), include_hidden, rejected)
+
+def _iter_table_soup(soup, include_hidden=False, rejected=None):
+    current_school = None
+
+    for row in _table_rows(soup):
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            continue
+
+        first_cell_text, second_cell_text = _row_texts(row, cells, include_hidden)
+
+        link = cells[0].find("a")
+        if link is not None and is_school_href(link.get("href")):
+            # To jest wiersz ze szkołą
+            current_school = first_cell_text
+        elif current_school:
+            reason = classify_row(first_cell_text, second_cell_text)
+            if reason is None:
+                # To jest klasa z progiem
+                yield (current_school, first_cell_text, second_cell_text)
+            elif rejected is not None:
+                rejected[reason] = rejected.get(reason, 0) + 1
+
+def parse_table_html(html, include_hidden=False, rejected=None):
+    """
+    Parsuje HTML strony z progami offline i zwraca listę krotek (szkoła, klasa, próg).
+
+    Stosuje te same reguły co scrape_data_improved, ale bez żadnych zapytań do
+    przeglądarki - cały dokument jest przetwarzany lokalnie przez BeautifulSoup.
+    Wiersze ukryte stylem inline (np. nierozwinięte klasy) są traktowane tak jak
+    w Selenium, czyli jako wiersze z pustym tekstem - chyba że include_hidden=True
+    (HTML pobrany bez przeglądarki, w którym klasy są już w dokumencie, tylko ukryte).
+    """
+    return list(iter_table_html(html, include_hidden, rejected))
+
+def parse_school_rows(html):
+    """
+    Zwraca listę (szkoła, adres rozwinięcia) dla wszystkich wierszy szkół.
+
+    Adres rozwinięcia to URL, który przycisk "rozwiń" pobiera przez XHR
+    (atrybut data-url/data-href albo href różny od "#"); None, jeśli przycisk
+    tylko odsłania wiersze obecne już w dokumencie.
+    """
+    return _school_rows_soup(_soup(html))
+
+def _school_rows_soup(soup):
+    schools = []
+
+    for row in _table_rows(soup):
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            continue
+        link = cells[0].find("a")
+        if link is None or not is_school_href(link.get("href")):
+            continue
+
+        expand_url = None
+        for anchor in row.find_all("a"):
+            if 'rozwiń' not in anchor.get_text().lower():
+                continue
+            href = anchor.get("href")
+            expand_url = anchor.get("data-url") or anchor.get("data-href") or (
+                href if href and href != "#" and not href.startswith("javascript:") else None
+            )
+            break
+        schools.append((_cell_text(cells[0]), expand_url))
+
+    return schools
+
+def parse_page(html, include_hidden=True):
+    """
+    Szkoły (jak parse_school_rows) i krotki klas (jak parse_table_html) z jednego drzewa dokumentu.
+
+    HTML jest parsowany raz - backend HTTP potrzebuje obu list dla każdej strony.
+    """
+    soup = _soup(html)
+    return _school_rows_soup(soup), list(_iter_table_soup(soup, include_hidden))
+
+def parse_class_rows(html):
+    """Parsuje fragment HTML zwracany przez XHR "rozwiń" i zwraca listę (klasa, próg)."""
+    soup = _soup(html)
+    classes = []
+
+    for row in soup.find_all("tr"):
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            continue
+        first_cell_text, second_cell_text = _row_texts(row, cells, include_hidden=True)
+        if is_class_row(first_cell_text, second_cell_text):
+            classes.append((first_cell_text, second_cell_text))
+
+    return classes
+
+def scrape_data_snapshot(driver):
+    """
+    Pobiera dane jednym zapytaniem do przeglądarki (page_source) i parsuje je offline.
+
+    Zwraca te same krotki co scrape_data_improved, ale zamiast kilku komend
+    WebDriver na każdy wiersz tabeli wykonuje dokładnie jedną.
+    """
+    try:
+        return parse_table_html(driver.page_source)
+    except Exception as e:
+        print(f"Błąd podczas pobierania danych: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+def validate_rows(rows, stats=None):
+    """
+    Etap walidacji potoku: przepuszcza tylko kompletne krotki z liczbowym progiem.
+
+    Pola są oczyszczane z białych znaków; odrzucone wiersze są liczone w
+    ``stats["rejected"]`` (jeśli podano słownik stats).
+    """
+    for row in rows:
+        school, class_name, threshold = (field.strip() for field in row)
+        if school and class_name and parse_threshold(threshold) is not None:
+            yield (school, class_name, threshold)
+        elif stats is not None:
+            stats["rejected"] = stats.get("rejected", 0) + 1
@@ -0,0 +1,236 @@
+"""
+Historia progów punktowych w lokalnej bazie SQLite (wiele miast, lat i przebiegów).
+
+Każdy przebieg dopisuje wiersze celu (miasto, rok) razem z czasem pobrania,
+kodem oddziału i znormalizowanym profilem (zob. scraper.classify). Jeśli tabela
+nie zmieniła się od poprzedniego przebiegu, nowe wiersze nie są dopisywane -
+odnotowywany jest tylko czas sprawdzenia. Zapytania (np. trend progów profilu
+w kolejnych latach) korzystają z indeksów pokrywających, więc odpowiadają w
+milisekundach także przy setkach tysięcy wierszy.
+
+Użycie z wiersza poleceń (z katalogu głównego repozytorium):
+    python -m scraper.history import progi_licea_krakow_2025_2026.csv --city Krakow --year 2025-2026
+    python -m scraper.history trend mat-fiz-inf [--city Krakow]
+    python -m scraper.history school "V LO im. Augusta Witkowskiego"
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+
+from scraper.classify import iter_records, normalize_profile
+
+DEFAULT_HISTORY_PATH = "progi_historia.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    city TEXT NOT NULL,
+    year TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    checked_at TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    rows_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_target ON runs (city, year, id);
+CREATE TABLE IF NOT EXISTS thresholds (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    city TEXT NOT NULL,
+    year TEXT NOT NULL,
+    school TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    class_code TEXT NOT NULL,
+    profile TEXT,
+    threshold REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS thresholds_by_profile ON thresholds (profile, year, run_id, threshold);
+CREATE INDEX IF NOT EXISTS thresholds_by_school ON thresholds (school, year, run_id);
+CREATE INDEX IF NOT EXISTS thresholds_by_run ON thresholds (run_id);
+"""
+
+
+def _latest_runs(city=None):
+    """
+    Podzapytanie z najnowszym przebiegiem każdego celu (miasto, rok) i jego parametry.
+
+    Zapytania o historię patrzą tylko na te przebiegi; filtr miasta jest tutaj,
+    a nie na tabeli thresholds, żeby wystarczały indeksy pokrywające.
+    """
+    if city is None:
+        return "SELECT MAX(id) FROM runs GROUP BY city, year", []
+    return "SELECT MAX(id) FROM runs WHERE city = ? GROUP BY year", [city]
+
+
+@dataclass(frozen=True)
+class TrendPoint:
+    """Progi klas jednego profilu w jednym roku (z najnowszego przebiegu każdego miasta)."""
+
+    year: str
+    classes: int
+    min_threshold: float
+    avg_threshold: float
+    max_threshold: float
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class HistoryStore:
+    """Baza historii progów; bezpieczna dla wielu wątków (jedno połączenie chronione blokadą)."""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(SCHEMA)
+
+    def append_run(self, city, year, rows, scraped_at=None):
+        """
+        Dopisuje przebieg celu: krotki (szkoła, klasa, próg) są czytane strumieniowo.
+
+        Zwraca (id przebiegu, czy dopisano nowe wiersze). Wiersze bez liczbowego
+        progu są pomijane. Gdy tabela jest taka sama jak w poprzednim przebiegu
+        celu, nowy przebieg nie jest zapisywany, a poprzedni dostaje nowy czas sprawdzenia.
+        """
+        scraped_at = scraped_at or _now()
+        digest = hashlib.sha256()
+        count = 0
+
+        def records(run_id):
+            nonlocal count
+            for record in iter_records(rows):
+                digest.update(json.dumps(record.as_row(), ensure_ascii=False).encode("utf-8"))
+                count += 1
+                yield (run_id, city, year, record.school, record.class_name, record.class_code,
+                       normalize_profile(record.profile) if record.profile else None, float(record.threshold))
+
+        with self._lock, self._db:
+            previous = self._db.execute(
+                "SELECT id, rows_hash FROM runs WHERE city = ? AND year = ? ORDER BY id DESC LIMIT 1", (city, year)
+            ).fetchone()
+            run_id = self._db.execute(
+                "INSERT INTO runs (city, year, scraped_at, checked_at, row_count, rows_hash) VALUES (?, ?, ?, ?, 0, '')",
+                (city, year, scraped_at, scraped_at),
+            ).lastrowid
+            self._db.executemany("INSERT INTO thresholds VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records(run_id))
+
+            if previous is not None and previous[1] == digest.hexdigest():
+                # Bez zmian od poprzedniego przebiegu - nie trzymaj drugiej kopii tych samych wierszy
+                self._db.execute("DELETE FROM thresholds WHERE run_id = ?", (run_id,))
+                self._db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+                self._db.execute("UPDATE runs SET checked_at = ? WHERE id = ?", (scraped_at, previous[0]))
+                return previous[0], False
+
+            self._db.execute(
+                "UPDATE runs SET row_count = ?, rows_hash = ? WHERE id = ?", (count, digest.hexdigest(), run_id)
+            )
+            return run_id, True
+
+    def runs(self, city=None, year=None):
+        """Lista przebiegów (słowniki) od najnowszego, opcjonalnie dla jednego miasta/roku."""
+        query = "SELECT id, city, year, scraped_at, checked_at, row_count FROM runs WHERE 1 = 1"
+        params = []
+        if city is not None:
+            query += " AND city = ?"
+            params.append(city)
+        if year is not None:
+            query += " AND year = ?"
+            params.append(year)
+        with self._lock:
+            cursor = self._db.execute(query + " ORDER BY id DESC", params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def profile_trend(self, profile, city=None):
+        """
+        Trend progów profilu w kolejnych latach: lista TrendPoint posortowana po roku.
+
+        ``profile`` może być w dowolnej postaci ("mat-fiz-inf", "inf-mat-fiz") -
+        jest normalizowany tak jak przy zapisie.
+        """
+        latest, params = _latest_runs(city)
+        query = (
+            "SELECT year, COUNT(*), MIN(threshold), AVG(threshold), MAX(threshold) FROM thresholds "
+            f"WHERE profile = ? AND run_id IN ({latest})"
+        )
+        params = [normalize_profile(profile)] + params
+        with self._lock:
+            cursor = self._db.execute(query + " GROUP BY year ORDER BY year", params)
+            return [TrendPoint(year, count, low, round(avg, 2), high) for year, count, low, avg, high in cursor]
+
+    def school_history(self, school, city=None):
+        """Klasy szkoły we wszystkich latach: lista (rok, klasa, profil, próg) z najnowszych przebiegów."""
+        latest, params = _latest_runs(city)
+        query = (
+            "SELECT year, class_name, profile, threshold FROM thresholds "
+            f"WHERE school = ? AND run_id IN ({latest})"
+        )
+        params = [school] + params
+        with self._lock:
+            return self._db.execute(query + " ORDER BY year, class_code", params).fetchall()
+
+    def profiles(self, year=None):
+        """Znormalizowane profile z najnowszych przebiegów wraz z liczbą klas, od najczęstszego."""
+        latest, params = _latest_runs()
+        query = f"SELECT profile, COUNT(*) FROM thresholds WHERE profile IS NOT NULL AND run_id IN ({latest})"
+        if year is not None:
+            query += " AND year = ?"
+            params.append(year)
+        with self._lock:
+            return self._db.execute(query + " GROUP BY profile ORDER BY COUNT(*) DESC, profile", params).fetchall()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    from scraper.output import read_csv_rows
+
+    parser = argparse.ArgumentParser(description="Historia progów punktowych (SQLite)")
+    parser.add_argument("--db", default=DEFAULT_HISTORY_PATH, help=f"plik bazy (domyślnie: {DEFAULT_HISTORY_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="dopisz plik CSV scrapera jako przebieg")
+    import_parser.add_argument("csv")
+    import_parser.add_argument("--city", required=True)
+    import_parser.add_argument("--year", required=True)
+
+    trend_parser = commands.add_parser("trend", help="trend progów profilu w kolejnych latach")
+    trend_parser.add_argument("profile")
+    trend_parser.add_argument("--city")
+
+    school_parser = commands.add_parser("school", help="klasy i progi szkoły we wszystkich latach")
+    school_parser.add_argument("school")
+    school_parser.add_argument("--city")
+
+    args = parser.parse_args()
+    with HistoryStore(args.db) as store:
+        if args.command == "import":
+            run_id, added = store.append_run(args.city, args.year, read_csv_rows(args.csv))
+            print(f"Przebieg {run_id}: {'dopisano wiersze' if added else 'bez zmian od poprzedniego przebiegu'}")
+        elif args.command == "trend":
+            points = store.profile_trend(args.profile, args.city)
+            if not points:
+                print(f"Brak klas o profilu {normalize_profile(args.profile)}")
+            for p in points:
+                print(f"{p.year}: {p.classes} klas, próg min. {p.min_threshold:.2f}, "
+                      f"śr. {p.avg_threshold:.2f}, maks. {p.max_threshold:.2f}")
+        else:
+            for year, class_name, profile, threshold in store.school_history(args.school, args.city):
+                print(f"{year}  {class_name}: {threshold:.2f}")
+
+
+if __name__ == "__main__":
+    main()
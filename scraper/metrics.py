@@ -0,0 +1,275 @@
+"""
+Pomiary przebiegu: czas etapów, komendy WebDriver, strony (czas i przesłane dane), wiersze/s i szczytowe RSS.
+
+Etapy oznacza się blokiem ``with stage("nazwa"):``. Wyniki są zbierane w
+globalnym rejestrze ``registry`` (bezpiecznym dla wątków) i na końcu przebiegu
+mogą być zapisane jako JSON lub plik tekstowy dla Prometheusa (node_exporter
+textfile collector). Opcjonalnie każdy etap może być profilowany (cProfile lub
+pyinstrument) - profile trafiają do osobnych plików.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+import cProfile
+import json
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows - szczytowe RSS nie będzie raportowane
+    resource = None
+
+# Granice kubełków histogramu opóźnień komend WebDriver (sekundy)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogram skumulowany w stylu Prometheusa."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def cumulative(self):
+        """Lista (granica, liczba obserwacji <= granica), ostatnia granica to "+Inf"."""
+        result, total = [], 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def peak_rss_mb():
+    """Szczytowe RSS procesu i zakończonych procesów potomnych (MB) albo None bez modułu resource."""
+    if resource is None:
+        return None
+    # ru_maxrss jest w KB na Linuksie
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return {"self": round(own, 1), "children": round(children, 1)}
+
+
+class Metrics:
+    """Rejestr pomiarów jednego przebiegu."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+        self.profiler = None
+        self.profile_dir = None
+
+    def reset(self):
+        with self._lock:
+            self.started = time.monotonic()
+            self.stages = {}
+            self.commands = {}
+            self.command_latency = Histogram()
+            self.rows = 0
+            self.pages = {}
+            self._profile_counter = 0
+
+    def enable_profiling(self, profiler="cprofile", directory="profiles"):
+        """Włącza profilowanie każdego etapu: "cprofile" (pliki .prof) lub "pyinstrument" (pliki .html)."""
+        if profiler == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                raise RuntimeError("Profilowanie pyinstrument wymaga: pip install pyinstrument")
+        elif profiler != "cprofile":
+            raise ValueError(f"Nieznany profiler: {profiler}")
+        self.profiler = profiler
+        self.profile_dir = Path(directory)
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+
+    def record_stage(self, name, elapsed):
+        with self._lock:
+            entry = self.stages.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            entry["count"] += 1
+            entry["total_s"] += elapsed
+            entry["max_s"] = max(entry["max_s"], elapsed)
+
+    def record_command(self, command, elapsed):
+        with self._lock:
+            self.commands[command] = self.commands.get(command, 0) + 1
+            self.command_latency.observe(elapsed)
+
+    def record_page(self, mode, ready_s, transfer=None):
+        """Zapisuje czas do gotowości strony i przesłane dane (zob. scraper.browser.page_transfer_stats)."""
+        with self._lock:
+            entry = self.pages.setdefault(mode, {"count": 0, "ready_total_s": 0.0, "ready_max_s": 0.0,
+                                                 "bytes": 0, "requests": 0, "blocked": 0})
+            entry["count"] += 1
+            entry["ready_total_s"] += ready_s
+            entry["ready_max_s"] = max(entry["ready_max_s"], ready_s)
+            if transfer is not None:
+                for key in ("bytes", "requests", "blocked"):
+                    entry[key] += transfer[key]
+
+    def add_rows(self, count):
+        with self._lock:
+            self.rows += count
+
+    def _profile_path(self, name, suffix):
+        with self._lock:
+            self._profile_counter += 1
+            return self.profile_dir / f"{self._profile_counter:03d}-{name}.{suffix}"
+
+    @contextmanager
+    def stage(self, name):
+        """Mierzy czas etapu (i profiluje go, jeśli włączono profilowanie)."""
+        profiler = None
+        if self.profiler == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif self.profiler == "pyinstrument":
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+            if self.profiler == "cprofile":
+                profiler.disable()
+                profiler.dump_stats(self._profile_path(name, "prof"))
+            elif self.profiler == "pyinstrument":
+                profiler.stop()
+                self._profile_path(name, "html").write_text(profiler.output_html(), encoding="utf-8")
+
+    def instrument_driver(self, driver):
+        """Mierzy każdą komendę WebDriver (liczba i opóźnienie) przez podmianę driver.execute."""
+        original_execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                self.record_command(driver_command, time.perf_counter() - start)
+
+        driver.execute = timed_execute
+        return driver
+
+    def snapshot(self):
+        """Wszystkie pomiary jako słownik (gotowy do zapisu w JSON)."""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                "elapsed_s": round(elapsed, 3),
+                "rows": self.rows,
+                "rows_per_s": round(self.rows / elapsed, 2) if elapsed else 0.0,
+                "peak_rss_mb": peak_rss_mb(),
+                "stages": {
+                    name: {"count": s["count"], "total_s": round(s["total_s"], 4), "max_s": round(s["max_s"], 4)}
+                    for name, s in sorted(self.stages.items())
+                },
+                "pages": {
+                    mode: dict(p, ready_total_s=round(p["ready_total_s"], 4), ready_max_s=round(p["ready_max_s"], 4))
+                    for mode, p in sorted(self.pages.items())
+                },
+                "webdriver": {
+                    "commands": self.command_latency.count,
+                    "latency_total_s": round(self.command_latency.sum, 4),
+                    "by_command": dict(sorted(self.commands.items())),
+                    "latency_histogram": [
+                        {"le": bound, "count": count} for bound, count in self.command_latency.cumulative()
+                    ],
+                },
+            }
+
+    def summary(self):
+        data = self.snapshot()
+        lines = [f"Czas: {data['elapsed_s']:.1f} s, {data['rows']} wierszy ({data['rows_per_s']:.1f}/s), "
+                 f"komendy WebDriver: {data['webdriver']['commands']}"]
+        for name, s in data["stages"].items():
+            lines.append(f"  {name:<20} {s['total_s']:8.2f} s  ({s['count']}x, maks. {s['max_s']:.2f} s)")
+        for mode, p in data["pages"].items():
+            lines.append(
+                f"  strony [{mode}]: {p['count']}x, gotowe śr. {p['ready_total_s'] / p['count']:.2f} s, "
+                f"przesłano {p['bytes'] / 1024 / 1024:.2f} MB w {p['requests']} zapytaniach "
+                f"(zablokowane: {p['blocked']})"
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path):
+        """Zapisuje pomiary w formacie tekstowym Prometheusa (atomowo - collector może czytać w trakcie)."""
+        data = self.snapshot()
+        lines = [
+            "# HELP scraper_run_seconds Czas trwania przebiegu scrapera.",
+            "# TYPE scraper_run_seconds gauge",
+            f"scraper_run_seconds {data['elapsed_s']}",
+            "# HELP scraper_rows Liczba pobranych wierszy (klas).",
+            "# TYPE scraper_rows gauge",
+            f"scraper_rows {data['rows']}",
+            "# HELP scraper_rows_per_second Przepustowość w wierszach na sekundę.",
+            "# TYPE scraper_rows_per_second gauge",
+            f"scraper_rows_per_second {data['rows_per_s']}",
+            "# HELP scraper_stage_seconds Łączny czas etapów.",
+            "# TYPE scraper_stage_seconds gauge",
+        ]
+        for name, s in data["stages"].items():
+            lines.append(f'scraper_stage_seconds{{stage="{name}"}} {s["total_s"]}')
+        if data["pages"]:
+            lines += [
+                "# HELP scraper_pages_total Liczba stron załadowanych w przeglądarce.",
+                "# TYPE scraper_pages_total counter",
+            ]
+            lines += [f'scraper_pages_total{{mode="{mode}"}} {p["count"]}' for mode, p in data["pages"].items()]
+            lines += [
+                "# HELP scraper_page_ready_seconds Łączny czas do gotowości stron.",
+                "# TYPE scraper_page_ready_seconds gauge",
+            ]
+            lines += [f'scraper_page_ready_seconds{{mode="{mode}"}} {p["ready_total_s"]}'
+                      for mode, p in data["pages"].items()]
+            lines += [
+                "# HELP scraper_page_transfer_bytes Bajty przesłane przez przeglądarkę.",
+                "# TYPE scraper_page_transfer_bytes gauge",
+            ]
+            lines += [f'scraper_page_transfer_bytes{{mode="{mode}"}} {p["bytes"]}' for mode, p in data["pages"].items()]
+        lines += [
+            "# HELP scraper_webdriver_command_seconds Opóźnienie komend WebDriver.",
+            "# TYPE scraper_webdriver_command_seconds histogram",
+        ]
+        for bucket in data["webdriver"]["latency_histogram"]:
+            lines.append(f'scraper_webdriver_command_seconds_bucket{{le="{bucket["le"]}"}} {bucket["count"]}')
+        lines.append(f"scraper_webdriver_command_seconds_sum {data['webdriver']['latency_total_s']}")
+        lines.append(f"scraper_webdriver_command_seconds_count {data['webdriver']['commands']}")
+        if data["peak_rss_mb"] is not None:
+            lines += [
+                "# HELP scraper_peak_rss_megabytes Szczytowe RSS procesu i zakończonych procesów potomnych.",
+                "# TYPE scraper_peak_rss_megabytes gauge",
+                f'scraper_peak_rss_megabytes{{process="self"}} {data["peak_rss_mb"]["self"]}',
+                f'scraper_peak_rss_megabytes{{process="children"}} {data["peak_rss_mb"]["children"]}',
+            ]
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp_path.replace(path)
+
+
+registry = Metrics()
+
+
+def stage(name):
+    """Blok etapu w globalnym rejestrze: ``with stage("expand_all_classes"): ...``."""
+    return registry.stage(name)
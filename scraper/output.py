@@ -0,0 +1,141 @@
+"""Zapis wyników: pliki CSV (zapis atomowy) i JSON Lines."""
+
+from pathlib import Path
+import csv
+import filecmp
+import json
+import os
+import tempfile
+import threading
+
+CSV_HEADER = ["Szkoła", "Klasa", "Próg punktowy"]
+MERGED_CSV_HEADER = ["Miasto", "Rok"] + CSV_HEADER
+
+
+def _current_umask():
+    # os.umask nie ma trybu odczytu - ustawia nową maskę i zwraca poprzednią
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Uprawnienia nowych plików jak przy zwykłym open() (odczytane raz, bo os.umask zmienia stan procesu)
+DEFAULT_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def replace_file(tmp_path, path):
+    """
+    Podmienia ``path`` plikiem tymczasowym (os.replace) z uprawnieniami zwykłego pliku.
+
+    mkstemp tworzy plik z prawami 0600 - bez chmod plik wynikowy byłby nieczytelny
+    dla innych użytkowników (np. serwera WWW). Istniejący plik zachowuje swoje prawa.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = DEFAULT_FILE_MODE
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+
+def write_csv(path, data, header=CSV_HEADER):
+    """Zapisuje krotki do pliku CSV z nagłówkiem."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(data)
+
+
+class CsvSink:
+    """
+    Przyrostowy zapis CSV przez plik tymczasowy i atomową zamianę (os.replace).
+
+    Wiersze są dopisywane do pliku tymczasowego w tym samym katalogu na bieżąco.
+    commit() podmienia plik docelowy w jednym kroku - przerwany zapis nigdy nie
+    zostawia obciętego CSV, a poprzednia wersja zostaje nienaruszona. Przy
+    only_if_changed=True identyczny plik nie jest podmieniany (nie zmienia się data
+    modyfikacji), więc nie uruchamia kolejnego wdrożenia.
+    Użyty jako context manager zatwierdza zapis po sukcesie, a odrzuca po błędzie.
+    """
+
+    def __init__(self, path, header=CSV_HEADER, only_if_changed=True):
+        self.path = Path(path)
+        self.only_if_changed = only_if_changed
+        self.count = 0
+        self.changed = False
+        self._lock = threading.Lock()
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self._file = os.fdopen(fd, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(header)
+
+    def write(self, row):
+        with self._lock:
+            self._writer.writerow(row)
+            self.count += 1
+
+    def commit(self):
+        """Zamyka plik tymczasowy i podmienia nim plik docelowy; zwraca True, jeśli plik się zmienił."""
+        self._file.close()
+        if self.only_if_changed and self.path.exists() and filecmp.cmp(self._tmp_path, self.path, shallow=False):
+            os.unlink(self._tmp_path)
+            self.changed = False
+        else:
+            replace_file(self._tmp_path, self.path)
+            self.changed = True
+        return self.changed
+
+    def abort(self):
+        """Odrzuca zapis - plik docelowy pozostaje bez zmian."""
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class JsonLinesSink:
+    """
+    Zapis JSON Lines (jeden obiekt na wiersz), opróżniany po każdym wierszu.
+
+    Każdy zapisany wiersz od razu trafia na dysk, więc po awarii plik zawiera
+    wszystko, co udało się pobrać. Bezpieczny dla wielu wątków.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = Path(path)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_csv_rows(path):
+    """Generator wierszy pliku CSV (bez nagłówka) - czyta plik strumieniowo."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            yield tuple(row)
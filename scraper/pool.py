@@ -0,0 +1,366 @@
+"""
+Pula ciepłych przeglądarek Chrome używanych ponownie między stronami i przebiegami.
+
+DriverPool trzyma do ``size`` przeglądarek; zadania wypożyczają je blokiem
+``with pool.borrow() as pooled:`` i oddają po użyciu. Przy wypożyczeniu i
+oddaniu sprawdzany jest stan przeglądarki (martwe są zastępowane nowymi), a
+po ``max_pages`` stronach przeglądarka jest odświeżana, żeby ograniczyć
+przyrost pamięci.
+
+Tryb demona utrzymuje przeglądarki między uruchomieniami scrapera (np. z crona):
+
+    python -m scraper.pool --size 2 --warmup-url URL
+
+uruchamia N Chrome w trybie headless z --remote-debugging-port i stałym
+profilem (cookies zaakceptowane raz zostają), zapisuje ich adresy do
+.scraper-pool.json i pilnuje, żeby działały. Scraper podłącza się do nich
+przez DriverPool.attach() (w licea-webscraper.py: --attach) zamiast uruchamiać
+własny Chrome.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.request import urlopen
+import argparse
+import json
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+from scraper.metrics import registry, stage
+
+DEFAULT_STATE_PATH = ".scraper-pool.json"
+DEFAULT_PROFILE_DIR = ".scraper-chrome"
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+class PooledDriver:
+    """Przeglądarka z puli wraz z licznikiem stron i stanem cookies."""
+
+    def __init__(self, driver, address=None, cookies_accepted=False):
+        self.driver = driver
+        self.address = address
+        self.cookies_accepted = cookies_accepted
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Pula przeglądarek do wypożyczania (bezpieczna dla wątków).
+
+    size       - maksymalna liczba przeglądarek (i równoczesnych wypożyczeń)
+    max_pages  - po tylu stronach przeglądarka jest odświeżana (None - nigdy)
+    warmup_url - strona otwierana przy tworzeniu przeglądarki, żeby od razu
+                 zaakceptować cookies (None - cookies przy pierwszej stronie)
+    addresses  - adresy "host:port" działających przeglądarek (tryb podłączenia);
+                 bez nich pula uruchamia własne przeglądarki
+    mode       - tryb przeglądarki: "lean" lub "full" (zob. scraper.browser.setup_driver)
+    """
+
+    def __init__(self, size=2, max_pages=50, warmup_url=None, addresses=(), headless=True,
+                 cookies_accepted=False, mode="lean"):
+        self.size = len(addresses) if addresses else size
+        self.max_pages = max_pages
+        self.warmup_url = warmup_url
+        self.headless = headless
+        self.mode = mode
+        self.cookies_accepted = cookies_accepted
+        self._free_addresses = list(addresses)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.discarded = 0
+
+    @classmethod
+    def attach(cls, state_path=DEFAULT_STATE_PATH, max_pages=50):
+        """Pula podłączona do przeglądarek demona (adresy i tryb z pliku stanu zapisanego przez serve())."""
+        state = json.loads(Path(state_path).read_text(encoding="utf-8"))
+        return cls(max_pages=max_pages, addresses=state["addresses"],
+                   cookies_accepted=bool(state.get("warmup_url")), mode=state.get("mode", "full"))
+
+    def _create(self):
+        with self._lock:
+            address = self._free_addresses.pop() if self._free_addresses else None
+        from scraper.browser import setup_driver
+        print(f"Pula: {'podłączanie do przeglądarki ' + address if address else 'uruchamianie przeglądarki'}...")
+        try:
+            with stage("setup_driver"):
+                driver = registry.instrument_driver(setup_driver(self.headless, address, self.mode))
+        except Exception:
+            self._release_address(address)
+            raise
+        pooled = PooledDriver(driver, address, self.cookies_accepted)
+        if self.warmup_url and not pooled.cookies_accepted:
+            from scraper.browser import accept_cookies
+            from scraper.waits import PageBudget
+            with stage("warmup"):
+                budget = PageBudget()
+                driver.get(self.warmup_url)
+                budget.wait_for_page_ready(driver, eager=self.mode == "lean")
+                accept_cookies(driver, budget)
+            pooled.cookies_accepted = True
+        with self._lock:
+            self.created += 1
+        return pooled
+
+    def _release_address(self, address):
+        if address is not None:
+            with self._lock:
+                self._free_addresses.append(address)
+
+    @staticmethod
+    def is_healthy(pooled):
+        """Sprawdza, czy przeglądarka odpowiada na komendy."""
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pooled):
+        """Zamyka sesję (przeglądarka podłączona przez adres działa dalej - zamykany jest tylko ChromeDriver)."""
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        self._release_address(pooled.address)
+        with self._lock:
+            self.discarded += 1
+
+    def _recycle(self, pooled):
+        """Odświeża przeglądarkę po max_pages stronach; zwraca przeglądarkę do ponownego użycia albo None."""
+        with self._lock:
+            self.recycled += 1
+        if pooled.address is None:
+            # Własna przeglądarka - nowa zostanie uruchomiona przy następnym wypożyczeniu
+            self._discard(pooled)
+            return None
+        # Przeglądarka demona - nowa karta zamiast starych (nowy proces renderera zwalnia pamięć)
+        from scraper.browser import block_urls
+        try:
+            driver = pooled.driver
+            old_handles = driver.window_handles
+            driver.switch_to.new_window("tab")
+            new_handle = driver.current_window_handle
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(new_handle)
+            if self.mode == "lean":
+                # Blokada adresów CDP dotyczy jednej karty
+                block_urls(driver)
+        except Exception as e:
+            print(f"Pula: nie udało się odświeżyć przeglądarki {pooled.address}: {e}")
+            self._discard(pooled)
+            return None
+        pooled.pages = 0
+        return pooled
+
+    def _take(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if self.is_healthy(pooled):
+                return pooled
+            print("Pula: przeglądarka nie odpowiada, zastępowanie nową...")
+            self._discard(pooled)
+
+    def _give_back(self, pooled):
+        if self._closed or not self.is_healthy(pooled):
+            self._discard(pooled)
+            return
+        if self.max_pages is not None and pooled.pages >= self.max_pages:
+            pooled = self._recycle(pooled)
+        if pooled is not None:
+            self._idle.put(pooled)
+
+    @contextmanager
+    def borrow(self):
+        """Wypożycza przeglądarkę (czeka, jeśli wszystkie są zajęte); zwraca PooledDriver."""
+        if self._closed:
+            raise RuntimeError("Pula przeglądarek jest zamknięta")
+        self._slots.acquire()
+        try:
+            pooled = self._take()
+            try:
+                yield pooled
+            finally:
+                pooled.pages += 1
+                self._give_back(pooled)
+        finally:
+            self._slots.release()
+
+    def warm(self):
+        """Tworzy od razu wszystkie przeglądarki (zamiast przy pierwszych wypożyczeniach)."""
+        created = [self._create() for _ in range(self.size - self._idle.qsize())]
+        for pooled in created:
+            self._idle.put(pooled)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def summary(self):
+        return (f"Pula przeglądarek: utworzone {self.created}, odświeżone {self.recycled}, "
+                f"zamknięte {self.discarded}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def find_chrome():
+    """Ścieżka do pliku wykonywalnego Chrome/Chromium albo None."""
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _devtools_ready(port):
+    try:
+        with urlopen(f"http://127.0.0.1:{port}/json/version", timeout=2) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+class ChromeInstance:
+    """Chrome uruchomiony przez demona z --remote-debugging-port i własnym profilem."""
+
+    def __init__(self, chrome, port, profile_dir, mode="lean"):
+        self.chrome = chrome
+        self.port = port
+        self.profile_dir = Path(profile_dir)
+        self.mode = mode
+        self.process = None
+
+    @property
+    def address(self):
+        return f"127.0.0.1:{self.port}"
+
+    def start(self, timeout=20):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        args = [self.chrome, "--headless=new", f"--remote-debugging-port={self.port}",
+                f"--user-data-dir={self.profile_dir.resolve()}", "--no-sandbox", "--disable-dev-shm-usage",
+                "--no-first-run", "--no-default-browser-check"]
+        if self.mode == "lean":
+            # Reklamy i analityka są blokowane po podłączeniu (CDP), obrazki już przy starcie
+            args.append("--blink-settings=imagesEnabled=false")
+        self.process = subprocess.Popen(args + ["about:blank"], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + timeout
+        while not _devtools_ready(self.port):
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Chrome na porcie {self.port} nie uruchomił się")
+            time.sleep(0.2)
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None and _devtools_ready(self.port)
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+def _warm_instance(instance, warmup_url):
+    """Akceptuje cookies w przeglądarce demona (zapisują się w jej profilu)."""
+    if not warmup_url:
+        return
+    with DriverPool(addresses=[instance.address], warmup_url=warmup_url, max_pages=None, mode=instance.mode) as pool:
+        with pool.borrow():
+            pass
+
+
+def _write_state(path, instances, warmup_url, mode):
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps({
+        "addresses": [instance.address for instance in instances],
+        "warmup_url": warmup_url,
+        "mode": mode,
+    }, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def serve(size=2, port=9222, profile_dir=DEFAULT_PROFILE_DIR, warmup_url=None, state_path=DEFAULT_STATE_PATH,
+          check_interval=30.0, chrome=None, mode="lean"):
+    """
+    Demon puli: uruchamia ``size`` przeglądarek i co ``check_interval`` s
+    restartuje te, które przestały odpowiadać. Działa do przerwania (Ctrl+C / SIGTERM).
+    """
+    chrome = chrome or find_chrome()
+    if chrome is None:
+        raise RuntimeError("Nie znaleziono Chrome/Chromium - podaj ścieżkę przez --chrome")
+
+    instances = [ChromeInstance(chrome, port + i, Path(profile_dir) / str(i), mode) for i in range(size)]
+    try:
+        for instance in instances:
+            instance.start()
+            _warm_instance(instance, warmup_url)
+            print(f"Przeglądarka gotowa: {instance.address}")
+        _write_state(state_path, instances, warmup_url, mode)
+        print(f"Zapisano adresy przeglądarek do {state_path}")
+
+        while True:
+            time.sleep(check_interval)
+            for instance in instances:
+                if instance.is_alive():
+                    continue
+                print(f"Przeglądarka {instance.address} nie odpowiada, restartowanie...")
+                instance.stop()
+                try:
+                    instance.start()
+                    _warm_instance(instance, warmup_url)
+                except Exception as e:
+                    print(f"Nie udało się zrestartować przeglądarki {instance.address}: {e}")
+    except KeyboardInterrupt:
+        print("Zatrzymywanie puli przeglądarek...")
+    finally:
+        for instance in instances:
+            instance.stop()
+        if Path(state_path).exists():
+            Path(state_path).unlink()
+
+
+def main():
+    import signal
+    # SIGTERM (systemd, kill) zatrzymuje demona tak samo jak Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    parser = argparse.ArgumentParser(description="Demon puli przeglądarek Chrome dla scrapera")
+    parser.add_argument("--size", type=int, default=2, help="liczba przeglądarek (domyślnie: 2)")
+    parser.add_argument("--port", type=int, default=9222, help="pierwszy port DevTools (domyślnie: 9222)")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR, help="katalog profili przeglądarek")
+    parser.add_argument("--warmup-url", help="strona do akceptacji cookies przy starcie przeglądarki")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="plik z adresami przeglądarek")
+    parser.add_argument("--check-interval", type=float, default=30.0, help="odstęp kontroli stanu (s)")
+    parser.add_argument("--chrome", help="ścieżka do Chrome/Chromium")
+    parser.add_argument("--mode", choices=["lean", "full"], default="lean", help="tryb przeglądarek (domyślnie: lean)")
+    args = parser.parse_args()
+
+    serve(args.size, args.port, args.profile_dir, args.warmup_url, args.state, args.check_interval, args.chrome,
+          args.mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Harmonogram pobierania: ponowienia, limit zapytań na host i bezpiecznik.
+
+- RetryPolicy    - ponowienia z wykładniczo rosnącym odstępem i losowym rozrzutem
+                   ("full jitter"), z uwzględnieniem nagłówka Retry-After
+- TokenBucket    - limit zapytań na sekundę z dopuszczalną serią; po odpowiedzi
+                   429/503 tempo jest zmniejszane o połowę, a po sukcesach
+                   stopniowo wraca do nominalnego
+- CircuitBreaker - po ``threshold`` kolejnych błędach dla hosta przestaje
+                   wysyłać do niego zapytania (kolejne cele kończą się od razu
+                   błędem), zamiast zapisywać niekompletne wyniki
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from scraper.backends import IncompleteDataError
+
+# Statusy HTTP, po których warto spróbować ponownie
+RETRYABLE_STATUS = frozenset([408, 425, 429, 500, 502, 503, 504])
+# Statusy oznaczające, że serwer prosi o wolniejsze tempo
+THROTTLE_STATUS = frozenset([429, 503])
+
+
+class CircuitOpenError(Exception):
+    """Bezpiecznik dla hosta jest otwarty - zapytanie nie zostało wysłane."""
+
+
+def _status(exc):
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(exc):
+    """Czy błąd jest przejściowy: zerwane połączenie, timeout, 429/5xx, niekompletne dane, błąd przeglądarki."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, IncompleteDataError):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        return _status(exc) in RETRYABLE_STATUS
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    # Wyjątki Selenium (timeout, zerwana sesja) - bez importu Selenium, który jest opcjonalny
+    return type(exc).__module__.startswith("selenium.")
+
+
+def is_throttled(exc):
+    """Czy serwer odpowiedział 429/503 (za dużo zapytań)."""
+    return _status(exc) in THROTTLE_STATUS
+
+
+def retry_after(exc):
+    """Czas z nagłówka Retry-After (s) albo None (data HTTP w nagłówku jest pomijana)."""
+    response = getattr(exc, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """Ponowienia: do ``attempts`` ponownych prób, odstęp losowy z [0, min(cap, base * 2^próba)]."""
+
+    def __init__(self, attempts=3, base=1.0, cap=60.0):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+
+    def delay(self, attempt, exc=None):
+        """Odstęp przed ponowieniem numer ``attempt`` (od 0); Retry-After ma pierwszeństwo, jeśli jest dłuższy."""
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        server_delay = retry_after(exc) if exc is not None else None
+        if server_delay is not None:
+            delay = max(delay, min(server_delay, self.cap))
+        return delay
+
+
+class TokenBucket:
+    """
+    Limit tempa: ``rate`` zapytań na sekundę, do ``capacity`` zapytań od razu (seria).
+
+    Zapytania czekające na żeton rezerwują go z góry (liczba żetonów może być
+    ujemna), więc są obsługiwane w kolejności przyjścia.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.nominal_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Czeka na żeton."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def slow_down(self):
+        """Serwer prosi o wolniejsze tempo - zmniejsz je o połowę (do 1/16 nominalnego)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.nominal_rate / 16, self.rate / 2)
+
+    def recover(self):
+        """Udane zapytanie - zwiększ tempo o 1/10 nominalnego (najwyżej do nominalnego)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.nominal_rate, self.rate + self.nominal_rate / 10)
+
+
+class CircuitBreaker:
+    """
+    Bezpiecznik na host: otwiera się po ``threshold`` kolejnych błędach.
+
+    Po ``cooldown`` sekundach przepuszcza jedną próbę (stan półotwarty) - sukces
+    zamyka bezpiecznik, kolejny błąd otwiera go ponownie.
+    """
+
+    def __init__(self, threshold=5, cooldown=300.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+        self.tripped = False
+
+    def check(self, url):
+        """Rzuca CircuitOpenError, jeśli bezpiecznik hosta jest otwarty."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if time.monotonic() - opened_at < self.cooldown:
+                raise CircuitOpenError(
+                    f"bezpiecznik otwarty dla {host} po {self._failures[host]} kolejnych błędach"
+                )
+            # Stan półotwarty: jedna próba, kolejny błąd od razu otworzy bezpiecznik
+            del self._opened_at[host]
+            self._failures[host] = self.threshold - 1
+
+    def is_open(self, url):
+        with self._lock:
+            return urlsplit(url).netloc in self._opened_at
+
+    def success(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures[host] = 0
+            self._opened_at.pop(host, None)
+
+    def failure(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.threshold and host not in self._opened_at:
+                self._opened_at[host] = time.monotonic()
+                self.tripped = True
+                print(f"Bezpiecznik otwarty dla {host}: {self._failures[host]} kolejnych błędów - "
+                      f"kolejne zapytania do tego hosta są wstrzymane")
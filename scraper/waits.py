@@ -0,0 +1,103 @@
+"""
+Oczekiwanie na zdarzenia na stronie zamiast stałych time.sleep, z budżetem czasu na stronę.
+
+PageBudget pilnuje łącznego limitu czasu dla jednej strony i mierzy, ile z tego
+czasu zajęło czekanie, a ile właściwa praca.
+"""
+
+import time
+
+# Liczba widocznych wierszy tabel (nierozwinięte klasy mają display:none i nie są liczone)
+VISIBLE_ROWS_SCRIPT = """
+return Array.prototype.filter.call(document.querySelectorAll('table tr'), function (tr) {
+    return tr.getClientRects().length > 0;
+}).length;
+"""
+
+
+class PageBudget:
+    """Budżet czasu na jedną stronę oraz licznik czasu spędzonego na czekaniu."""
+
+    def __init__(self, seconds=60.0, poll=0.1):
+        self.seconds = seconds
+        self.poll = poll
+        self.start = time.monotonic()
+        self.deadline = self.start + seconds
+        self.waited = 0.0
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def exceeded(self):
+        return self.remaining() <= 0
+
+    def timeout(self, limit):
+        """Limit pojedynczego oczekiwania, przycięty do pozostałego budżetu."""
+        return min(limit, self.remaining())
+
+    def wait_until(self, driver, condition, limit=10.0):
+        """
+        Czeka (WebDriverWait) aż ``condition(driver)`` zwróci wartość prawdziwą.
+
+        Zwraca tę wartość albo None po przekroczeniu limitu lub budżetu.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        start = time.monotonic()
+        try:
+            return WebDriverWait(driver, self.timeout(limit), poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            return None
+        finally:
+            self.waited += time.monotonic() - start
+
+    def wait_for_page_ready(self, driver, limit=15.0, eager=False):
+        """
+        Czeka na zakończenie ładowania dokumentu (document.readyState == 'complete').
+
+        Przy eager=True (strategia ładowania "eager") wystarcza 'interactive' -
+        DOM jest gotowy, a obrazki i skrypty zewnętrzne mogą się jeszcze ładować.
+        """
+        states = ("interactive", "complete") if eager else ("complete",)
+        return self.wait_until(
+            driver, lambda d: d.execute_script("return document.readyState") in states, limit
+        )
+
+    def wait_for_row_growth(self, driver, before, limit=3.0):
+        """Czeka, aż liczba widocznych wierszy tabeli przekroczy ``before``; zwraca nową liczbę lub None."""
+        def grown(d):
+            count = visible_row_count(d)
+            return count if count > before else False
+        return self.wait_until(driver, grown, limit)
+
+    def wait_for_stable_rows(self, driver, settle=0.3, limit=5.0):
+        """Czeka, aż liczba widocznych wierszy przestanie się zmieniać przez ``settle`` sekund."""
+        state = {"count": None, "since": time.monotonic()}
+
+        def stable(d):
+            count = visible_row_count(d)
+            now = time.monotonic()
+            if count != state["count"]:
+                state["count"], state["since"] = count, now
+                return False
+            return count if now - state["since"] >= settle else False
+        return self.wait_until(driver, stable, limit)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def summary(self):
+        elapsed = self.elapsed
+        share = self.waited / elapsed * 100 if elapsed else 0.0
+        return (
+            f"Czas strony: {elapsed:.1f} s (budżet {self.seconds:.0f} s), "
+            f"czekanie {self.waited:.1f} s ({share:.0f}%), praca {elapsed - self.waited:.1f} s"
+        )
+
+
+def visible_row_count(driver):
+    """Zwraca liczbę widocznych wierszy tabel na stronie."""
+    return driver.execute_script(VISIBLE_ROWS_SCRIPT)